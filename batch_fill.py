@@ -0,0 +1,80 @@
+from typing import Dict, List
+from playwright.async_api import Page
+
+# Sets every queued value through the native value setter (so React's value
+# tracker sees the change) and fires the events Workday widgets listen for.
+APPLY_SCRIPT = """
+(assignments) => {
+    const setters = {
+        INPUT: Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, "value").set,
+        TEXTAREA: Object.getOwnPropertyDescriptor(HTMLTextAreaElement.prototype, "value").set,
+    };
+    const quote = (value) => value.replace(/["\\\\]/g, "\\\\$&");
+    return assignments.map(({ automation_id, selector, value }) => {
+        const container = document.querySelector(`[data-automation-id="${quote(automation_id)}"]`);
+        const el = container && container.querySelector(selector);
+        const setter = el && setters[el.tagName];
+        if (!setter) return false;
+        el.focus();
+        setter.call(el, value);
+        el.dispatchEvent(new Event("input", { bubbles: true }));
+        el.dispatchEvent(new Event("change", { bubbles: true }));
+        el.dispatchEvent(new FocusEvent("blur"));
+        el.dispatchEvent(new FocusEvent("focusout", { bubbles: true }));
+        return true;
+    });
+}
+"""
+
+# Reads the values back after the widgets had a frame to re-render.
+VERIFY_SCRIPT = """
+async (assignments) => {
+    await new Promise(r => requestAnimationFrame(() => requestAnimationFrame(r)));
+    const quote = (value) => value.replace(/["\\\\]/g, "\\\\$&");
+    return assignments.map(({ automation_id, selector }) => {
+        const container = document.querySelector(`[data-automation-id="${quote(automation_id)}"]`);
+        const el = container && container.querySelector(selector);
+        return el ? el.value : null;
+    });
+}
+"""
+
+
+class BatchFiller:
+    """
+    Collects plain text/number/textarea/date assignments for a page and
+    applies them with one in-page script, verifies them with one read-back,
+    and falls back to Playwright fill() for the fields that did not stick.
+    """
+
+    def __init__(self):
+        self.pending: List[Dict[str, str]] = []
+        self.applied = 0
+        self.fallbacks = 0
+
+    def add(self, automation_id: str, selector: str, value: str):
+        self.pending.append({"automation_id": automation_id, "selector": selector, "value": str(value)})
+
+    async def flush(self, page: Page):
+        if not self.pending:
+            return
+        assignments, self.pending = self.pending, []
+
+        try:
+            await page.evaluate(APPLY_SCRIPT, assignments)
+            values = await page.evaluate(VERIFY_SCRIPT, assignments)
+        except Exception as e:
+            print(f"⚠️ Batched fill failed, filling one by one: {e}")
+            values = [None] * len(assignments)
+
+        failed = [a for a, value in zip(assignments, values) if value != a["value"]]
+        self.applied += len(assignments) - len(failed)
+        print(f"  -> Batch-filled {len(assignments) - len(failed)}/{len(assignments)} inputs in one call")
+
+        for assignment in failed:
+            self.fallbacks += 1
+            container = page.locator(f'[data-automation-id="{assignment["automation_id"]}"]').first
+            try:
+                await container.locator(assignment["selector"]).first.fill(assignment["value"])
+            except Exception as e:
+                print(f"⚠️ Fallback fill failed for {assignment['automation_id']} ({assignment['selector']}): {e}")
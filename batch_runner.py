@@ -0,0 +1,172 @@
+import argparse
+import asyncio
+import csv
+import json
+import os
+import re
+import time
+from typing import Dict, List, Any, Optional
+from dotenv import load_dotenv
+from playwright.async_api import async_playwright
+from main import run_application, save_form_map
+from browser_profile import get_run_profile, launch_browser
+from lifecycle import ContextPool
+from waits import WAIT_STATS
+from retry import RETRY_STATS
+from option_cache import OPTION_CACHE
+from field_types import FIELD_TYPE_CACHE
+from schema_registry import SCHEMA_REGISTRY
+from uploads import UPLOAD_TIMINGS
+from field_handlers import HARVEST_TIMINGS
+from tracing import TRACER
+
+BATCH_OUTPUT_DIR = "output/batch"
+
+
+def load_jobs(jobs_path: str) -> List[Dict[str, str]]:
+    """
+    Loads postings from a CSV (with a header row) or JSONL file.
+    Each job needs a `url`; `job_id`, `email`, `password` and `resume_path`
+    are optional and default to the .env values.
+    """
+    load_dotenv()
+    defaults = {
+        "email": os.getenv("WORKDAY_EMAIL"),
+        "password": os.getenv("WORKDAY_PASSWORD"),
+        "resume_path": os.getenv("RESUME_PATH"),
+    }
+
+    if jobs_path.endswith(".jsonl"):
+        with open(jobs_path) as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+    else:
+        with open(jobs_path, newline="") as f:
+            rows = list(csv.DictReader(f))
+
+    jobs: List[Dict[str, str]] = []
+    for idx, row in enumerate(rows, start=1):
+        url = (row.get("url") or "").strip()
+        if not url:
+            print(f"⚠️ Skipping job on line {idx}: no url")
+            continue
+        job = {key: row.get(key) or value for key, value in defaults.items()}
+        if not all(job.values()):
+            raise ValueError(
+                f"Job on line {idx} is missing email, password or resume_path "
+                "and no default is set in the .env file."
+            )
+        job["url"] = url
+        job["job_id"] = row.get("job_id") or f"{idx:04d}-{re.sub(r'[^A-Za-z0-9]+', '_', url)[-60:]}"
+        jobs.append(job)
+    return jobs
+
+
+async def run_job(pool: ContextPool, job: Dict[str, str], resume: bool = False) -> Dict[str, Any]:
+    """
+    Runs one posting on a pooled BrowserContext once a pool slot is free.
+    Never raises: a failure, including a context or page that could not be
+    created, is recorded as this job's result so sibling jobs keep running.
+    """
+    job_dir = os.path.join(BATCH_OUTPUT_DIR, job["job_id"])
+    os.makedirs(job_dir, exist_ok=True)
+    result: Dict[str, Any] = {"job_id": job["job_id"], "url": job["url"], "status": "ok", "fields": 0, "error": None}
+
+    start = time.perf_counter()
+    lease: Dict[str, Any] = {}
+    try:
+        async with pool.application(job, video_dir=os.path.join(job_dir, "video")) as lease:
+            page = lease["page"]
+            try:
+                all_data = await run_application(
+                    page, job["url"], job["email"], job["password"], job["resume_path"],
+                    output_dir=job_dir, has_saved_session=lease["has_saved_session"], resume=resume,
+                )
+                save_form_map(all_data, job_dir)
+                result["fields"] = len(all_data)
+            except Exception as e:
+                print(f"\n❌ Job {job['job_id']} failed: {e}")
+                result["status"] = "error"
+                result["error"] = str(e)
+                try:
+                    await page.screenshot(path=os.path.join(job_dir, "error_screenshot.png"))
+                except Exception:
+                    pass
+    except Exception as e:
+        # the pooled context or its page could not be started or cleaned up (e.g. a crashed renderer)
+        print(f"\n❌ Job {job['job_id']} lost its browser context: {e}")
+        result["status"] = "error"
+        result["error"] = result["error"] or f"browser context failed: {e}"
+    result["memory"] = lease.get("memory")
+    result["wall_time_s"] = round(time.perf_counter() - start, 2)
+    peak = f", peak {result['memory']['peak_rss_mb']:.0f} MB browser RSS" if result["memory"] else ""
+    print(f"🏁 Job {job['job_id']} finished in {result['wall_time_s']}s ({result['status']}{peak})")
+    return result
+
+
+async def run_batch(jobs: List[Dict[str, str]], concurrency: int, profile: Dict[str, Any],
+                    resume: bool = False) -> Dict[str, Any]:
+    """Runs all jobs against one shared browser with a pool of `concurrency` recycled contexts."""
+    os.makedirs(BATCH_OUTPUT_DIR, exist_ok=True)
+
+    start = time.perf_counter()
+    async with async_playwright() as p:
+        browser = await launch_browser(p, profile)
+        pool = ContextPool(browser, profile, concurrency)
+        try:
+            # run_job records its own failures; anything else still must not cancel the siblings
+            outcomes = await asyncio.gather(*(run_job(pool, job, resume) for job in jobs), return_exceptions=True)
+            results = [
+                outcome if not isinstance(outcome, BaseException) else
+                {"job_id": job["job_id"], "url": job["url"], "status": "error", "fields": 0,
+                 "error": str(outcome), "memory": None, "wall_time_s": 0.0}
+                for job, outcome in zip(jobs, outcomes)
+            ]
+        finally:
+            await pool.close()
+            await browser.close()
+    total = time.perf_counter() - start
+
+    summary = {
+        "jobs": len(results),
+        "succeeded": sum(1 for r in results if r["status"] == "ok"),
+        "failed": sum(1 for r in results if r["status"] != "ok"),
+        "concurrency": concurrency,
+        "profile": profile["name"],
+        "total_wall_time_s": round(total, 2),
+        "jobs_per_minute": round(len(results) / total * 60, 2) if total else 0.0,
+        "results": list(results),
+        "contexts": pool.stats(),
+        "adaptive_waits": WAIT_STATS.report(),
+        "field_retries": RETRY_STATS.report(),
+        "option_cache": OPTION_CACHE.stats(),
+        "field_type_cache": FIELD_TYPE_CACHE.stats(),
+        "schema_reuse": SCHEMA_REGISTRY.stats(),
+        "option_harvests": HARVEST_TIMINGS,
+        "uploads": UPLOAD_TIMINGS,
+        "time_by_field_type": TRACER.summary_by("container", "field_type"),
+    }
+    WAIT_STATS.print_report()
+    TRACER.export(BATCH_OUTPUT_DIR)
+    summary_path = os.path.join(BATCH_OUTPUT_DIR, "summary.json")
+    with open(summary_path, "w") as f:
+        json.dump(summary, f, indent=2)
+    print(f"\n✅ Batch complete: {summary['succeeded']}/{summary['jobs']} succeeded in {summary['total_wall_time_s']}s. Summary: {summary_path}")
+    return summary
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run many Workday applications concurrently.")
+    parser.add_argument("jobs", help="CSV or JSONL file with one posting per row (column/key `url`).")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum number of concurrent browser contexts.")
+    parser.add_argument("--profile", help="Run profile: default, lightweight (headless, resource blocking) or debug (video).")
+    parser.add_argument("--headless", action="store_true", help="Run the shared browser headless regardless of profile.")
+    parser.add_argument("--resume", action="store_true", help="Continue each posting after its last journaled page.")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    profile = get_run_profile(args.profile)
+    if args.headless:
+        profile["headless"] = True
+    asyncio.run(run_batch(load_jobs(args.jobs), max(1, args.concurrency), profile, args.resume))
@@ -0,0 +1,215 @@
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+from playwright.async_api import async_playwright
+from replica_site import build_site, serve_site
+from form_processor import traverse_and_process
+from tracing import TRACER
+from profiling import CallProfiler
+from waits import WAIT_STATS
+from option_cache import OPTION_CACHE
+from field_types import FIELD_TYPE_CACHE
+from schema_registry import SCHEMA_REGISTRY
+from retry import RETRY_STATS
+from field_handlers import HARVEST_TIMINGS
+from uploads import UPLOAD_TIMINGS
+
+DEFAULT_FORM_MAPS = ["workday_form_map.json", "op2.json"]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def field_type_latencies() -> Dict[str, Dict[str, float]]:
+    """p50/p90/p99 container latency per field type from the current trace."""
+    groups: Dict[str, List[float]] = {}
+    for span in TRACER.spans:
+        if span["category"] == "container":
+            groups.setdefault(span["attrs"].get("field_type", "unknown"), []).append(span["end_ms"] - span["start_ms"])
+    return {
+        field_type: {
+            "count": len(values),
+            "p50_ms": round(percentile(values, 50), 1),
+            "p90_ms": round(percentile(values, 90), 1),
+            "p99_ms": round(percentile(values, 99), 1),
+        }
+        for field_type, values in sorted(groups.items())
+    }
+
+
+async def run_once(base_url: str, headless: bool) -> Dict[str, Any]:
+    """
+    Runs traverse_and_process once against the replica, from a fresh context
+    and cold caches: the in-memory singletons would otherwise carry learned
+    field kinds and page schemas over from the previous run.
+    """
+    TRACER.reset()
+    WAIT_STATS.reset()
+    RETRY_STATS.reset()
+    FIELD_TYPE_CACHE.reset()
+    SCHEMA_REGISTRY.reset()
+    HARVEST_TIMINGS.clear()
+    UPLOAD_TIMINGS.clear()
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        context = await browser.new_context()
+        page = await context.new_page()
+        await page.goto(f"{base_url}/page/1")
+        profiler = CallProfiler()
+        try:
+            with profiler.installed():
+                start = time.perf_counter()
+                fields = await traverse_and_process(page, resume_path="dummy_file.pdf")
+                wall_time = time.perf_counter() - start
+        finally:
+            await context.close()
+            await browser.close()
+            OPTION_CACHE.close()
+    calls = profiler.method_counts()
+    return {
+        "wall_time_s": round(wall_time, 3),
+        "fields": len(fields),
+        "playwright_calls": sum(calls.values()),
+        "calls_by_method": dict(calls.most_common()),
+        "hot_fields": profiler.report(top=10)["by_field"],
+        "field_types": field_type_latencies(),
+        "wait_saved_ms": round(WAIT_STATS.saved_ms, 1),
+        "field_retries": RETRY_STATS.report(),
+    }
+
+
+def aggregate(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    walls = [run["wall_time_s"] for run in runs]
+    field_types: Dict[str, Dict[str, float]] = {}
+    for field_type in sorted({ft for run in runs for ft in run["field_types"]}):
+        per_run = [run["field_types"][field_type] for run in runs if field_type in run["field_types"]]
+        field_types[field_type] = {
+            key: round(statistics.median(entry[key] for entry in per_run), 1)
+            for key in ("count", "p50_ms", "p90_ms", "p99_ms")
+        }
+    return {
+        "runs": len(runs),
+        "wall_time_s": {
+            "median": round(statistics.median(walls), 3),
+            "min": round(min(walls), 3),
+            "max": round(max(walls), 3),
+        },
+        "playwright_calls": int(statistics.median(run["playwright_calls"] for run in runs)),
+        "field_types": field_types,
+        "details": runs,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Returns human-readable regressions where current exceeds baseline by more than threshold."""
+    regressions: List[str] = []
+
+    def check(name: str, now: float, before: float):
+        if before > 0 and (now - before) / before > threshold:
+            regressions.append(f"{name}: {before} -> {now} (+{(now - before) / before:.0%})")
+
+    for scenario, results in current["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(scenario)
+        if not base:
+            continue
+        check(f"{scenario} wall_time_s.median", results["wall_time_s"]["median"], base["wall_time_s"]["median"])
+        check(f"{scenario} playwright_calls", results["playwright_calls"], base["playwright_calls"])
+        for field_type, stats in results["field_types"].items():
+            if field_type in base.get("field_types", {}):
+                check(f"{scenario} {field_type}.p50_ms", stats["p50_ms"], base["field_types"][field_type]["p50_ms"])
+    return regressions
+
+
+def print_results(current: Dict[str, Any]):
+    for scenario, results in current["scenarios"].items():
+        wall = results["wall_time_s"]
+        print(f"\n📊 {scenario} ({results['runs']} runs): median {wall['median']}s (min {wall['min']}s, max {wall['max']}s), "
+              f"{results['playwright_calls']} Playwright calls")
+        print(f"  {'field type':<16}{'count':>7}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}")
+        for field_type, stats in results["field_types"].items():
+            print(f"  {field_type:<16}{stats['count']:>7.0f}{stats['p50_ms']:>10.1f}{stats['p90_ms']:>10.1f}{stats['p99_ms']:>10.1f}")
+
+
+async def run_benchmark(form_maps: List[str], runs: int, headless: bool) -> Dict[str, Any]:
+    """Benchmarks each recorded form map as its own replica application."""
+    # Run from scratch directories so the option cache starts cold and the
+    # dummy upload file does not land in the working tree.
+    cwd = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix="workday-bench-")
+    dummy_file = os.path.join(workdir, "dummy_file.pdf")
+    with open(dummy_file, "wb") as f:
+        f.write(b"%PDF-1.4\n%%EOF\n")
+
+    scenarios: Dict[str, Any] = {}
+    for path in form_maps:
+        with open(path) as f:
+            server, base_url = serve_site(build_site(json.load(f)))
+        scenario = os.path.basename(path)
+        try:
+            details = []
+            for run in range(1, runs + 1):
+                os.chdir(tempfile.mkdtemp(dir=workdir))
+                shutil.copy(dummy_file, "dummy_file.pdf")
+                result = await run_once(base_url, headless)
+                print(f"🏃 {scenario} run {run}: {result['wall_time_s']}s, {result['fields']} fields, {result['playwright_calls']} calls")
+                details.append(result)
+        finally:
+            os.chdir(cwd)
+            server.shutdown()
+        scenarios[scenario] = aggregate(details)
+    shutil.rmtree(workdir, ignore_errors=True)
+    return {"scenarios": scenarios}
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark traverse_and_process against local Workday replicas.")
+    parser.add_argument("--form-map", action="append", help="Recorded form map(s) to build replicas from.")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--headed", action="store_true", help="Show the browser.")
+    parser.add_argument("--output", default="output/benchmark.json", help="Where to write the results.")
+    parser.add_argument("--baseline", help="Previous results file to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed relative slowdown before flagging.")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    baseline = None
+    if args.baseline:
+        if os.path.abspath(args.baseline) == os.path.abspath(args.output):
+            sys.exit(f"❌ --output and --baseline are both {args.output}; write this run elsewhere "
+                     "(e.g. --output output/benchmark-new.json) so the baseline is not overwritten.")
+        # read before running so the comparison is against the previous results
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = asyncio.run(run_benchmark(args.form_map or DEFAULT_FORM_MAPS, max(1, args.runs), not args.headed))
+    print_results(results)
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("\n❌ Regressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\n✅ No regressions against baseline.")
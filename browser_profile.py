@@ -0,0 +1,82 @@
+import json
+import os
+from typing import Dict, Any, Optional
+from playwright.async_api import Browser, BrowserContext, Page, Playwright, Route
+from config import RUN_PROFILES, BLOCKED_RESOURCE_TYPES, BLOCKED_URL_PATTERNS
+
+PAGE_LOAD_LOG = "output/page_load_times.json"
+
+
+def get_run_profile(name: Optional[str] = None, record_video: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Resolves a run profile by name (argument, then WORKDAY_PROFILE, then "default").
+    WORKDAY_RECORD_VIDEO=1 or record_video=True turns video recording on for any profile.
+    """
+    name = name or os.getenv("WORKDAY_PROFILE") or "default"
+    if name not in RUN_PROFILES:
+        raise ValueError(f"Unknown run profile '{name}'. Choose one of: {', '.join(RUN_PROFILES)}")
+    profile = dict(RUN_PROFILES[name], name=name)
+    if record_video is None:
+        record_video = os.getenv("WORKDAY_RECORD_VIDEO", "").lower() in ("1", "true", "yes")
+    if record_video:
+        profile["record_video"] = True
+    return profile
+
+
+async def launch_browser(p: Playwright, profile: Dict[str, Any]) -> Browser:
+    return await p.chromium.launch(headless=profile["headless"])
+
+
+async def _block_route(route: Route):
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(pattern in request.url for pattern in BLOCKED_URL_PATTERNS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def new_context(browser: Browser, profile: Dict[str, Any], storage_state: Optional[str] = None,
+                      video_dir: str = "output/video") -> BrowserContext:
+    """Creates a browser context configured for the profile (video, resource blocking, session)."""
+    options: Dict[str, Any] = {"storage_state": storage_state}
+    if profile["record_video"]:
+        options["record_video_dir"] = video_dir
+        options["record_video_size"] = {"width": 1280, "height": 720}
+    context = await browser.new_context(**options)
+    if profile["block_resources"]:
+        await context.route("**/*", _block_route)
+    return context
+
+
+async def record_page_load(page: Page, profile: Dict[str, Any]) -> Optional[float]:
+    """
+    Reads the current document's navigation timing, stores it per profile and
+    prints the difference against the other profiles' last recorded times.
+    """
+    try:
+        load_ms = await page.evaluate(
+            """() => {
+                const nav = performance.getEntriesByType("navigation")[0];
+                return nav ? nav.loadEventEnd - nav.startTime : null;
+            }"""
+        )
+    except Exception as e:
+        print(f"⚠️ Could not read page-load timing: {e}")
+        return None
+    if not load_ms:
+        return None
+
+    times: Dict[str, float] = {}
+    if os.path.exists(PAGE_LOAD_LOG):
+        with open(PAGE_LOAD_LOG) as f:
+            times = json.load(f)
+    times[profile["name"]] = round(load_ms, 1)
+    os.makedirs(os.path.dirname(PAGE_LOAD_LOG), exist_ok=True)
+    with open(PAGE_LOAD_LOG, "w") as f:
+        json.dump(times, f, indent=2)
+
+    print(f"📄 Page load ({profile['name']} profile): {load_ms:.0f} ms")
+    for other, other_ms in times.items():
+        if other != profile["name"]:
+            print(f"   vs {other}: {other_ms:.0f} ms ({load_ms - other_ms:+.0f} ms)")
+    return load_ms
@@ -0,0 +1,71 @@
+import hashlib
+import json
+import os
+from typing import Dict, List, Any, Optional, Iterable
+from urllib.parse import urlparse
+from config import CHECKPOINT_DIR
+
+
+def checkpoint_path(tenant_url: str, email: str) -> str:
+    """Returns the journal file for one posting and account, so applications under different accounts never share one."""
+    host = urlparse(tenant_url).netloc.lower() or "unknown-tenant"
+    posting = hashlib.sha1(tenant_url.encode("utf-8")).hexdigest()[:12]
+    account = hashlib.sha1(email.strip().lower().encode("utf-8")).hexdigest()[:12]
+    return os.path.join(CHECKPOINT_DIR, f"{host}__{posting}__{account}.jsonl")
+
+
+class CheckpointJournal:
+    """
+    Append-only JSONL journal with one entry per completed application page:
+    page index, page name, URL, processed automation ids and extracted fields.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def append_page(self, page_index: int, page_name: str, url: str,
+                    processed_ids: Iterable[str], fields: List[Dict[str, Any]]):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        entry = {
+            "page_index": page_index,
+            "page_name": page_name,
+            "url": url,
+            "processed_ids": sorted(processed_ids),
+            "fields": fields,
+        }
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Returns the completed page entries; a torn last line from a crash is ignored."""
+        if not os.path.exists(self.path):
+            return []
+        entries = []
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+        return entries
+
+    def last_completed(self) -> Optional[Dict[str, Any]]:
+        entries = self.load()
+        return entries[-1] if entries else None
+
+    def completed_fields(self) -> List[Dict[str, Any]]:
+        return [field for entry in self.load() for field in entry["fields"]]
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def truncate(self, entries: List[Dict[str, Any]]):
+        """Rewrites the journal with only `entries` (e.g. the pages a resume actually got past)."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(f"{self.path}.tmp", "w") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+        os.replace(f"{self.path}.tmp", self.path)
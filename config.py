@@ -3,4 +3,103 @@ NEXT_BUTTON_SELECTORS = [
     'button[data-automation-id="pageFooterNextButton"]',
     'button[data-automation-id="saveAndContinueButton"]',
     'button[data-automation-id="nextButton"]',
-]
\ No newline at end of file
+]
+
+# Describe form containers with a single page.evaluate snapshot instead of
+# probing each container through individual locator calls.
+USE_DOM_SNAPSHOT = True
+
+# On-disk cache of harvested dropdown/multiselect option catalogs.
+USE_OPTION_CACHE = True
+OPTION_CACHE_PATH = "output/cache/options.sqlite3"
+OPTION_CACHE_TTL_SECONDS = 7 * 24 * 3600
+OPTION_CACHE_MAX_ENTRIES = 2000
+
+# Container structure signature -> field kind, learned across pages and runs,
+# so the locator path only runs the probe cascade for unseen widget markup.
+USE_FIELD_TYPE_CACHE = True
+FIELD_TYPE_CACHE_PATH = "output/cache/field_types.json"
+
+# Per-tenant page schemas: containers whose id and structure signature match
+# the stored schema are filled from it instead of being described again.
+USE_SCHEMA_REGISTRY = True
+SCHEMA_REGISTRY_DIR = "output/cache/schemas"
+
+# Reuse the saved browser storage state per tenant + email instead of logging in on every run.
+REUSE_SESSION = True
+SESSION_DIR = "output/sessions"
+
+# Candidate answers: prioritized keyword rules plus per-type defaults (JSON, or
+# YAML with PyYAML installed). Override with the CANDIDATE_PROFILE env var.
+# Multiselect values are "Top-level > Nested" paths.
+CANDIDATE_PROFILE_PATH = "candidate_profile.json"
+# Walk every top-level category to harvest the full nested catalog even when
+# the target path is known and the catalog is cached.
+HARVEST_MULTISELECT_CATALOGS = False
+
+# Browser run profiles, selected with --profile or the WORKDAY_PROFILE env var.
+RUN_PROFILES = {
+    "default": {"headless": False, "block_resources": False, "record_video": False},
+    "lightweight": {"headless": True, "block_resources": True, "record_video": False},
+    "debug": {"headless": False, "block_resources": False, "record_video": True},
+}
+# Resource types and URL fragments aborted when a profile blocks resources.
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+BLOCKED_URL_PATTERNS = [
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "hotjar.com",
+    "segment.io", "segment.com", "newrelic.com", "nr-data.net", "facebook.net", "linkedin.com/px",
+]
+
+# Count Playwright calls (round-trips) per method, field and handler and print
+# the hot spots at the end of a run; also enabled with --profile-calls.
+PROFILE_PLAYWRIGHT_CALLS = False
+
+# Apply plain text/number/textarea/date values for a page in one in-page script.
+BATCH_FILL = True
+
+# Opt-in: read field labels, required flags and option lists from the JSON
+# responses the Workday SPA fetches, using the DOM only for filling. Responses
+# are captured when their URL contains one of the patterns; recording keeps the
+# raw payloads as replayable fixtures.
+USE_NETWORK_CAPTURE = False
+NETWORK_CAPTURE_URL_PATTERNS = ["/wday/", "/cxs/", "/flowController"]
+RECORD_NETWORK_FIXTURES = False
+NETWORK_FIXTURE_DIR = "network_fixtures"  # inside the run's output directory
+
+# Per-posting page journals used to resume an interrupted traversal.
+CHECKPOINT_DIR = "output/checkpoints"
+
+# Stream field records to JSONL while traversing; large option lists can be
+# stored once by content hash and referenced from each field.
+STREAM_OUTPUT = True
+DEDUPE_OPTION_CATALOGS = True
+CATALOG_DEDUPE_MIN_OPTIONS = 20
+
+# Multi-process orchestrator: durable SQLite queue of postings. A job's lease
+# is renewed while its worker runs it; an expired lease (dead worker) makes the
+# job available again, and failed jobs are retried up to MAX_JOB_ATTEMPTS.
+WORK_QUEUE_PATH = "output/orchestrator/queue.sqlite3"
+JOB_LEASE_SECONDS = 300
+MAX_JOB_ATTEMPTS = 3
+
+# Browser lifecycle for batch/orchestrator runs: a context is reused for the
+# next posting of the same account and recycled (closed and recreated from the
+# saved session) after this many applications, when its JS heap or the
+# browser's process tree grows past the limits. Memory is sampled while an
+# application runs to report its peak.
+CONTEXT_MAX_APPLICATIONS = 5
+CONTEXT_MAX_HEAP_MB = 512
+BROWSER_MAX_RSS_MB = 4096
+MEMORY_SAMPLE_INTERVAL_S = 2.0
+
+# Per-field retries: transient Playwright errors (timeouts, detached or covered
+# elements, re-rendered contexts) are retried with exponential backoff; other
+# errors fail the field at once. Before clicking Next, fields Workday marks as
+# invalid (or required fields left empty) are filled again.
+FIELD_RETRY_ATTEMPTS = 3
+FIELD_RETRY_BASE_DELAY_MS = 150
+FIELD_RETRY_MAX_DELAY_MS = 1200
+# Timeout of each click, check and fill inside a retried field instead of
+# Playwright's 30 s default, so a stuck action costs seconds per attempt.
+FIELD_ACTION_TIMEOUT_MS = 3000
+REFILL_INVALID_FIELDS = True
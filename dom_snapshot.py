@@ -0,0 +1,142 @@
+from typing import Dict, List, Any, Set, Optional, Iterable
+from playwright.async_api import Page
+from field_types import STRUCTURE_SIGNATURE_JS
+
+# Single in-page pass that mirrors the locator probing in
+# form_processor.probe_container: label lookup, required flag, widget type
+# detection and the attributes the fill logic needs.
+SNAPSHOT_SCRIPT = r"""
+({ processed, only }) => {
+    const skip = new Set(processed);
+    const signatureOf = __STRUCTURE_SIGNATURE__;
+    const text = (el) => (el && el.textContent) || "";
+    const xpathFirst = (expr, ctx) =>
+        document.evaluate(expr, ctx, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+
+    const labelFor = (container, input) => {
+        const id = input.getAttribute("id");
+        if (id) {
+            const lbl = container.querySelector(`label[for="${CSS.escape(id)}"]`);
+            if (lbl && text(lbl).trim()) return text(lbl).trim();
+        }
+        return "";
+    };
+
+    const results = [];
+    const seen = new Set();
+    const containers = only
+        ? only.map(id => document.querySelector(`[data-automation-id="${CSS.escape(id)}"]`)).filter(Boolean)
+        : document.querySelectorAll('[data-automation-id^="formField-"]');
+    for (const container of containers) {
+        const automationId = container.getAttribute("data-automation-id") || "";
+        if (!automationId || skip.has(automationId) || seen.has(automationId)) continue;
+        seen.add(automationId);
+
+        const entry = {
+            automation_id: automationId,
+            label: "",
+            required: false,
+            kind: "unknown",
+            options: [],
+            input: {},
+            has_day: false,
+            component_id: "",
+            signature: signatureOf(container),
+        };
+
+        if (container.querySelector('input[data-automation-id="file-upload-input-ref"]')) {
+            let label = "";
+            const ariaElem = container.closest("[aria-labelledby]");
+            if (ariaElem) {
+                const linked = document.getElementById(ariaElem.getAttribute("aria-labelledby"));
+                if (linked) label = text(linked).trim();
+            }
+            if (!label) {
+                const heading = xpathFirst("preceding::*[self::h1 or self::h2 or self::h3][1]", container);
+                if (heading) label = text(heading).trim();
+            }
+            if (!label) label = text(container.querySelector("label")).trim();
+            const selectButton = container.querySelector("button[data-automation-id='select-files']");
+            entry.kind = "file";
+            entry.label = label || "File upload";
+            entry.component_id = container.getAttribute("data-fkit-id")
+                || container.getAttribute("id")
+                || (selectButton && selectButton.getAttribute("id"))
+                || "";
+            results.push(entry);
+            continue;
+        }
+
+        let label = "";
+        if (container.querySelector("legend")) {
+            const el = container.querySelector('legend [data-automation-id="richText"] p')
+                || container.querySelector("legend span")
+                || container.querySelector("legend label");
+            label = text(el);
+        } else {
+            label = text(container.querySelector("label"));
+        }
+        if (!label) {
+            const withLabel = container.querySelector("[aria-labelledby]");
+            const labelId = withLabel && withLabel.getAttribute("aria-labelledby");
+            if (labelId && !labelId.startsWith("hiddenDateValueId")) {
+                label = text(document.getElementById(labelId));
+            }
+        }
+        entry.required = label.includes("*");
+        entry.label = label.replace(/\*/g, "").trim();
+
+        const textInput = container.querySelector('input[type="text"], input[type="number"]');
+        if (container.querySelector('[data-automation-id="multiSelectContainer"]')) {
+            entry.kind = "multiselect";
+        } else if (container.querySelector('button[aria-haspopup="listbox"]')) {
+            entry.kind = "dropdown";
+        } else if (container.querySelector('input[type="radio"]')) {
+            entry.kind = "radio";
+            for (const radio of container.querySelectorAll('input[type="radio"]')) {
+                const option = labelFor(container, radio);
+                if (option) entry.options.push(option);
+            }
+        } else if (container.querySelector('input[type="checkbox"]')) {
+            entry.kind = "checkbox";
+            for (const checkbox of container.querySelectorAll('input[type="checkbox"]')) {
+                let option = labelFor(container, checkbox);
+                if (!option) option = text(checkbox.closest("label")).trim();
+                if (option) entry.options.push(option);
+            }
+        } else if (container.querySelector('input[data-automation-id*="date"]')) {
+            entry.kind = "date";
+            entry.has_day = !!container.querySelector('input[data-automation-id="dateSectionDay-input"]');
+        } else if (container.querySelector("textarea")) {
+            entry.kind = "textarea";
+        } else if (textInput) {
+            entry.kind = "text";
+            entry.input = {
+                id: textInput.getAttribute("id") || "",
+                type: (textInput.getAttribute("type") || "").toLowerCase(),
+                inputmode: (textInput.getAttribute("inputmode") || "").toLowerCase(),
+                pattern: textInput.getAttribute("pattern") || "",
+                readonly: textInput.hasAttribute("readonly"),
+                disabled: textInput.hasAttribute("disabled"),
+            };
+        }
+        results.push(entry);
+    }
+    return results;
+}
+""".replace("__STRUCTURE_SIGNATURE__", STRUCTURE_SIGNATURE_JS.strip())
+
+
+async def snapshot_form_fields(page: Page, processed_handles: Set[str],
+                               only_ids: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Describe every unprocessed formField container (or just `only_ids`) with one page.evaluate call.
+    Returned automation ids are marked as processed, like the locator path does.
+    """
+    only = list(only_ids) if only_ids is not None else None
+    entries: List[Dict[str, Any]] = await page.evaluate(
+        SNAPSHOT_SCRIPT, {"processed": list(processed_handles), "only": only}
+    )
+    for entry in entries:
+        processed_handles.add(entry["automation_id"])
+    return entries
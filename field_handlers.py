@@ -1,159 +1,402 @@
 # field_handlers.py
-from typing import Tuple, Optional, List
+from typing import Tuple, Optional, List, Dict, Any, Sequence
 from playwright.async_api import Locator, Page
-from utils import close_all_popups, wait_for_popup, arbitrary_user_data
-
-async def handle_resume_upload(page: Page, resume_path: str) -> bool:
+import re
+from utils import close_all_popups, wait_for_popup, get_multiselect_path
+from option_matcher import option_index, match_path
+from value_resolver import get_resolver
+from config import USE_OPTION_CACHE, HARVEST_MULTISELECT_CATALOGS, FIELD_ACTION_TIMEOUT_MS
+from option_cache import OPTION_CACHE, tenant_host, fingerprint_options
+from tracing import traced
+from uploads import UploadManager
+from retry import TransientFieldError, PermanentFieldError, is_transient
+from waits import (
+    wait_for_options_stable, wait_for_popups_closed, wait_for_aria_expanded, wait_for_listbox_attached,
+    wait_for_visible,
+)
+
+@traced("handler")
+async def handle_resume_upload(page: Page, resume_path: str, uploads: Optional[UploadManager] = None) -> bool:
     """Handles the resume upload process."""
     upload_button_selector = 'button[data-automation-id="select-files"]'
+    uploads = uploads or UploadManager(resume_path)
     try:
         upload_button = page.locator(upload_button_selector).first
         await upload_button.wait_for(state="visible", timeout=5000)
-        
+
         if await upload_button.is_visible():
             print(f"  -> Found resume upload button. Attaching file: {resume_path}")
-            async with page.expect_file_chooser() as fc_info:
-                await upload_button.click()
-            file_chooser = await fc_info.value
-            await file_chooser.set_files(resume_path)
+            await uploads.upload_via_chooser(page, upload_button, "resume", resume_path)
             print("  -> Resume file selected successfully.")
-            await page.wait_for_timeout(2000)
             return True
     except Exception as e:
         print(f"  -> Resume upload failed or not found: {e}")
     return False
 
 
-
-from typing import Tuple, List, Dict
-from playwright.async_api import Page, Locator
-
-
-async def extract_all_multiselect_options(popup: Locator, page: Page) -> List[str]:
-    """Scrolls through a virtualized dropdown and extracts all available options."""
-    seen = set()
-    scroll_attempts = 0
-
-    while True:
-        options = await popup.locator('[role="option"]').all_text_contents()
-        new_options = [opt.strip() for opt in options if opt.strip() and opt.strip() not in seen]
-
-        if not new_options:
-            scroll_attempts += 1
-        else:
-            scroll_attempts = 0
-
-        seen.update(new_options)
-
-        if scroll_attempts >= 5:
-            break
-
-        count = await popup.locator('[role="option"]').count()
-        if count == 0:
-            break
-
-        last_option = popup.locator('[role="option"]').nth(count - 1)
+# Harvests a virtualized option list inside the page: scrolls the list's
+# scroll container one viewport at a time, collecting newly rendered options
+# in order, and stops as soon as scrollTop stops advancing.
+HARVEST_OPTIONS_SCRIPT = """
+async (popup, { settleMs, maxScrolls }) => {
+    const start = performance.now();
+    const optionNodes = () => popup.querySelectorAll('[role="option"]');
+    const signature = () => {
+        const opts = optionNodes();
+        return opts.length + "|" + (opts.length ? opts[0].textContent + "|" + opts[opts.length - 1].textContent : "");
+    };
+
+    let scroller = popup;
+    const firstOption = optionNodes()[0];
+    for (let el = firstOption ? firstOption.parentElement : null; el; el = el.parentElement) {
+        const overflow = getComputedStyle(el).overflowY;
+        if (el.scrollHeight > el.clientHeight + 1 && (overflow === "auto" || overflow === "scroll")) {
+            scroller = el;
+            break;
+        }
+        if (el === popup) break;
+    }
+
+    const ordered = [];
+    const seen = new Set();
+    const collect = () => {
+        for (const opt of optionNodes()) {
+            const text = (opt.textContent || "").trim();
+            if (text && !seen.has(text)) {
+                seen.add(text);
+                ordered.push(text);
+            }
+        }
+    };
+
+    // The last rendered option reaches the end of the scroll content: nothing
+    // is virtualized past it, so scrolling further cannot reveal new options.
+    const tailRendered = () => {
+        const opts = optionNodes();
+        if (!opts.length) return false;
+        const bottom = opts[opts.length - 1].getBoundingClientRect().bottom
+            - scroller.getBoundingClientRect().top + scroller.scrollTop;
+        return bottom >= scroller.scrollHeight - 2;
+    };
+
+    let scrolls = 0;
+    collect();
+    while (scrolls < maxScrolls) {
+        const before = scroller.scrollTop;
+        if (before + scroller.clientHeight >= scroller.scrollHeight - 1 || tailRendered()) break;
+        const previous = signature();
+        scroller.scrollTop = before + scroller.clientHeight;
+        if (scroller.scrollTop <= before) break;
+        scrolls += 1;
+
+        const waitStart = performance.now();
+        while (performance.now() - waitStart < settleMs && signature() === previous) {
+            await new Promise(r => requestAnimationFrame(r));
+        }
+        collect();
+    }
+    return { options: ordered, scrolls, elapsed_ms: performance.now() - start };
+}
+"""
+
+# Per-list harvest timings for the current run.
+HARVEST_TIMINGS: List[Dict[str, Any]] = []
+
+
+async def extract_all_multiselect_options(popup: Locator, page: Page, name: str = "") -> List[str]:
+    """Scrolls through a virtualized dropdown and extracts all available options in list order."""
+    result = await popup.evaluate(HARVEST_OPTIONS_SCRIPT, {"settleMs": 200, "maxScrolls": 500})
+    HARVEST_TIMINGS.append({
+        "name": name,
+        "options": len(result["options"]),
+        "scrolls": result["scrolls"],
+        "elapsed_ms": round(result["elapsed_ms"], 1),
+    })
+    print(f"  -> Harvested {len(result['options'])} options in {result['elapsed_ms']:.0f} ms ({result['scrolls']} scrolls)")
+    return result["options"]
+
+# Jumps a virtualized list straight to a known option position, using the
+# rendered row height, so the option is drawn without stepping through the list.
+SCROLL_TO_INDEX_SCRIPT = """
+(popup, index) => {
+    const first = popup.querySelector('[role="option"]');
+    if (!first) return false;
+    let scroller = popup;
+    for (let el = first.parentElement; el; el = el.parentElement) {
+        const overflow = getComputedStyle(el).overflowY;
+        if (el.scrollHeight > el.clientHeight + 1 && (overflow === "auto" || overflow === "scroll")) {
+            scroller = el;
+            break;
+        }
+        if (el === popup) break;
+    }
+    const rowHeight = first.getBoundingClientRect().height || 1;
+    scroller.scrollTop = Math.max(0, index * rowHeight - scroller.clientHeight / 2);
+    return true;
+}
+"""
+
+
+async def scroll_to_option(popup: Locator, target_option: str, page: Page, max_scrolls: int = 30,
+                           index: Optional[int] = None) -> Optional[Locator]:
+    """
+    Scrolls through a virtualized multiselect until the desired option is visible and returns its locator.
+    With the option's catalog position known, jumps there first instead of scanning.
+    """
+    options = popup.locator('[data-automation-id="promptOption"]')
+    if index is not None:
         try:
-            await last_option.scroll_into_view_if_needed()
-            await page.wait_for_timeout(200)
-        except:
-            break
-
-    return sorted(seen)
+            if await popup.evaluate(SCROLL_TO_INDEX_SCRIPT, index):
+                await wait_for_options_stable(popup, budget_ms=300, name="scroll_to_option:jump")
+        except Exception:
+            pass
 
-async def scroll_to_option(popup: Locator, target_option: str, page: Page, max_scrolls: int = 30) -> Optional[Locator]:
-    """Scrolls through a virtualized multiselect until the desired option is visible and returns its locator."""
     for _ in range(max_scrolls):
         try:
-            locator = popup.locator(f'[data-automation-id="promptOption"]:has-text("{target_option}")').first
+            locator = options.filter(has_text=target_option).first
             if await locator.is_visible():
                 return locator
         except:
             pass
 
         # Scroll down by scrolling to the last visible item
-        count = await popup.locator('[data-automation-id="promptOption"]').count()
+        count = await options.count()
         if count == 0:
             return None
 
-        last = popup.locator('[data-automation-id="promptOption"]').nth(count - 1)
+        last = options.nth(count - 1)
         try:
-            await last.scroll_into_view_if_needed()
-            await page.wait_for_timeout(300)
+            await last.scroll_into_view_if_needed(timeout=FIELD_ACTION_TIMEOUT_MS)
+            await wait_for_options_stable(popup, budget_ms=300, name="scroll_to_option")
         except:
             return None
 
     return None
 
 
-async def handle_multiselect(container: Locator, label_text: str, page: Page) -> Tuple[str, List[str], List[str], Dict[str, List[str]]]:
-    """Extracts all top-level and nested multiselect options with mapping."""
+async def cached_catalog(page: Page, popup: Locator, automation_id: str) -> Tuple[Optional[Any], Optional[Tuple[str, str, str]]]:
+    """Looks up an open popup's catalog in the option cache; returns (catalog, cache key)."""
+    if not USE_OPTION_CACHE or not automation_id:
+        return None, None
+    try:
+        key = (tenant_host(page.url), automation_id, await fingerprint_options(popup))
+    except Exception as e:
+        print(f"⚠️ Could not fingerprint options for '{automation_id}': {e}")
+        return None, None
+    catalog = OPTION_CACHE.get(*key)
+    if catalog is not None:
+        print(f"  -> Option catalog cache hit for '{automation_id}'")
+    return catalog, key
+
+
+def store_catalog(key: Optional[Tuple[str, str, str]], catalog: Any):
+    """Stores a freshly harvested catalog under the key returned by cached_catalog."""
+    if key is not None and catalog:
+        OPTION_CACHE.put(*key, catalog)
+
+
+def preferred_option_index(field_type: str, label_text: str, options: List[str], default: int = 0) -> int:
+    """Position of the profile's value for this field in `options`, or `default` when it has none."""
+    rule = get_resolver().match_rule(field_type, label_text)
+    if rule and options:
+        idx = option_index(options).match(rule["value"])
+        if idx is not None:
+            return idx
+    return default
+
+
+async def select_option_path(page: Page, input_field: Locator, path: List[str],
+                             positions: Optional[List[Optional[int]]] = None, chosen: Sequence[str] = ()) -> List[str]:
+    """
+    Reopens a multiselect and clicks a top-level option followed by its nested
+    option; a leaf already in `chosen` is not clicked again.
+    """
+    if path and path[-1] in chosen:
+        print(f"  -> '{path[-1]}' is already selected")
+        return list(path)
+    selected: List[str] = []
+    await page.keyboard.press("Escape")
+    await wait_for_popups_closed(page, budget_ms=300, name="multiselect:reopen_close")
+    await input_field.click(force=True, timeout=FIELD_ACTION_TIMEOUT_MS)
+
+    popup = await wait_for_popup(page)
+    for depth, target in enumerate(path):
+        if not popup:
+            break
+        await wait_for_options_stable(popup, budget_ms=600, name="multiselect:reopen")
+        position = positions[depth] if positions and depth < len(positions) else None
+        option_locator = await scroll_to_option(popup, target, page, index=position)
+        if not option_locator:
+            print(f"⚠️ Option '{target}' not found after scrolling")
+            break
+        await option_locator.click(timeout=FIELD_ACTION_TIMEOUT_MS)
+        selected.append(target)
+        if depth + 1 < len(path):
+            popup = await wait_for_popup(page, timeout=1500)
+
+    await page.keyboard.press("Escape")
+    return selected
+
+
+async def select_by_search(page: Page, input_field: Locator, path: List[str], chosen: Sequence[str] = ()) -> List[str]:
+    """
+    Types the target leaf into the multiselect search box and clicks the
+    matching result; a leaf already in `chosen` is not clicked again.
+    """
+    leaf = path[-1]
+    if leaf in chosen:
+        print(f"  -> '{leaf}' is already selected")
+        return list(path)
+    search_term = re.sub(r"\s*\(.*?\)", "", leaf).strip() or leaf
+    await input_field.fill(search_term, timeout=FIELD_ACTION_TIMEOUT_MS)
+    await page.keyboard.press("Enter")
+
+    popup = await wait_for_popup(page)
+    if not popup:
+        return []
+    await wait_for_options_stable(popup, budget_ms=1000, name="multiselect:search")
+
+    option = popup.locator('[role="option"]').filter(has_text=leaf).first
+    if await option.count() == 0:
+        return []
+    await option.click(timeout=FIELD_ACTION_TIMEOUT_MS)
+    await page.keyboard.press("Escape")
+    return list(path)
+
+
+async def selected_items(container: Locator) -> List[str]:
+    """Values a multiselect already shows as chosen (its selected-item pills)."""
+    try:
+        texts = await container.locator('[data-automation-id="selectedItem"]').all_inner_texts()
+    except Exception:
+        return []
+    return [text.strip() for text in texts if text.strip()]
+
+
+def known_catalog(options: List[Any]) -> Dict[str, Any]:
+    """Turns captured field options (flat, or [{top: [nested]}]) into a multiselect catalog."""
+    if options and isinstance(options[0], dict):
+        return {"top": list(options[0]), "nested": {top: nested for top, nested in options[0].items() if nested}}
+    return {"top": [opt for opt in options if isinstance(opt, str)], "nested": {}}
+
+
+@traced("handler")
+async def handle_multiselect(container: Locator, label_text: str, page: Page, automation_id: str = "",
+                             harvest: bool = HARVEST_MULTISELECT_CATALOGS,
+                             known_options: Optional[List[Any]] = None) -> Tuple[str, List[str], List[str], Dict[str, List[str]]]:
+    """
+    Extracts all top-level and nested multiselect options with mapping.
+    When the target path is configured and the catalog is cached or known from
+    captured responses (and harvest is off), the value is selected through the
+    search box without walking the tree. Values the field already shows as
+    chosen (e.g. from an earlier attempt) are not clicked again, since a second
+    click would toggle them off.
+    """
     field_type = "multiselect"
     await close_all_popups(page)
+    chosen = await selected_items(container)
 
     input_field = container.locator('input').first
     try:
-        await input_field.click(force=True)
+        await input_field.click(force=True, timeout=FIELD_ACTION_TIMEOUT_MS)
     except:
-        await input_field.scroll_into_view_if_needed()
-        await page.wait_for_timeout(500)
-        await input_field.click(force=True)
+        await input_field.scroll_into_view_if_needed(timeout=FIELD_ACTION_TIMEOUT_MS)
+        await wait_for_visible(input_field, budget_ms=500, name="multiselect:scroll_retry")
+        await input_field.click(force=True, timeout=FIELD_ACTION_TIMEOUT_MS)
 
-    await page.wait_for_timeout(800)
     popup = await wait_for_popup(page)
 
     if not popup:
         print("⚠️ No popup appeared after clicking")
         return field_type, [], [], {}
+    await wait_for_options_stable(popup, budget_ms=800, name="multiselect:open")
 
     selected_values = []
     nested_options_dict = {}
-
+    if known_options:
+        catalog, cache_key = known_catalog(known_options), None
+    else:
+        catalog, cache_key = await cached_catalog(page, popup, automation_id)
+
+    target_path = get_multiselect_path(label_text)
+    target_positions: Optional[List[Optional[int]]] = None
+    if target_path and catalog is not None:
+        # Map the profile path onto the catalog's exact option texts
+        if isinstance(catalog, dict):
+            target_path, target_positions = match_path(target_path, catalog["top"], catalog["nested"])
+        else:
+            target_path, target_positions = match_path(target_path, catalog, {})
+    if target_path and catalog is not None and not harvest:
+        selected_values = await select_by_search(page, input_field, target_path, chosen)
+        if selected_values:
+            print(f"  -> Selected '{' > '.join(selected_values)}' via search")
+            if isinstance(catalog, dict):
+                nested_options_dict = catalog["nested"]
+            return field_type, [nested_options_dict], selected_values
+        print(f"⚠️ Search selection for '{label_text}' failed, walking the option tree")
+        if cache_key is not None:
+            # the cached catalog names an option the list no longer has
+            OPTION_CACHE.invalidate(*cache_key)
+            catalog = None
 
     if "Phone Code" in label_text:
-        preferred_option = "India (+91)"
-        
+
         # Trigger all options to render
-        await input_field.fill("")
-        await page.wait_for_timeout(1000)
+        await input_field.fill("", timeout=FIELD_ACTION_TIMEOUT_MS)
+        await wait_for_options_stable(popup, budget_ms=1000, name="multiselect:phone_reset")
 
         # Extract all phone code options
-        top_level_options = await extract_all_multiselect_options(popup, page)
+        if catalog is not None:
+            top_level_options = catalog["top"] if isinstance(catalog, dict) else catalog
+        else:
+            top_level_options = await extract_all_multiselect_options(popup, page, name=label_text)
+            store_catalog(cache_key, top_level_options)
         print("Phone code options found:", top_level_options)
 
-        # Try selecting preferred option
-        if preferred_option in top_level_options:
-            await input_field.fill("India")
-            await page.keyboard.press("Enter")
-            await page.wait_for_timeout(1000)
-            option = popup.locator(f'[role="option"]:has-text("{preferred_option}")').first
+        # Try selecting the profile's phone code
+        wanted = target_path[-1] if target_path else ""
+        preferred_option = option_index(top_level_options).best(wanted) if wanted else None
+        if preferred_option:
             try:
-                await option.click()
-                selected_values.append(preferred_option)
+                selected_values = await select_by_search(page, input_field, [preferred_option], chosen)
             except Exception as e:
                 print(f"⚠️ Failed to click preferred option '{preferred_option}': {e}")
         else:
-            print(f"⚠️ Preferred option '{preferred_option}' not in list")
+            print(f"⚠️ Preferred option '{wanted}' not in list")
 
         return field_type, [nested_options_dict], selected_values
 
 
+    if catalog is not None:
+        # Catalog already known: only select a value, skip the exhaustive harvest
+        nested_options_dict = catalog["nested"]
+        top_opt = next((opt for opt in catalog["top"] if nested_options_dict.get(opt)), None)
+        positions = None
+        if target_path:
+            path, positions = target_path, target_positions
+        elif top_opt:
+            path = [top_opt, nested_options_dict[top_opt][0]]
+        else:
+            path = catalog["top"][:1]
+        selected_values = await select_option_path(page, input_field, path, positions, chosen) if path else []
+        return field_type, [nested_options_dict], selected_values
+
     # Step 1: Extract all top-level options
-    top_level_options = await extract_all_multiselect_options(popup, page)
+    top_level_options = await extract_all_multiselect_options(popup, page, name=label_text)
 
     print("Top-level options found:", top_level_options)
     selected_values = ["", ""]
     idx = 0
+    target_top = option_index(top_level_options).best(target_path[0]) if target_path else None
 
     # Step 2: Loop through each top-level option text (not locator)
-    for top_opt in top_level_options:
+    for position, top_opt in enumerate(top_level_options):
         # Reopen dropdown every time
         await page.keyboard.press("Escape")
-        await page.wait_for_timeout(300)
+        await wait_for_popups_closed(page, budget_ms=300, name="multiselect:reopen_close")
 
         try:
-            await input_field.click(force=True)
-            await page.wait_for_timeout(600)
+            await input_field.click(force=True, timeout=FIELD_ACTION_TIMEOUT_MS)
         except:
             print(f"⚠️ Couldn't reopen multiselect for option '{top_opt}'")
             continue
@@ -162,12 +405,16 @@ async def handle_multiselect(container: Locator, label_text: str, page: Page) ->
         if not popup:
             print("⚠️ Popup not found on reopen.")
             continue
+        await wait_for_options_stable(popup, budget_ms=600, name="multiselect:reopen")
 
         # Now get the option element for the current visible popup
-        option_locator = await scroll_to_option(popup, top_opt, page)
-        if option_locator:
+        option_locator = await scroll_to_option(popup, top_opt, page, index=position)
+        if option_locator and top_opt in chosen:
+            # a flat list's option that is already chosen; clicking would deselect it
+            selected_values[idx] = top_opt
+        elif option_locator:
             try:
-                await option_locator.click()
+                await option_locator.click(timeout=FIELD_ACTION_TIMEOUT_MS)
                 selected_values[idx] = top_opt
             except Exception as e:
                 print(f"⚠️ Failed to click option '{top_opt}': {e}")
@@ -181,32 +428,66 @@ async def handle_multiselect(container: Locator, label_text: str, page: Page) ->
         nested_popup = await wait_for_popup(page, timeout=1500)
         if nested_popup:
             try:
-                nested_opts = await extract_all_multiselect_options(nested_popup, page)
+                nested_opts = await extract_all_multiselect_options(nested_popup, page, name=f"{label_text} > {top_opt}")
                 if nested_opts:
                     nested_options_dict[top_opt] = nested_opts
 
-                # Optionally click first nested option
+                # Click the profile's nested option under its top-level choice, else the first one
+                pick = 0
+                if top_opt == target_top and len(target_path) > 1:
+                    pick = option_index(nested_opts).match(target_path[-1]) or 0
                 try:
-                    first_nested = nested_popup.locator('[role="option"]').first
-                    await first_nested.click()
-                    selected_values[idx] = nested_opts[0]
+                    if nested_opts[pick] in chosen:
+                        selected_values[idx] = nested_opts[pick]
+                    else:
+                        nested_option = await scroll_to_option(nested_popup, nested_opts[pick], page, index=pick)
+                        await (nested_option or nested_popup.locator('[role="option"]').first).click(
+                            timeout=FIELD_ACTION_TIMEOUT_MS
+                        )
+                        selected_values[idx] = nested_opts[pick] if nested_option else nested_opts[0]
                 except:
                     pass
             except Exception as e:
                 print(f"⚠️ Failed extracting nested options for '{top_opt}': {e}")
 
         await page.keyboard.press("Escape")
-        await page.wait_for_timeout(300)
+        await wait_for_popups_closed(page, budget_ms=300, name="multiselect:nested_close")
 
         if not nested_popup:
             break
         idx = 0
 
     await page.keyboard.press("Escape")
+    store_catalog(cache_key, {"top": top_level_options, "nested": nested_options_dict})
     return field_type, [nested_options_dict], selected_values
 
-async def handle_dropdown(container: Locator, label_text: str, page: Page, automation_id: str) -> Tuple[str, List[str], Optional[str]]:
-    """Handles dropdown fields."""
+def option_by_text(option_items: Locator, text: str) -> Locator:
+    """The rendered option whose whole text is `text`; catalog positions need not match DOM positions."""
+    return option_items.filter(has_text=re.compile(rf"^\s*{re.escape(text)}\s*$")).first
+
+
+async def click_option(option_items: Locator, text: str):
+    """Clicks the rendered option `text`; when it is not in the list a retry cannot help, so that is permanent."""
+    option = option_by_text(option_items, text)
+    if await option.count() == 0:
+        raise PermanentFieldError(f"Resolved option '{text}' not present in the list")
+    await option.click(timeout=FIELD_ACTION_TIMEOUT_MS)
+
+
+async def picked_option_rendered(option_items: Locator, label_text: str, options: List[str]) -> bool:
+    """Whether the option the profile picks from a stored list is rendered exactly once in the open listbox."""
+    pick = preferred_option_index("dropdown", label_text, options, default=len(options) - 1)
+    return await option_by_text(option_items, options[pick]).count() == 1
+
+
+@traced("handler")
+async def handle_dropdown(container: Locator, label_text: str, page: Page, automation_id: str,
+                          known_options: Optional[List[str]] = None) -> Tuple[str, List[str], Optional[str]]:
+    """
+    Handles dropdown fields. With `known_options` (stored schema or captured
+    responses) the list is not read from the DOM, unless the option to pick is
+    no longer rendered; then the live list is read and returned instead.
+    """
     field_type = "dropdown"
     options = []
     selected_value = None
@@ -214,45 +495,75 @@ async def handle_dropdown(container: Locator, label_text: str, page: Page, autom
     try:
         await close_all_popups(page)
         await page.keyboard.press("Escape")
-        await page.wait_for_timeout(300)
+        await wait_for_popups_closed(page, budget_ms=300, name="dropdown:pre_close")
 
         dropdown_button = container.locator('button[aria-haspopup="listbox"]').first
-        await dropdown_button.scroll_into_view_if_needed()
+        await dropdown_button.scroll_into_view_if_needed(timeout=FIELD_ACTION_TIMEOUT_MS)
 
         if not await dropdown_button.is_visible():
-            await container.scroll_into_view_if_needed()
-            await page.wait_for_timeout(500)
+            await container.scroll_into_view_if_needed(timeout=FIELD_ACTION_TIMEOUT_MS)
+            await wait_for_visible(dropdown_button, budget_ms=500, name="dropdown:scroll_retry")
 
-        await dropdown_button.click()
-        await page.wait_for_timeout(500)
+        await dropdown_button.click(timeout=FIELD_ACTION_TIMEOUT_MS)
+        await wait_for_aria_expanded(dropdown_button, True, budget_ms=250, name="dropdown:expanded")
+        await wait_for_listbox_attached(page, 'ul[role="listbox"]', budget_ms=250, name="dropdown:listbox")
 
         listboxes = page.locator('ul[role="listbox"]')
         count = await listboxes.count()
         if count == 0:
-            raise Exception("No listbox found")
+            raise TransientFieldError("No listbox found")
         
         listbox = listboxes.nth(count - 1)
-        await listbox.wait_for()
+        await listbox.wait_for(timeout=FIELD_ACTION_TIMEOUT_MS)
 
         option_items = listbox.locator('li[role="option"], [role="option"]')
-        count = await option_items.count()
+        if known_options and await option_items.count() == len(known_options):
+            catalog, cache_key = known_options, None
+            if not await picked_option_rendered(option_items, label_text, known_options):
+                # an option was renamed; the live list replaces the stored one
+                print(f"⚠️ Known options for '{label_text}' are out of date, reading the list")
+                catalog = None
+        else:
+            catalog, cache_key = await cached_catalog(page, listbox, automation_id)
+            if catalog and not await picked_option_rendered(option_items, label_text, catalog):
+                # same count, first and last option, but one in between changed
+                print(f"⚠️ Cached options for '{automation_id}' are stale, harvesting again")
+                OPTION_CACHE.invalidate(*cache_key)
+                catalog = None
+
+        if catalog is not None:
+            options = list(catalog)
+            if options:
+                pick = preferred_option_index(field_type, label_text, options, default=len(options) - 1)
+                await click_option(option_items, options[pick])
+                selected_value = options[pick]
+        else:
+            count = await option_items.count()
 
-        for i in range(count):
-            item = option_items.nth(i)
-            text = (await item.inner_text()).strip()
-            if text and text not in options:
-                options.append(text)
+            for i in range(count):
+                item = option_items.nth(i)
+                text = (await item.inner_text(timeout=FIELD_ACTION_TIMEOUT_MS)).strip()
+                if text and text not in options:
+                    options.append(text)
+            store_catalog(cache_key, options)
 
-        if options:
-            last_option_text = options[-1]
-            await option_items.nth(len(options) - 1).click()
-            selected_value = last_option_text
+            if options:
+                pick = preferred_option_index(field_type, label_text, options, default=len(options) - 1)
+                await click_option(option_items, options[pick])
+                selected_value = options[pick]
 
         await page.keyboard.press("Escape")
-        await page.wait_for_timeout(200)
+        await wait_for_popups_closed(page, budget_ms=200, name="dropdown:close")
 
         return field_type, options, selected_value
 
     except Exception as e:
+        if is_transient(e):
+            # let the caller's retry policy try again from a closed popup
+            try:
+                await page.keyboard.press("Escape")
+            except Exception:
+                pass
+            raise
         print(f"⚠️ Dropdown handling failed for '{label_text}': {e}")
         return field_type, [], None
\ No newline at end of file
@@ -0,0 +1,117 @@
+import json
+import os
+from typing import Dict, Any, Optional
+from playwright.async_api import Locator
+from config import FIELD_TYPE_CACHE_PATH
+
+# Structural signature of a formField container: the tag / type / role /
+# aria-haspopup / data-automation-id skeleton of its descendants, with digits
+# masked and repeated sibling shapes collapsed, so the same widget markup
+# hashes the same regardless of labels, ids or option count.
+STRUCTURE_SIGNATURE_JS = r"""
+(root) => {
+    const mask = (value) => value.replace(/\d+/g, "#");
+    const skeleton = (el, depth) => {
+        let shape = el.tagName.toLowerCase();
+        for (const attr of ["type", "role", "aria-haspopup", "data-automation-id"]) {
+            const value = el.getAttribute(attr);
+            if (value) shape += `[${attr}=${mask(value)}]`;
+        }
+        if (depth >= 8) return shape;
+        const children = [];
+        for (const child of el.children) {
+            const childShape = skeleton(child, depth + 1);
+            if (!children.includes(childShape)) children.push(childShape);
+        }
+        return children.length ? `${shape}(${children.join(",")})` : shape;
+    };
+    const parts = [];
+    for (const child of root.children) {
+        const childShape = skeleton(child, 1);
+        if (!parts.includes(childShape)) parts.push(childShape);
+    }
+    // FNV-1a, 32 bit
+    let hash = 0x811c9dc5;
+    for (const ch of parts.join(",")) {
+        hash ^= ch.charCodeAt(0);
+        hash = Math.imul(hash, 0x01000193) >>> 0;
+    }
+    return hash.toString(16).padStart(8, "0");
+}
+"""
+
+
+async def structure_signature(container: Locator) -> str:
+    """Computes the container's structural signature in one round-trip."""
+    return await container.evaluate(STRUCTURE_SIGNATURE_JS)
+
+
+class FieldTypeCache:
+    """
+    Persistent map of container structure signature -> field kind, so known
+    widget markup skips the probe cascade. Hits and misses are counted for
+    lookups made instead of probing, which only happens on the locator path
+    (USE_DOM_SNAPSHOT off); the snapshot path classifies in the page and only
+    teaches the cache, so with it the hit rate is None rather than 0.
+    """
+
+    def __init__(self, path: str = FIELD_TYPE_CACHE_PATH):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        self._kinds: Optional[Dict[str, str]] = None
+
+    @property
+    def kinds(self) -> Dict[str, str]:
+        if self._kinds is None:
+            try:
+                with open(self.path) as f:
+                    self._kinds = json.load(f)
+            except (OSError, ValueError):
+                self._kinds = {}
+        return self._kinds
+
+    def get(self, signature: str) -> Optional[str]:
+        kind = self.kinds.get(signature)
+        if kind is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return kind
+
+    def put(self, signature: str, kind: str):
+        if signature and self.kinds.get(signature) != kind:
+            self.kinds[signature] = kind
+            self.dirty = True
+
+    def save(self):
+        """Writes the map to disk if it changed (atomically, via a temp file)."""
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.kinds, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def reset(self):
+        """Forgets the loaded map and the counters; the next lookup reads `path` again."""
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        self._kinds = None
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "lookups": lookups,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "signatures": len(self.kinds),
+        }
+
+
+FIELD_TYPE_CACHE = FieldTypeCache()
@@ -1,397 +1,809 @@
 # form_processor.py
-from typing import Dict, List, Any, Set
-from playwright.async_api import Page, ElementHandle
-from config import NEXT_BUTTON_SELECTORS
-from field_handlers import handle_resume_upload, handle_multiselect, handle_dropdown
+import asyncio
+import time
+from typing import Dict, List, Any, Set, Optional, Callable
+from playwright.async_api import Page, ElementHandle, Locator
+from config import (
+    NEXT_BUTTON_SELECTORS, USE_DOM_SNAPSHOT, BATCH_FILL, USE_FIELD_TYPE_CACHE, USE_SCHEMA_REGISTRY, REFILL_INVALID_FIELDS,
+    FIELD_ACTION_TIMEOUT_MS,
+)
+from batch_fill import BatchFiller
+from checkpoint import CheckpointJournal
+from output_writer import StreamingFieldWriter
+from network_capture import NetworkCapture
+from uploads import UploadManager
+from dom_snapshot import snapshot_form_fields
+from field_types import FIELD_TYPE_CACHE, structure_signature
+from schema_registry import SCHEMA_REGISTRY, page_containers
+from waits import WAIT_STATS, wait_for_checked
+from section_expander import expand_add_sections
+from tracing import TRACER, traced
+from retry import FIELD_RETRY
+from field_handlers import handle_multiselect, handle_dropdown
 from utils import arbitrary_user_data, get_text_input_value, close_all_popups
+from value_resolver import get_resolver
 
-async def handle_add_buttons(page: Page, fields: List[Dict[str, Any]], processed_handles: Set[str]) -> List[Dict[str, Any]]:
+FieldCallback = Callable[[Dict[str, Any]], None]
+
+
+@traced("handler")
+async def handle_add_buttons(page: Page, fields: List[Dict[str, Any]], processed_handles: Set[str],
+                             on_field: Optional[FieldCallback] = None,
+                             capture: Optional[NetworkCapture] = None,
+                             uploads: Optional[UploadManager] = None) -> List[Dict[str, Any]]:
     """
     Click all *original* Add buttons (snapshot as element handles) to expand
-    sections and extract any newly added fields.
+    sections and extract the fields each click inserted.
     """
     # Snapshot element handles of the original add buttons to avoid index detachment.
     original_button_handles: List[ElementHandle] = await page.query_selector_all('button[data-automation-id="add-button"]')
     print(f"Found {len(original_button_handles)} 'Add' buttons on the page.")
     all_fields: List[Dict[str, Any]] = []
+    if not original_button_handles:
+        return all_fields
 
-    for idx, handle in enumerate(original_button_handles):
-        try:
-            # Get visible text (safe guard if text_content is None)
-            btn_text = (await handle.text_content() or "").strip().lower()
-            if "add another" in btn_text:
-                print(f"⏩ Skipping 'Add Another' button at index {idx}")
-                continue
-
-            # Get the section label by reading aria-labelledby from the closest group
-            aria_labelledby = await handle.evaluate("el => el.closest('div[role=\"group\"]')?.getAttribute('aria-labelledby')")
-            main_label = ""
-            if aria_labelledby:
-                # try to read the element with that id
-                label_elem = page.locator(f'#{aria_labelledby}')
-                if await label_elem.count() > 0:
-                    main_label = (await label_elem.first.text_content() or "").strip()
-
-            print(f"\n🔹 Handling 'Add' button for section: {main_label or '[unknown section]'} (index {idx})")
-
-            # click the original element handle
-            await handle.click()
-            # small wait to allow new DOM pieces to appear (adjustable)
-            await page.wait_for_timeout(750)
+    # Expand every section up front; the observer tells us which containers each click added
+    sections = await expand_add_sections(page, original_button_handles)
 
-            # Extract fields added by clicking this Add button. We pass flag=False to avoid recursion here.
-            section_fields = await extract_form_fields_from_page(page, processed_handles, flag=False)
-
-            # Tag each found field with the Add-button section label
-            for field in section_fields:
-                field["Add Button"] = main_label
+    for section in sections:
+        main_label = section["section"]
+        try:
+            def tag_section(field: Dict[str, Any], section: str = main_label):
+                field["Add Button"] = section
+                if on_field:
+                    on_field(field)
+
+            # Only describe the delta. We pass flag=False to avoid recursion here.
+            section_fields = await extract_form_fields_from_page(
+                page, processed_handles, flag=False, on_field=tag_section, only_ids=section["ids"],
+                capture=capture, uploads=uploads,
+            )
             all_fields.extend(section_fields)
-
         except Exception as e:
-            print(f"⚠️ Error handling 'Add' button at index {idx}: {e}")
+            print(f"⚠️ Error handling 'Add' button at index {section['index']}: {e}")
 
+    # Pick up anything revealed while filling the new sections
+    all_fields.extend(await extract_form_fields_from_page(
+        page, processed_handles, flag=False, on_field=on_field, capture=capture, uploads=uploads
+    ))
     return all_fields
 
 
-async def extract_form_fields_from_page(page: Page, processed_handles: Set[str], flag: bool) -> List[Dict[str, Any]]:
+async def classify_container(container: Locator) -> str:
+    """Decides the widget kind through the cascade of locator count() probes."""
+    if await container.locator('input[data-automation-id="file-upload-input-ref"]').count() > 0:
+        return "file"
+    if await container.locator('[data-automation-id="multiSelectContainer"]').count() > 0:
+        return "multiselect"
+    if await container.locator('button[aria-haspopup="listbox"]').count() > 0:
+        return "dropdown"
+    if await container.locator('input[type="radio"]').count() > 0:
+        return "radio"
+    if await container.locator('input[type="checkbox"]').count() > 0:
+        return "checkbox"
+    if await container.locator('input[data-automation-id*="date"]').count() > 0:
+        return "date"
+    if await container.locator('textarea').count() > 0:
+        return "textarea"
+    if await container.locator('input[type="text"], input[type="number"]').count() > 0:
+        return "text"
+    return "unknown"
+
+
+async def container_kind(container: Locator) -> str:
+    """Kind from the structure-signature cache, falling back to the probe cascade for unseen markup."""
+    if not USE_FIELD_TYPE_CACHE:
+        return await classify_container(container)
+    signature = await structure_signature(container)
+    kind = FIELD_TYPE_CACHE.get(signature)
+    if kind is None:
+        kind = await classify_container(container)
+        FIELD_TYPE_CACHE.put(signature, kind)
+    return kind
+
+
+async def probe_container(page: Page, automation_id: str, container: Locator) -> Dict[str, Any]:
+    """
+    Describe a single formField container through individual locator probes.
+    Produces the same structure as dom_snapshot.snapshot_form_fields.
+    """
+    descriptor: Dict[str, Any] = {
+        "automation_id": automation_id,
+        "label": "",
+        "required": False,
+        "kind": "unknown",
+        "options": [],
+        "input": {},
+        "has_day": False,
+        "component_id": "",
+    }
+
+    kind = await container_kind(container)
+    if kind == "file":
+        print("Found file upload input in container")
+        label_text = ""
+
+        # 1) Check aria-labelledby in parent role=group or file upload container
+        aria_elem = container.locator("xpath=ancestor-or-self::*[@aria-labelledby][1]")
+        if await aria_elem.count() > 0:
+            aria_id = await aria_elem.first.get_attribute("aria-labelledby")
+            if aria_id:
+                # ✅ Use XPath to avoid CSS escaping issues with `/` and other characters
+                linked_elem = page.locator(f"xpath=//*[@id='{aria_id}']")
+                if await linked_elem.count() > 0:
+                    label_text = (await linked_elem.first.text_content() or "").strip()
+
+        # 2) If still empty, nearest preceding heading
+        if not label_text:
+            heading = container.locator(
+                "xpath=preceding::*[self::h1 or self::h2 or self::h3][1]"
+            )
+            if await heading.count() > 0:
+                label_text = (await heading.first.text_content() or "").strip()
+
+        # 3) If still empty, try <label> in container
+        if not label_text:
+            label_loc = container.locator("label")
+            if await label_loc.count() > 0:
+                label_text = (await label_loc.first.text_content() or "").strip()
+
+        # Get component id from button or parent formField
+        comp_id = await container.get_attribute("data-fkit-id") \
+            or await container.get_attribute("id")
+        if not comp_id:
+            select_button = container.locator("button[data-automation-id='select-files']")
+            if await select_button.count() > 0:
+                comp_id = await select_button.first.get_attribute("id")
+
+        descriptor["kind"] = "file"
+        descriptor["label"] = label_text or "File upload"
+        descriptor["component_id"] = comp_id or ""
+        return descriptor
+
+    # Re-query container first element to be safe
+    container = page.locator(f'[data-automation-id="{automation_id}"]').first
+
+    # Label extraction
+    label_text = ""
+    legend_loc = container.locator("legend")
+    if await legend_loc.count() > 0:
+        # 1) legend > richText > p
+        richtext_p = legend_loc.locator('[data-automation-id="richText"] p')
+        if await richtext_p.count() > 0:
+            label_text = (await richtext_p.first.text_content()) or ""
+        else:
+            # 2) legend > span
+            span = legend_loc.locator("span")
+            if await span.count() > 0:
+                label_text = (await span.first.text_content()) or ""
+            else:
+                # 3) legend > label
+                label_in_legend = legend_loc.locator("label")
+                if await label_in_legend.count() > 0:
+                    label_text = (await label_in_legend.first.text_content()) or ""
+    else:
+        # direct <label> inside the container
+        label_loc = container.locator("label")
+        if await label_loc.count() > 0:
+            label_text = (await label_loc.first.text_content()) or ""
+
+    # fallback: aria-labelledby
+    if not label_text:
+        input_with_label = container.locator('[aria-labelledby]')
+        if await input_with_label.count() > 0:
+            label_id = await input_with_label.first.get_attribute("aria-labelledby")
+            if label_id and not label_id.startswith("hiddenDateValueId"):
+                label_elem = page.locator(f'#{label_id}')
+                if await label_elem.count() > 0:
+                    label_text = (await label_elem.first.text_content()) or ""
+
+    # cleanup
+    descriptor["required"] = "*" in (label_text or "")
+    descriptor["label"] = (label_text or "").replace("*", "").strip()
+    if not descriptor["label"]:
+        return descriptor
+
+    options: List[str] = descriptor["options"]
+
+    descriptor["kind"] = kind
+
+    if kind == "radio":
+        radio_inputs = await container.locator('input[type="radio"]').all()
+        for radio in radio_inputs:
+            radio_id = await radio.get_attribute("id")
+            if radio_id:
+                lbl = container.locator(f'label[for="{radio_id}"]')
+                if await lbl.count() > 0:
+                    radio_label = (await lbl.first.text_content()) or ""
+                    if radio_label:
+                        options.append(radio_label.strip())
+
+    elif kind == "checkbox":
+        checkbox_inputs = await container.locator('input[type="checkbox"]').all()
+        for checkbox in checkbox_inputs:
+            c_id = await checkbox.get_attribute("id")
+            checkbox_label = ""
+            if c_id:
+                lbl = container.locator(f'label[for="{c_id}"]')
+                if await lbl.count() > 0:
+                    checkbox_label = (await lbl.first.text_content()) or ""
+
+            # Fallback: label wrapping the checkbox
+            if not checkbox_label:
+                parent_label = checkbox.locator("xpath=ancestor::label[1]")
+                if await parent_label.count() > 0:
+                    checkbox_label = (await parent_label.first.text_content()) or ""
+
+            if checkbox_label.strip():
+                options.append(checkbox_label.strip())
+
+    elif kind == "date":
+        day_input = container.locator('input[data-automation-id="dateSectionDay-input"]')
+        descriptor["has_day"] = await day_input.count() > 0
+
+    elif kind == "text":
+        input_loc = container.locator('input[type="text"], input[type="number"]').first
+        descriptor["input"] = {
+            "id": await input_loc.get_attribute("id") or "",
+            "type": (await input_loc.get_attribute("type") or "").lower(),
+            "inputmode": (await input_loc.get_attribute("inputmode") or "").lower(),
+            "pattern": await input_loc.get_attribute("pattern") or "",
+            "readonly": await input_loc.get_attribute("readonly") is not None,
+            "disabled": await input_loc.get_attribute("disabled") is not None,
+        }
+
+    return descriptor
+
+
+async def fill_value(page: Page, container: Locator, automation_id: str, selector: str, value: str,
+                     filler: Optional[BatchFiller]):
+    """Queues a plain value on the batch filler, or fills it right away without one."""
+    if filler is not None:
+        filler.add(automation_id, selector, value)
+    else:
+        await container.locator(selector).first.fill(value, timeout=FIELD_ACTION_TIMEOUT_MS)
+
+
+async def fill_field(page: Page, descriptor: Dict[str, Any], filler: Optional[BatchFiller] = None,
+                     uploads: Optional[UploadManager] = None) -> Optional[Dict[str, Any]]:
+    """
+    Fill a described container and return its field record, or None when the
+    container is unlabeled or of an unsupported type. Plain text, number,
+    textarea and date values go through `filler` when one is given; file
+    inputs require `uploads`.
+    """
+    automation_id = descriptor["automation_id"]
+    container = page.locator(f'[data-automation-id="{automation_id}"]').first
+    kind = descriptor["kind"]
+    label_text = descriptor["label"]
+    is_required = descriptor["required"]
+    captured = descriptor.get("captured")
+    known_options = captured["options"] if captured and captured["options"] else descriptor.get("known_options")
+
+    if kind == "file":
+        if uploads is None:
+            # a throwaway manager would lose per-field dedupe and digest a placeholder path
+            raise ValueError(f"File field {automation_id} needs the traversal's UploadManager (uploads=...)")
+        try:
+            value_from_page = await uploads.upload(container, descriptor["component_id"] or automation_id)
+        except Exception as e:
+            print(f"⚠️ File upload failed: {e}")
+            value_from_page = ""
+
+        field_data = {
+            "label": label_text or "File upload",
+            "id_of_input_component": descriptor["component_id"] or "",
+            "required": False,
+            "type_of_input": "file",
+            "options": [],
+            "user_data_select_values": value_from_page,
+        }
+        print("  -> Filled and extracted file upload field:", field_data)
+        return field_data
+
+    if not label_text:
+        # skip unlabeled containers
+        return None
+
+    field_type = "unknown"
+    options: List[Any] = list(descriptor["options"])
+    value_from_page: Any = ""
+
+    if kind == "multiselect":
+        print("inside multi-select")
+        field_type, options, value_from_page = await handle_multiselect(
+            container, label_text, page, automation_id, known_options=known_options
+        )
+        await close_all_popups(page)
+
+    elif kind == "dropdown":
+        print("inside dropdown")
+        field_type, options, value_from_page = await handle_dropdown(
+            container, label_text, page, automation_id, known_options=known_options
+        )
+        await close_all_popups(page)
+
+    elif kind == "radio":
+        print("inside radio")
+        field_type = "radio"
+        user_value = arbitrary_user_data(field_type, options, label_text)
+        if user_value:
+            # click label with this text, fallback to clicking the input if label not found
+            label_click_loc = container.locator(f'label:has-text("{user_value}")')
+            if await label_click_loc.count() > 0:
+                await label_click_loc.first.click(timeout=FIELD_ACTION_TIMEOUT_MS)
+            else:
+                # fallback: click first radio input that matches the option index
+                radios = container.locator('input[type="radio"]')
+                if await radios.count() > 0:
+                    await radios.first.check(timeout=FIELD_ACTION_TIMEOUT_MS)
+            value_from_page = user_value
+            await wait_for_checked(container, 'input[type="radio"]', budget_ms=300, name="radio:checked")
+
+    elif kind == "checkbox":
+        print("inside checkbox")
+        field_type = "checkbox"
+        user_value = arbitrary_user_data(field_type, options, label_text)
+        if user_value:
+            # the resolver returns a list of option labels for checkboxes
+            wanted = user_value if isinstance(user_value, list) else [user_value]
+            checked = []
+            for value in wanted:
+                # matches the checkbox's accessible name, from a for= or a wrapping label
+                matched_checkbox = container.get_by_role("checkbox", name=str(value), exact=True)
+                if await matched_checkbox.count() > 0:
+                    await matched_checkbox.first.check(timeout=FIELD_ACTION_TIMEOUT_MS)
+                    checked.append(value)
+            if not checked:
+                await container.locator('input[type="checkbox"]').first.check(timeout=FIELD_ACTION_TIMEOUT_MS)
+
+            value_from_page = checked or user_value
+
+    # date fields (MM/DD/YYYY or MM/YYYY)
+    elif kind == "date":
+        print("inside date")
+        month_input = 'input[data-automation-id="dateSectionMonth-input"]'
+        day_input = 'input[data-automation-id="dateSectionDay-input"]'
+        year_input = 'input[data-automation-id="dateSectionYear-input"]'
+
+        try:
+            if descriptor["has_day"]:
+                field_type = "date-mmddyyyy"
+                user_value = arbitrary_user_data(field_type, options, label_text)
+                mm, dd, yyyy = user_value.split('/')
+                if is_required:
+                    await fill_value(page, container, automation_id, month_input, mm, filler)
+                    await fill_value(page, container, automation_id, day_input, dd, filler)
+                    await fill_value(page, container, automation_id, year_input, yyyy, filler)
+                value_from_page = f"{mm}/{dd}/{yyyy}"
+            else:
+                field_type = "date-mmyyyy"
+                user_value = arbitrary_user_data(field_type, options, label_text)
+                mm, yyyy = user_value.split('/')
+                if is_required:
+                    await fill_value(page, container, automation_id, month_input, mm, filler)
+                    await fill_value(page, container, automation_id, year_input, yyyy, filler)
+                value_from_page = f"{mm}/{yyyy}"
+        except Exception as e:
+            print(f"⚠️ Could not parse/fill date field. Error: {e}")
+
+    elif kind == "textarea":
+        print("inside textarea")
+        field_type = "textarea"
+        user_value = arbitrary_user_data(field_type, options, label_text)
+        await fill_value(page, container, automation_id, 'textarea', user_value, filler)
+        value_from_page = user_value
+
+    # text input (not readonly)
+    elif kind == "text":
+        print("inside text/number")
+        attrs = descriptor["input"]
+        input_loc = container.locator('input[type="text"], input[type="number"]').first
+
+        # detect readonly/disabled outputs
+        if attrs.get("readonly") or attrs.get("disabled"):
+            field_type = "output-text"
+            try:
+                value_from_page = await input_loc.input_value(timeout=FIELD_ACTION_TIMEOUT_MS)
+            except Exception:
+                value_from_page = ""
+        else:
+            # Check if this is numeric input
+            numeric_labels = ["salary", "compensation", "amount", "number", "age", "years", "experience", "zip", "postal"]
+            is_numeric = (
+                attrs.get("type") == "number"
+                or attrs.get("inputmode") == "numeric"
+                or (attrs.get("pattern") or "").isdigit()
+                or any(word in label_text.lower() for word in numeric_labels)
+            )
+
+            if is_numeric:
+                field_type = "number"
+                user_value = get_resolver().resolve("number", label_text, attrs.get("id") or "")
+            else:
+                field_type = "text"
+                user_value = get_text_input_value(label_text, attrs.get("id") or "")
+
+            value_from_page = user_value
+            if is_required or user_value:
+                await fill_value(page, container, automation_id, 'input[type="text"], input[type="number"]', user_value, filler)
+
+    # if we identified a non-unknown field, return it
+    if field_type == "unknown" or not automation_id:
+        return None
+
+    field_data = {
+        "label": label_text,
+        "id_of_input_component": automation_id,
+        "required": bool(is_required),
+        "type_of_input": field_type,
+        "options": options,
+        "user_data_select_values": value_from_page,
+    }
+    if captured:
+        # metadata from the captured payload; the DOM was only used to fill
+        field_data["label"] = captured["label"] or label_text
+        field_data["required"] = captured["required"]
+        # unless the dropdown handler found them out of date and read the live list
+        refreshed = kind == "dropdown" and options and options != captured["options"]
+        if captured["options"] and not refreshed:
+            field_data["options"] = captured["options"]
+    print(f"  -> Filled and extracted: '{label_text}' (Type: {field_type})")
+    return field_data
+
+
+async def extract_form_fields_from_page(
+    page: Page,
+    processed_handles: Set[str],
+    flag: bool,
+    use_snapshot: bool = USE_DOM_SNAPSHOT,
+    on_field: Optional[FieldCallback] = None,
+    only_ids: Optional[List[str]] = None,
+    capture: Optional[NetworkCapture] = None,
+    uploads: Optional[UploadManager] = None,
+    known_descriptors: Optional[Dict[str, Dict[str, Any]]] = None,
+    seen_descriptors: Optional[Dict[str, Dict[str, Any]]] = None,
+    field_records: Optional[Dict[str, Dict[str, Any]]] = None,
+    container_order: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
     """
     Extract all form fields currently on the page that haven't been processed,
     try to fill them (where appropriate), and return structured metadata.
+    Each record is also passed to `on_field` as soon as it is produced.
+    `only_ids` restricts extraction to those containers (e.g. an Add-button delta).
+    With a `capture`, field metadata comes from the captured page-definition responses.
+    `known_descriptors` (from the schema registry) are filled without being
+    described again; every descriptor used is collected in `seen_descriptors`
+    and every record produced in `field_records`, both keyed by automation id.
+    With `container_order` (page order of automation ids) reused and newly
+    described containers are filled in page order, so dependent fields follow
+    the fields they depend on.
+    Transient Playwright failures are retried per field with backoff.
+
+    With use_snapshot the containers are described by a single page.evaluate
+    call; otherwise each container is probed through individual locators.
     """
     fields: List[Dict[str, Any]] = []
+    filler = BatchFiller() if BATCH_FILL else None
 
     while True:
         print("\n---------------\n")
 
-        field_containers = await page.locator('[data-automation-id^="formField-"]').all()
-        new_containers: List[tuple[str, Any]] = []
-
-        for container in field_containers:
-            automation_id = await container.get_attribute("data-automation-id") or ""
-            if automation_id and automation_id not in processed_handles:
-                processed_handles.add(automation_id)
-                new_containers.append((automation_id, container))
-
-        if not new_containers:
+        pending: List[tuple[str, Any]] = []
+        if capture is not None:
+            await capture.settle()
+        if known_descriptors:
+            for automation_id, descriptor in known_descriptors.items():
+                if automation_id not in processed_handles:
+                    processed_handles.add(automation_id)
+                    pending.append((automation_id, descriptor))
+            known_descriptors = None
+        if use_snapshot:
+            for descriptor in await snapshot_form_fields(page, processed_handles, only_ids):
+                pending.append((descriptor["automation_id"], descriptor))
+        else:
+            if only_ids is not None:
+                field_containers = [page.locator(f'[data-automation-id="{automation_id}"]').first for automation_id in only_ids]
+            else:
+                field_containers = await page.locator('[data-automation-id^="formField-"]').all()
+            for container in field_containers:
+                automation_id = await container.get_attribute("data-automation-id") or ""
+                if automation_id and automation_id not in processed_handles:
+                    processed_handles.add(automation_id)
+                    pending.append((automation_id, container))
+
+        if not pending:
             break
+        if container_order:
+            position = {automation_id: index for index, automation_id in enumerate(container_order)}
+            pending.sort(key=lambda entry: position.get(entry[0], len(position)))
 
-        print("pending containers:", len(new_containers))
-        for automation_id, _ in new_containers:
+        print("pending containers:", len(pending))
+        for automation_id, _ in pending:
             print(f"Processing container with automation ID: {automation_id}")
 
-        for automation_id, container in new_containers:
+        for automation_id, item in pending:
             try:
-                file_input = container.locator('input[data-automation-id="file-upload-input-ref"]')
-                if await file_input.count() > 0:
-                    print("Found file upload input in container")
-                    field_type = "file"
-                    
-                    label_text = ""
-
-                    # 1) Check aria-labelledby in parent role=group or file upload container
-                    aria_elem = container.locator("xpath=ancestor-or-self::*[@aria-labelledby][1]")
-                    if await aria_elem.count() > 0:
-                        aria_id = await aria_elem.first.get_attribute("aria-labelledby")
-                        if aria_id:
-                            # ✅ Use XPath to avoid CSS escaping issues with `/` and other characters
-                            linked_elem = page.locator(f"xpath=//*[@id='{aria_id}']")
-                            if await linked_elem.count() > 0:
-                                label_text = (await linked_elem.first.text_content() or "").strip()
-
-                    # 2) If still empty, nearest preceding heading
-                    if not label_text:
-                        heading = container.locator(
-                            "xpath=preceding::*[self::h1 or self::h2 or self::h3][1]"
-                        )
-                        if await heading.count() > 0:
-                            label_text = (await heading.first.text_content() or "").strip()
-
-                    # 3) If still empty, try <label> in container
-                    if not label_text:
-                        label_loc = container.locator("label")
-                        if await label_loc.count() > 0:
-                            label_text = (await label_loc.first.text_content() or "").strip()
-
-                    # 4) Fallback
-                    if not label_text:
-                        label_text = "File upload"
-
-                    # Get component id from button or parent formField
-                    comp_id = await container.get_attribute("data-fkit-id") \
-                        or await container.get_attribute("id")
-                    if not comp_id:
-                        select_button = container.locator("button[data-automation-id='select-files']")
-                        if await select_button.count() > 0:
-                            comp_id = await select_button.first.get_attribute("id")
-                    
-                    try:
-                        await file_input.first.set_input_files("dummy_file.pdf")
-                        value_from_page = "dummy_file.pdf"
-                    except Exception as e:
-                        print(f"⚠️ File upload failed: {e}")
-                        value_from_page = ""
-
-                    field_data = {
-                        "label": label_text or "File upload",
-                        "id_of_input_component": comp_id or "",
-                        "required": False,
-                        "type_of_input": field_type,
-                        "options": [],
-                        "user_data_select_values": value_from_page,
-                    }
-                    print("  -> Filled and extracted file upload field:", field_data)
-                    fields.append(field_data)
-                    continue
-
-
-
-                # Re-query container first element to be safe
-                container = page.locator(f'[data-automation-id="{automation_id}"]').first
-
-                # Label extraction
-                label_text = ""
-                legend_loc = container.locator("legend")
-                if await legend_loc.count() > 0:
-                    # 1) legend > richText > p
-                    richtext_p = legend_loc.locator('[data-automation-id="richText"] p')
-                    if await richtext_p.count() > 0:
-                        label_text = (await richtext_p.first.text_content()) or ""
+                with TRACER.span(automation_id, "container", automation_id=automation_id) as span:
+                    if isinstance(item, dict):
+                        descriptor = item
+                        # the in-page cascade already classified it; teach the locator path
+                        FIELD_TYPE_CACHE.put(descriptor.get("signature", ""), descriptor["kind"])
                     else:
-                        # 2) legend > span
-                        span = legend_loc.locator("span")
-                        if await span.count() > 0:
-                            label_text = (await span.first.text_content()) or ""
-                        else:
-                            # 3) legend > label
-                            label_in_legend = legend_loc.locator("label")
-                            if await label_in_legend.count() > 0:
-                                label_text = (await label_in_legend.first.text_content()) or ""
-                else:
-                    # direct <label> inside the container
-                    label_loc = container.locator("label")
-                    if await label_loc.count() > 0:
-                        label_text = (await label_loc.first.text_content()) or ""
-
-                # fallback: aria-labelledby
-                if not label_text:
-                    input_with_label = container.locator('[aria-labelledby]')
-                    if await input_with_label.count() > 0:
-                        label_id = await input_with_label.first.get_attribute("aria-labelledby")
-                        if label_id and not label_id.startswith("hiddenDateValueId"):
-                            label_elem = page.locator(f'#{label_id}')
-                            if await label_elem.count() > 0:
-                                label_text = (await label_elem.first.text_content()) or ""
-
-                # cleanup
-                is_required = "*" in (label_text or "")
-                label_text = (label_text or "").replace("*", "").strip()
-
-                if not label_text:
-                    # skip unlabeled containers
-                    continue
-
-                field_type = "unknown"
-                options: List[str] = []
-                value_from_page = ""
-
-                # detect multi-select
-                multiselect_container = container.locator('[data-automation-id="multiSelectContainer"]')
-                dropdown_button = container.locator('button[aria-haspopup="listbox"]')
-
-                if await multiselect_container.count() > 0:
-                    print("inside multi-select")
-                    field_type, options, value_from_page = await handle_multiselect(container, label_text, page)
-                    await close_all_popups(page)
-
-                elif await dropdown_button.count() > 0:
-                    print("inside dropdown")
-                    field_type, options, value_from_page = await handle_dropdown(container, label_text, page, automation_id)
-                    await close_all_popups(page)
-
-                # radio inputs
-                elif await container.locator('input[type="radio"]').count() > 0:
-                    print("inside radio")
-                    field_type = "radio"
-                    radio_inputs = await container.locator('input[type="radio"]').all()
-                    for radio in radio_inputs:
-                        radio_id = await radio.get_attribute("id")
-                        if radio_id:
-                            lbl = container.locator(f'label[for="{radio_id}"]')
-                            if await lbl.count() > 0:
-                                radio_label = (await lbl.first.text_content()) or ""
-                                if radio_label:
-                                    options.append(radio_label.strip())
-                    user_value = arbitrary_user_data(field_type, options, label_text)
-                    if user_value:
-                        # click label with this text, fallback to clicking the input if label not found
-                        label_click_loc = container.locator(f'label:has-text("{user_value}")')
-                        if await label_click_loc.count() > 0:
-                            await label_click_loc.first.click()
-                        else:
-                            # fallback: click first radio input that matches the option index
-                            radios = container.locator('input[type="radio"]')
-                            if await radios.count() > 0:
-                                await radios.first.check()
-                        value_from_page = user_value
-                        await page.wait_for_timeout(300)
-
-                # checkbox inputs
-                elif await container.locator('input[type="checkbox"]').count() > 0:
-                    print("inside checkbox")
-                    field_type = "checkbox"
-                    options = []  # reset per field
-                    
-                    checkbox_inputs = await container.locator('input[type="checkbox"]').all()
-                    for checkbox in checkbox_inputs:
-                        c_id = await checkbox.get_attribute("id")
-                        checkbox_label = ""
-                        if c_id:
-                            lbl = container.locator(f'label[for="{c_id}"]')
-                            if await lbl.count() > 0:
-                                checkbox_label = (await lbl.first.text_content()) or ""
-                        
-                        # Fallback: label wrapping the checkbox
-                        if not checkbox_label:
-                            parent_label = checkbox.locator("xpath=ancestor::label[1]")
-                            if await parent_label.count() > 0:
-                                checkbox_label = (await parent_label.first.text_content()) or ""
-
-                        if checkbox_label.strip():
-                            options.append(checkbox_label.strip())
-                    
-                    user_value = arbitrary_user_data(field_type, options, label_text)
-                    if user_value:
-                        # Try to match by label
-                        matched_checkbox = container.locator(
-                            f'xpath=.//label[contains(normalize-space(.), "{user_value}")]/input[@type="checkbox"]'
-                        )
-                        if await matched_checkbox.count() > 0:
-                            await matched_checkbox.first.check()
-                        else:
-                            await container.locator('input[type="checkbox"]').first.check()
-                        
-                        value_from_page = user_value
-
-
-                # date fields (MM/DD/YYYY or MM/YYYY)
-                elif await container.locator('input[data-automation-id*="date"]').count() > 0:
-                    print("inside date")
-                    month_input = container.locator('input[data-automation-id="dateSectionMonth-input"]')
-                    day_input = container.locator('input[data-automation-id="dateSectionDay-input"]')
-                    year_input = container.locator('input[data-automation-id="dateSectionYear-input"]')
-
-                    try:
-                        if await day_input.count() > 0:
-                            field_type = "date-mmddyyyy"
-                            user_value = arbitrary_user_data(field_type, options, label_text)
-                            mm, dd, yyyy = user_value.split('/')
-                            if is_required:
-                                await month_input.fill(mm)
-                                await day_input.fill(dd)
-                                await year_input.fill(yyyy)
-                            value_from_page = f"{mm}/{dd}/{yyyy}"
-                        else:
-                            field_type = "date-mmyyyy"
-                            user_value = arbitrary_user_data(field_type, options, label_text)
-                            mm, yyyy = user_value.split('/')
-                            if is_required:
-                                await month_input.fill(mm)
-                                await year_input.fill(yyyy)
-                            value_from_page = f"{mm}/{yyyy}"
-                    except Exception as e:
-                        print(f"⚠️ Could not parse/fill date field. Error: {e}")
-
-                # textarea
-                elif await container.locator('textarea').count() > 0:
-                    print("inside textarea")
-                    field_type = "textarea"
-                    user_value = arbitrary_user_data(field_type, options, label_text)
-                    await container.locator('textarea').first.fill(user_value)
-                    value_from_page = user_value
-
-                # text input (not readonly)
-                elif await container.locator('input[type="text"], input[type="number"]').count() > 0:
-                    print("inside text/number")
-                    input_loc = container.locator('input[type="text"], input[type="number"]').first
-                    input_id = await input_loc.get_attribute("id") or ""
-                    input_type_attr = (await input_loc.get_attribute("type") or "").lower()
-                    input_mode_attr = (await input_loc.get_attribute("inputmode") or "").lower()
-                    pattern_attr = await input_loc.get_attribute("pattern") or ""
-                    
-                    # detect readonly/disabled outputs
-                    readonly_attr = await input_loc.get_attribute("readonly")
-                    disabled_attr = await input_loc.get_attribute("disabled")
-                    if readonly_attr is not None or disabled_attr is not None:
-                        field_type = "output-text"
-                        try:
-                            value_from_page = await input_loc.input_value()
-                        except Exception:
-                            value_from_page = ""
-                    else:
-                        # Check if this is numeric input
-                        numeric_labels = ["salary", "compensation", "amount", "number", "age", "years", "experience", "zip", "postal"]
-                        is_numeric = (
-                            input_type_attr == "number"
-                            or input_mode_attr == "numeric"
-                            or pattern_attr.isdigit()
-                            or any(word in label_text.lower() for word in numeric_labels)
-                        )
-
-                        if is_numeric:
-                            field_type = "number"
-                            user_value = "100000"  # Example default salary
-                        else:
-                            field_type = "text"
-                            user_value = get_text_input_value(label_text, input_id)
-
-                        value_from_page = user_value
-                        if is_required or user_value:
-                            await input_loc.fill(user_value)
-
-
-                # other input types you may want to support (number, email etc.)
-                elif await container.locator('input[type="number"]').count() > 0:
-                    field_type = "number"
-                    input_loc = container.locator('input[type="number"]').first
-                    is_readonly = await input_loc.get_attribute("readonly") is not None
-                    if is_readonly:
-                        value_from_page = await input_loc.input_value()
-                    else:
-                        user_value = arbitrary_user_data("number", [], label_text)
-                        value_from_page = user_value
-                        await input_loc.fill(str(user_value))
-
-                # if we identified a non-unknown field, append
-                if field_type != "unknown" and automation_id:
-                    field_data = {
-                        "label": label_text,
-                        "id_of_input_component": automation_id,
-                        "required": bool(is_required),
-                        "type_of_input": field_type,
-                        "options": options,
-                        "user_data_select_values": value_from_page,
-                    }
+                        descriptor = await probe_container(page, automation_id, item)
+                    span["kind"] = descriptor["kind"]
+                    if capture is not None:
+                        descriptor["captured"] = capture.lookup(automation_id, descriptor["label"])
+                    field_data = await FIELD_RETRY.run(
+                        lambda: fill_field(page, descriptor, filler, uploads), name=f"fill:{descriptor['kind']}"
+                    )
+                    span["field_type"] = field_data["type_of_input"] if field_data else "skipped"
+                if seen_descriptors is not None:
+                    choice = field_data and field_data["type_of_input"] in ("dropdown", "multiselect")
+                    seen_descriptors[automation_id] = {**descriptor, "known_options": field_data["options"] if choice else None}
+                if field_data:
                     fields.append(field_data)
-                    print(f"  -> Filled and extracted: '{label_text}' (Type: {field_type})")
-
+                    if field_records is not None:
+                        field_records[automation_id] = field_data
+                    if on_field:
+                        on_field(field_data)
             except Exception as e:
                 print(f"⚠️ Could not parse/fill field {automation_id}. Error: {e}")
 
+        # apply this round's plain values before looking for newly revealed containers
+        if filler is not None:
+            with TRACER.span("batch_fill", "fill", values=len(filler.pending)):
+                await filler.flush(page)
+
     # If flag True, also click any Add buttons that add more fields (to capture them)
     if flag:
-        more_fields = await handle_add_buttons(page, fields, processed_handles)
+        more_fields = await handle_add_buttons(
+            page, fields, processed_handles, on_field=on_field, capture=capture, uploads=uploads
+        )
         if more_fields:
             fields.extend(more_fields)
 
     return fields
 
 
-async def traverse_and_process(page: Page, resume_path: str):
+# Index of the first of NEXT_BUTTON_SELECTORS (in priority order, not DOM
+# order) that matches an enabled button, or -1; one round-trip for all of them.
+FIRST_ENABLED_SELECTOR_SCRIPT = """
+(selectors) => selectors.findIndex((selector) => document.querySelector(selector + ":enabled") !== null)
+"""
+
+# Page identity used to detect that Next took effect: URL, step heading and
+# the active progress step (Workday may swap steps without changing the URL).
+PAGE_STATE_JS = """
+() => {
+    const text = (el) => el ? (el.textContent || "").trim() : "";
+    return {
+        url: location.href,
+        heading: text(document.querySelector("h2")),
+        step: text(document.querySelector('[data-automation-id="progressBarActiveStep"], [aria-current="step"]')),
+    };
+}
+"""
+
+# Resolves once the step heading or the active progress step differs from
+# `before` (a URL change alone is not enough: on an SPA swap the old heading
+# is still rendered). Survives full-page navigations.
+PAGE_CHANGED_SCRIPT = f"""
+(before) => {{
+    const state = ({PAGE_STATE_JS.strip()})();
+    const changed = state.heading !== before.heading || state.step !== before.step;
+    return changed && document.readyState === "complete" && state.heading !== "";
+}}
+"""
+
+# Resolves true once the new step has rendered its formField containers and
+# the DOM has been quiet for `quietMs`, or once it has been quiet for
+# `emptyQuietMs` without any (e.g. a review page); false after `timeoutMs`.
+PAGE_SETTLED_SCRIPT = """
+({ quietMs, emptyQuietMs, timeoutMs }) => new Promise((resolve) => {
+    const start = performance.now();
+    let last = start;
+    const observer = new MutationObserver(() => { last = performance.now(); });
+    observer.observe(document.body, { childList: true, subtree: true, attributes: true });
+    const finish = (met) => { observer.disconnect(); clearInterval(timer); resolve(met); };
+    const timer = setInterval(() => {
+        const now = performance.now();
+        const hasFields = document.querySelector('[data-automation-id^="formField-"]') !== null;
+        if (now - last >= (hasFields ? quietMs : emptyQuietMs)) finish(true);
+        else if (now - start >= timeoutMs) finish(false);
+    }, 25);
+})
+"""
+
+
+async def page_state(page: Page) -> Dict[str, str]:
+    return await page.evaluate(PAGE_STATE_JS)
+
+
+async def click_next_button(page: Page) -> bool:
+    """
+    Clicks the enabled Next/Save and Continue button of the highest-priority
+    selector in NEXT_BUTTON_SELECTORS; returns False if none was found.
+    """
+    try:
+        index = await page.evaluate(FIRST_ENABLED_SELECTOR_SCRIPT, NEXT_BUTTON_SELECTORS)
+        if index < 0:
+            return False
+        selector = NEXT_BUTTON_SELECTORS[index]
+        print(f"\n➡️ Found and clicking 'Next' button with selector: {selector}")
+        await page.locator(f"{selector}:enabled").first.click()
+        return True
+    except Exception as e:
+        print(f"⚠️ Error checking/clicking next button: {e}")
+        return False
+
+
+async def wait_for_page_settled(page: Page, budget_ms: float = 20000) -> bool:
+    """Waits for the new step's containers and a quiet DOM; replaces the 20 s networkidle wait."""
+    start = time.perf_counter()
+    met = False
+    try:
+        met = await page.evaluate(PAGE_SETTLED_SCRIPT, {"quietMs": 150, "emptyQuietMs": 1000, "timeoutMs": budget_ms})
+    except Exception:
+        pass
+    WAIT_STATS.record("navigation:settle", budget_ms, (time.perf_counter() - start) * 1000, met)
+    return met
+
+
+async def wait_for_next_page(page: Page, before: Dict[str, str], timeout_ms: float = 10000) -> bool:
+    """
+    Waits until the step heading or active progress step differs from
+    `before` and the new step has settled; returns whether the page changed.
+    """
+    try:
+        with TRACER.span("navigation:page_change", "wait"):
+            await page.wait_for_function(PAGE_CHANGED_SCRIPT, arg=before, timeout=timeout_ms)
+    except Exception:
+        print("⚠️ Page did not change after clicking Next. Proceeding anyway.")
+        return False
+    await wait_for_page_settled(page)
+    print("✅ Successfully navigated to the next page")
+    return True
+
+
+# Automation ids of the containers Workday flags with an inline error.
+INVALID_FIELDS_SCRIPT = """
+() => Array.from(document.querySelectorAll('[data-automation-id^="formField-"]'))
+    .filter(el => el.querySelector('[aria-invalid="true"], [data-automation-id="errorMessage"], [data-automation-id="inputAlert"]'))
+    .map(el => el.getAttribute("data-automation-id"))
+"""
+
+
+async def invalid_field_ids(page: Page) -> List[str]:
+    try:
+        return await page.evaluate(INVALID_FIELDS_SCRIPT)
+    except Exception as e:
+        print(f"⚠️ Could not read inline field errors: {e}")
+        return []
+
+
+def is_empty_required(field: Dict[str, Any]) -> bool:
+    return bool(field.get("required")) and field.get("user_data_select_values") in (None, "", [])
+
+
+async def refill_invalid_fields(page: Page, descriptors: Dict[str, Dict[str, Any]],
+                                records: Dict[str, Dict[str, Any]], uploads: Optional[UploadManager] = None,
+                                on_field: Optional[FieldCallback] = None) -> int:
+    """
+    Fills again only the fields Workday marks as invalid and the required
+    fields that ended up empty. Re-filled records replace the originals in
+    place (so page lists and the journal see them) and go to `on_field`.
+    Returns the number of fields re-filled.
+    """
+    failing = set(await invalid_field_ids(page))
+    failing.update(automation_id for automation_id, record in records.items() if is_empty_required(record))
+    failing = [automation_id for automation_id in sorted(failing) if automation_id in descriptors]
+    if not failing:
+        return 0
+
+    print(f"🩹 Re-filling {len(failing)} invalid or empty fields: {', '.join(failing)}")
+    filler = BatchFiller() if BATCH_FILL else None
+    refilled = 0
+    for automation_id in failing:
+        descriptor = descriptors[automation_id]
+        try:
+            with TRACER.span(automation_id, "refill", automation_id=automation_id):
+                field_data = await FIELD_RETRY.run(
+                    lambda: fill_field(page, descriptor, filler, uploads), name=f"refill:{descriptor['kind']}"
+                )
+        except Exception as e:
+            print(f"⚠️ Could not re-fill field {automation_id}. Error: {e}")
+            continue
+        if not field_data:
+            continue
+        record = records.get(automation_id)
+        if record is not None:
+            record.update(field_data)
+        else:
+            records[automation_id] = record = field_data
+        refilled += 1
+        if on_field:
+            on_field(record)
+    if filler is not None:
+        await filler.flush(page)
+    return refilled
+
+
+def validate_page_fields(page_fields: List[Dict[str, Any]]) -> List[str]:
+    """Returns a message for every required field that ended up without a value."""
+    return [f"Required field '{field['label']}' has no value" for field in page_fields if is_empty_required(field)]
+
+
+async def post_process_page(page_count: int, page_name: str, url: str, processed_handles: Set[str],
+                            page_fields: List[Dict[str, Any]], journal: Optional[CheckpointJournal],
+                            previous: Optional[asyncio.Task] = None):
+    """
+    Logs, validates and journals a finished page. Runs as a background task
+    while the traversal navigates on; `previous` keeps journal appends in page order.
+    """
+    if previous is not None:
+        await previous
+    try:
+        with TRACER.span(f"post-process {page_count}", "page", page_index=page_count):
+            for field in page_fields:
+                print(f"Page: {page_name} | Field: {field['label']} | Required: {field['required']} | Type: {field['type_of_input']} | Value: {field.get('user_data_select_values')}")
+            for issue in validate_page_fields(page_fields):
+                print(f"⚠️ {page_name}: {issue}")
+            if journal is not None:
+                await asyncio.to_thread(journal.append_page, page_count, page_name, url, processed_handles, page_fields)
+    except Exception as e:
+        print(f"⚠️ Post-processing failed for page {page_name}: {e}")
+
+
+async def read_page_name(page: Page, page_count: int) -> str:
+    try:
+        heading = page.locator("h2").first
+        await heading.wait_for(timeout=10000)
+        page_name = (await heading.inner_text()) or f"Page {page_count}"
+        print(f"✅ Page Title: {page_name}")
+    except Exception as e:
+        print(f"⚠️ Failed to extract page name: {e}")
+        page_name = f"Page {page_count}"
+    return page_name
+
+
+async def skip_completed_pages(page: Page, entries: List[Dict[str, Any]]) -> int:
+    """
+    Clicks through the pages recorded in the journal (Workday keeps their saved
+    values) and returns the index of the page actually reached, which is
+    earlier than the journal's end when a page name does not match or Next
+    does not advance.
+    """
+    completed = {entry["page_name"] for entry in entries}
+    reached = entries[0]["page_index"]
+    for entry in entries:
+        page_name = await read_page_name(page, entry["page_index"])
+        if page_name not in completed:
+            break
+        print(f"⏭️ Skipping completed page: {page_name}")
+        before = await page_state(page)
+        if not await click_next_button(page) or not await wait_for_next_page(page, before):
+            break
+        reached = entry["page_index"] + 1
+    return reached
+
+
+async def traverse_and_process(page: Page, resume_path: str, journal: Optional[CheckpointJournal] = None,
+                               resume: bool = False, writer: Optional[StreamingFieldWriter] = None,
+                               capture: Optional[NetworkCapture] = None):
     """
     Navigates through application pages, uploads resume (if needed), fills fields, and extracts data.
+    Each finished page is appended to `journal`; with `resume` the journal's
+    pages are skipped and their fields returned alongside the new ones. The
+    journal is cleared once the traversal completes.
+    Every field record is streamed to `writer` as soon as it is extracted.
+    `capture` (attached to the page) supplies field metadata from XHR responses.
     """
     all_fields_data: List[Dict[str, Any]] = []
     visited_urls = set()
+    # every file input gets the resume, uploaded once per field
+    uploads = UploadManager(resume_path)
+    start_page = 1
 
     print("\n--- Starting Application Traversal ---")
 
@@ -404,63 +816,95 @@ async def traverse_and_process(page: Page, resume_path: str):
         print(f"⚠️ Could not determine number of pages: {e}")
         number_of_pages = 3  # fallback
 
-    for page_count in range(1, max(2, number_of_pages + 1)):
-        current_url = page.url
-        visited_urls.add(current_url)
-
-        try:
-            heading = page.locator("h2").first
-            await heading.wait_for(timeout=10000)
-            page_name = (await heading.inner_text()) or f"Page {page_count}"
-            print(f"✅ Page Title: {page_name}")
-        except Exception as e:
-            print(f"⚠️ Failed to extract page name: {e}")
-            page_name = f"Page {page_count}"
-
-        processed_handles: Set[str] = set()
-
-        page_fields = await extract_form_fields_from_page(page, processed_handles, flag=False)
-        for field in page_fields:
-            field["page_name"] = page_name
-            print(f"Page: {page_name} | Field: {field['label']} | Required: {field['required']} | Type: {field['type_of_input']} | Value: {field.get('user_data_select_values')}")
-
-        all_fields_data.extend(page_fields)
-
-        # find and click an enabled Next button
-        next_button_found = False
-        for selector in NEXT_BUTTON_SELECTORS:
-            next_button = page.locator(selector)
-            if await next_button.count() == 0:
-                continue
-            # use first matching instance
-            btn = next_button.first
-            try:
-                if await btn.is_enabled():
-                    print(f"\n➡️ Found and clicking 'Next' button with selector: {selector}")
-                    await btn.click()
-                    next_button_found = True
+    if journal is not None:
+        entries = journal.load() if resume else []
+        if entries:
+            print(f"🔁 Resuming after page {entries[-1]['page_index']} ({entries[-1]['page_name']})")
+            start_page = await skip_completed_pages(page, entries)
+            # pages from start_page on are filled again, so only earlier entries count as done
+            kept = [entry for entry in entries if entry["page_index"] < start_page]
+            if len(kept) < len(entries):
+                print(f"⚠️ Could only skip to page {start_page}; re-filling from there")
+                journal.truncate(kept)
+            all_fields_data.extend(field for entry in kept for field in entry["fields"])
+            if writer is not None:
+                for field in all_fields_data:
+                    writer.write(field)
+        else:
+            journal.clear()
+
+    # Logging, validation and journaling of page N start once its values are final (after
+    # Next and any re-fill) and run in the background while page N+1 is read and filled
+    post_task: Optional[asyncio.Task] = None
+    try:
+        for page_count in range(start_page, max(2, number_of_pages + 1)):
+            with TRACER.span(f"page {page_count}", "page", page_index=page_count) as page_span:
+                current_url = page.url
+                visited_urls.add(current_url)
+
+                page_name = await read_page_name(page, page_count)
+                page_span["page_name"] = page_name
+
+                processed_handles: Set[str] = set()
+                containers: List[Dict[str, str]] = []
+                known: Dict[str, Dict[str, Any]] = {}
+                seen_descriptors: Dict[str, Dict[str, Any]] = {}
+                if USE_SCHEMA_REGISTRY:
+                    containers = await page_containers(page)
+                    known = SCHEMA_REGISTRY.reusable(current_url, page_name, containers)
+                    print(f"📐 Reusing {len(known)}/{len(containers)} container schemas for {page_name}")
+
+                def emit(field: Dict[str, Any], page_name: str = page_name):
+                    field["page_name"] = page_name
+                    if writer is not None:
+                        writer.write(field)
+
+                def emit_refill(field: Dict[str, Any], page_name: str = page_name):
+                    field["page_name"] = page_name
+                    if writer is not None:
+                        writer.write(dict(field, refilled=True))
+
+                records: Dict[str, Dict[str, Any]] = {}
+                page_fields = await extract_form_fields_from_page(
+                    page, processed_handles, flag=False, on_field=emit, capture=capture, uploads=uploads,
+                    known_descriptors=known, seen_descriptors=seen_descriptors, field_records=records,
+                    container_order=[c["id"] for c in containers],
+                )
+                if USE_SCHEMA_REGISTRY:
+                    SCHEMA_REGISTRY.record_page(current_url, page_name, containers, seen_descriptors)
+                for field in page_fields:
+                    field["page_name"] = page_name
+                all_fields_data.extend(page_fields)
+
+                # fix what Workday already flags (or required fields left empty) before paying for a failed Next
+                if REFILL_INVALID_FIELDS:
+                    await refill_invalid_fields(page, seen_descriptors, records, uploads, on_field=emit_refill)
+
+                # find and click an enabled Next button
+                before = await page_state(page)
+                next_button_found = await click_next_button(page)
+                if next_button_found and not await wait_for_next_page(page, before) and REFILL_INVALID_FIELDS:
+                    # Next was rejected: errors Workday only shows on submit are visible now
+                    if await refill_invalid_fields(page, seen_descriptors, records, uploads, on_field=emit_refill):
+                        before = await page_state(page)
+                        if await click_next_button(page):
+                            await wait_for_next_page(page, before)
+                # journal the page only once its values are final
+                post_task = asyncio.create_task(post_process_page(
+                    page_count, page_name, current_url, processed_handles, page_fields, journal, previous=post_task
+                ))
+
+                if not next_button_found:
+                    print("\n--- No enabled 'Next' button found. Traversal finished. ---")
                     break
-            except Exception as e:
-                print(f"⚠️ Error checking/clicking next button: {e}")
-                continue
-
-        if not next_button_found:
-            print("\n--- No enabled 'Next' button found. Traversal finished. ---")
-            break
-
-        # wait for URL change or network idle
-        try:
-            await page.wait_for_function("url => window.location.href !== url", arg=current_url, timeout=10000)
-            print("✅ Successfully navigated to the next page")
-        except Exception:   
-            # print("⚠️ Still on the same page after clicking Next. Proceeding anyway.")
-            pass
-
-        # ensure network idle to allow dynamic content
-        try:
-            await page.wait_for_load_state("networkidle", timeout=20000)
-        except Exception:
-            # ignore load-state timeout but continue
-            pass
-
+    finally:
+        if post_task is not None:
+            await post_task
+
+    if journal is not None:
+        # the posting is finished; a later --resume starts from the beginning
+        journal.clear()
+    FIELD_TYPE_CACHE.save()
+    if USE_SCHEMA_REGISTRY:
+        SCHEMA_REGISTRY.save()
     return all_fields_data
@@ -0,0 +1,278 @@
+import asyncio
+import os
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Dict, List, Any, AsyncIterator, Optional
+from playwright.async_api import Browser, BrowserContext, Page
+from config import (
+    REUSE_SESSION, CONTEXT_MAX_APPLICATIONS, CONTEXT_MAX_HEAP_MB, BROWSER_MAX_RSS_MB, MEMORY_SAMPLE_INTERVAL_S,
+)
+from session_store import session_state_path, load_session_state
+from browser_profile import new_context
+
+try:
+    import psutil
+except ImportError:  # falls back to reading /proc
+    psutil = None
+
+MB = 1024 * 1024
+
+JS_HEAP_SCRIPT = "() => performance.memory ? performance.memory.usedJSHeapSize : null"
+
+
+def _proc_descendants_rss(root: int) -> Optional[int]:
+    """Sums VmRSS of the descendants of `root` from /proc (Linux only)."""
+    parents: Dict[int, int] = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return None
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # the command name may contain spaces; fields after it are fixed
+                parents[int(entry)] = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+
+    descendants, frontier = set(), [root]
+    while frontier:
+        pid = frontier.pop()
+        children = [child for child, parent in parents.items() if parent == pid and child not in descendants]
+        descendants.update(children)
+        frontier.extend(children)
+
+    total = 0
+    for pid in descendants:
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except (OSError, ValueError):
+            continue
+    return total
+
+
+def browser_rss_mb() -> Optional[float]:
+    """
+    RSS of this process's children (the Playwright driver and the browsers it
+    launched), via psutil when installed, else /proc. Shared pages are counted
+    once per process, so this overestimates slightly.
+    """
+    if psutil is not None:
+        total = 0
+        for child in psutil.Process().children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                continue
+        return total / MB
+    total = _proc_descendants_rss(os.getpid())
+    return total / MB if total is not None else None
+
+
+async def context_heap_mb(context: BrowserContext) -> Optional[float]:
+    """Used JS heap across the context's pages (Chromium's performance.memory)."""
+    total, measured = 0, False
+    for page in context.pages:
+        try:
+            used = await page.evaluate(JS_HEAP_SCRIPT)
+        except Exception:
+            continue  # navigating or closed
+        if used:
+            total += used
+            measured = True
+    return total / MB if measured else None
+
+
+class MemoryMonitor:
+    """Samples browser RSS and the context's JS heap while an application runs and keeps the peaks."""
+
+    def __init__(self, context: BrowserContext, interval_s: float = MEMORY_SAMPLE_INTERVAL_S):
+        self.context = context
+        self.interval_s = interval_s
+        self.peak_rss_mb = 0.0
+        self.peak_heap_mb = 0.0
+        self.last_heap_mb: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def sample(self):
+        rss = await asyncio.to_thread(browser_rss_mb)
+        if rss is not None:
+            self.peak_rss_mb = max(self.peak_rss_mb, rss)
+        heap = await context_heap_mb(self.context)
+        if heap is not None:
+            self.last_heap_mb = heap
+            self.peak_heap_mb = max(self.peak_heap_mb, heap)
+
+    async def _run(self):
+        while True:
+            await self.sample()
+            await asyncio.sleep(self.interval_s)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> Dict[str, float]:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        await self.sample()
+        return {"peak_rss_mb": round(self.peak_rss_mb, 1), "peak_js_heap_mb": round(self.peak_heap_mb, 1)}
+
+
+async def close_pages(context: BrowserContext, keep: Optional[Page] = None) -> int:
+    """Closes every page of the context except `keep` (stray tabs and popups); returns how many."""
+    closed = 0
+    for page in list(context.pages):
+        if page is keep or page.is_closed():
+            continue
+        try:
+            await page.close()
+            closed += 1
+        except Exception:
+            pass
+    return closed
+
+
+class ContextSlot:
+    """A reusable context and how much it has been used since it was created."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.context: Optional[BrowserContext] = None
+        self.session_key: Optional[str] = None
+        self.applications = 0
+        self.last_heap_mb: Optional[float] = None
+
+
+class ContextPool:
+    """
+    Fixed number of browser contexts shared by the applications of a batch.
+    A slot's context is reused for the next posting of the same account and
+    recycled after `max_applications`, when its JS heap passed `max_heap_mb`,
+    or when the whole browser passed `max_browser_rss_mb`. Recycled contexts
+    start from the session state saved at login, so no extra login is needed.
+    """
+
+    def __init__(self, browser: Browser, profile: Dict[str, Any], size: int,
+                 max_applications: int = CONTEXT_MAX_APPLICATIONS, max_heap_mb: float = CONTEXT_MAX_HEAP_MB,
+                 max_browser_rss_mb: float = BROWSER_MAX_RSS_MB):
+        self.browser = browser
+        self.profile = profile
+        # a recorded video covers a context's lifetime, so keep one per application
+        self.max_applications = 1 if profile.get("record_video") else max_applications
+        self.max_heap_mb = max_heap_mb
+        self.max_browser_rss_mb = max_browser_rss_mb
+        self._slots = [ContextSlot(index) for index in range(size)]
+        self.slots: asyncio.Queue = asyncio.Queue()
+        for slot in self._slots:
+            self.slots.put_nowait(slot)
+        self.recycles: Counter = Counter()
+        self.contexts_created = 0
+        self.stray_pages_closed = 0
+        self.applications: List[Dict[str, Any]] = []
+
+    async def _recycle_reason(self, slot: ContextSlot, session_key: str) -> Optional[str]:
+        if slot.context is None:
+            return None
+        if slot.session_key != session_key:
+            return "account"
+        if slot.applications >= self.max_applications:
+            return "applications"
+        if slot.last_heap_mb is not None and slot.last_heap_mb > self.max_heap_mb:
+            return "js_heap"
+        rss = await asyncio.to_thread(browser_rss_mb)
+        if rss is not None and rss > self.max_browser_rss_mb:
+            return "browser_rss"
+        return None
+
+    async def _close(self, slot: ContextSlot):
+        if slot.context is not None:
+            try:
+                await slot.context.close()
+            except Exception:
+                pass
+        slot.context = None
+        slot.applications = 0
+        slot.last_heap_mb = None
+
+    @asynccontextmanager
+    async def application(self, job: Dict[str, str], video_dir: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields {"page", "has_saved_session"} for one posting on a pooled context.
+        On exit the application's memory peaks are stored under "memory" and
+        stray pages are closed. A context whose page crashed, or that could not
+        open a page, is closed so the slot starts a new one.
+        """
+        slot: ContextSlot = await self.slots.get()
+        session_key = session_state_path(job["url"], job["email"])
+        try:
+            reason = await self._recycle_reason(slot, session_key)
+            if reason:
+                print(f"♻️ Recycling context {slot.index} ({reason}, {slot.applications} applications, "
+                      f"{slot.last_heap_mb or 0:.0f} MB heap)")
+                self.recycles[reason] += 1
+                await self._close(slot)
+            reused = slot.context is not None
+            if not reused:
+                storage_state = load_session_state(job["url"], job["email"]) if REUSE_SESSION else None
+                slot.context = await new_context(self.browser, self.profile, storage_state=storage_state,
+                                                 video_dir=video_dir)
+                slot.session_key = session_key
+                self.contexts_created += 1
+                has_saved_session = storage_state is not None
+            else:
+                has_saved_session = True  # still holds the cookies of the previous application
+
+            try:
+                page = await slot.context.new_page()
+            except Exception:
+                # a crashed context cannot be reused; the next application on this slot starts a new one
+                self.recycles["crashed"] += 1
+                await self._close(slot)
+                raise
+            monitor = MemoryMonitor(slot.context)
+            monitor.start()
+            lease: Dict[str, Any] = {"page": page, "has_saved_session": has_saved_session}
+            crashed: List[bool] = []
+            page.on("crash", lambda _: crashed.append(True))
+            try:
+                yield lease
+            finally:
+                memory = await monitor.stop()
+                slot.applications += 1
+                slot.last_heap_mb = monitor.last_heap_mb
+                memory.update(context=slot.index, context_reused=reused, context_applications=slot.applications)
+                lease["memory"] = memory
+                self.applications.append({"job_id": job.get("job_id"), **memory})
+                self.stray_pages_closed += max(0, await close_pages(slot.context) - 1)
+                if crashed:
+                    print(f"💥 Renderer of context {slot.index} crashed; starting a new context next time")
+                    self.recycles["crashed"] += 1
+                if crashed or self.max_applications <= 1:
+                    await self._close(slot)
+        finally:
+            self.slots.put_nowait(slot)
+
+    async def close(self):
+        for slot in self._slots:
+            await self._close(slot)
+
+    def stats(self) -> Dict[str, Any]:
+        peaks = [a["peak_rss_mb"] for a in self.applications]
+        return {
+            "applications": len(self.applications),
+            "contexts_created": self.contexts_created,
+            "recycles": dict(self.recycles),
+            "stray_pages_closed": self.stray_pages_closed,
+            "peak_browser_rss_mb": max(peaks) if peaks else 0.0,
+            "peak_js_heap_mb": max((a["peak_js_heap_mb"] for a in self.applications), default=0.0),
+        }
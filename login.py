@@ -1,8 +1,12 @@
 # login.py
 from playwright.async_api import Page
-from typing import Optional
+from waits import wait_for_condition
+from session_store import save_session_state, discard_session_state
 
-async def login_to_workday(page: Page, tenant_url: str, email: str, password: str):
+LOGIN_MARKERS = 'input[data-automation-id="email"], button[data-automation-id="signInLink"]'
+AUTHENTICATED_MARKERS = '[data-automation-id^="formField-"], [data-automation-id="progressBar"], ol[aria-label="Application Progress"]'
+
+async def login_to_workday(page: Page, tenant_url: str, email: str, password: str, output_dir: str = "output"):
     """Navigates to the Workday tenant and logs in with provided credentials."""
     print(f"Navigating to {tenant_url}...")
     await page.goto(tenant_url)
@@ -31,8 +35,45 @@ async def login_to_workday(page: Page, tenant_url: str, email: str, password: st
     await page.click('div[data-automation-id="click_filter"]')
 
     await page.wait_for_load_state('networkidle')
-    await page.wait_for_timeout(3000)
+    # the login form disappears once Workday accepts the credentials
+    await wait_for_condition(
+        page, "login:form_gone",
+        "() => !document.querySelector('input[data-automation-id=\"password\"]')",
+        budget_ms=3000,
+    )
 
-    content = await page.content()
     print("✅ Login successful.")
-    await page.screenshot(path="output/login_success.png")
\ No newline at end of file
+    await page.screenshot(path=f"{output_dir}/login_success.png")
+
+
+async def is_session_valid(page: Page, tenant_url: str) -> bool:
+    """
+    Opens the posting with the restored session and checks whether Workday
+    shows the application (valid) or the sign-in form (stale).
+    """
+    print(f"Navigating to {tenant_url} with saved session...")
+    await page.goto(tenant_url)
+    try:
+        await page.wait_for_selector(f"{LOGIN_MARKERS}, {AUTHENTICATED_MARKERS}", timeout=10000)
+    except Exception:
+        return False
+    return await page.locator(LOGIN_MARKERS).count() == 0
+
+
+async def ensure_logged_in(page: Page, tenant_url: str, email: str, password: str,
+                           has_saved_session: bool, output_dir: str = "output") -> bool:
+    """
+    Reuses a restored session when it is still valid, otherwise performs the
+    full login and saves the new session state. Returns True if a full login ran.
+    """
+    if has_saved_session:
+        if await is_session_valid(page, tenant_url):
+            print("✅ Reused saved session, skipping login.")
+            return False
+        print("⚠️ Saved session is stale, logging in again.")
+        discard_session_state(tenant_url, email)
+        await page.context.clear_cookies()
+
+    await login_to_workday(page, tenant_url, email, password, output_dir=output_dir)
+    await save_session_state(page.context, tenant_url, email)
+    return True
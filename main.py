@@ -1,58 +1,181 @@
-# main.py
+import argparse
 import asyncio
 import json
 import os
-from typing import Dict, List, Any
-from playwright.async_api import async_playwright
+from contextlib import nullcontext
+from typing import Dict, List, Any, Optional
+from playwright.async_api import async_playwright, Page
 from utils import get_env_credentials
-from login import login_to_workday
+from login import ensure_logged_in
+from config import (
+    REUSE_SESSION, STREAM_OUTPUT, DEDUPE_OPTION_CATALOGS,
+    USE_NETWORK_CAPTURE, RECORD_NETWORK_FIXTURES, NETWORK_FIXTURE_DIR, PROFILE_PLAYWRIGHT_CALLS,
+)
+from network_capture import NetworkCapture
+from output_writer import StreamingFieldWriter, compact
+from session_store import load_session_state
 from form_processor import traverse_and_process
+from waits import WAIT_STATS
+from retry import RETRY_STATS
+from option_cache import OPTION_CACHE
+from field_types import FIELD_TYPE_CACHE
+from schema_registry import SCHEMA_REGISTRY
+from field_handlers import HARVEST_TIMINGS
+from uploads import UPLOAD_TIMINGS
+from tracing import TRACER
+from profiling import PROFILER
+from lifecycle import MemoryMonitor
+from checkpoint import CheckpointJournal, checkpoint_path
+from browser_profile import get_run_profile, launch_browser, new_context, record_page_load
 
-async def main():
+STREAM_FILE = "workday_form_map.jsonl"
+
+
+async def run_application(page: Page, tenant_url: str, email: str, password: str, resume_path: str,
+                          output_dir: str = "output", has_saved_session: bool = False,
+                          resume: bool = False) -> List[Dict[str, Any]]:
+    """
+    Logs in to a single posting and fills/extracts every application page.
+    Progress is journaled per page; with `resume` a previous run's pages are skipped.
+    """
+    capture = None
+    if USE_NETWORK_CAPTURE:
+        # attach before login so the first page definition is captured too
+        capture = NetworkCapture(record_dir=os.path.join(output_dir, NETWORK_FIXTURE_DIR) if RECORD_NETWORK_FIXTURES else None)
+        capture.attach(page)
+
+    logged_in = await ensure_logged_in(
+        page, tenant_url, email, password, has_saved_session, output_dir=output_dir
+    )
+
+    if logged_in:
+        try:
+            await page.wait_for_function(
+                "url => window.location.href !== url", arg=tenant_url, timeout=8000
+            )
+            print("✅ Successfully navigated to the next page after resume upload.")
+        except:
+            print("⚠️ Still on the same page after clicking Next. Proceeding anyway.")
+
+    print("\nStarting data extraction and filling process...")
+    journal = CheckpointJournal(checkpoint_path(tenant_url, email))
+    writer = None
+    if STREAM_OUTPUT:
+        writer = StreamingFieldWriter(os.path.join(output_dir, STREAM_FILE), dedupe_options=DEDUPE_OPTION_CATALOGS)
+    try:
+        return await traverse_and_process(
+            page, resume_path=resume_path, journal=journal, resume=resume, writer=writer, capture=capture
+        )
+    finally:
+        if writer is not None:
+            writer.close()
+        if capture is not None:
+            print(f"📡 Network capture: {capture.stats()}")
+
+
+def write_form_map(all_data: List[Dict[str, Any]], output_path: str):
+    """Writes the extracted field map as pretty-printed JSON."""
+    print(f"\n✅ Process complete. Writing {len(all_data)} fields to {output_path}")
+    with open(output_path, "w") as f:
+        json.dump(all_data, f, indent=2)
+
+
+def save_form_map(all_data: List[Dict[str, Any]], output_dir: str = "output"):
+    """Writes workday_form_map.json, compacting it from the streamed JSONL when streaming is on."""
+    output_path = os.path.join(output_dir, "workday_form_map.json")
+    if STREAM_OUTPUT:
+        count = compact(os.path.join(output_dir, STREAM_FILE), output_path)
+        print(f"\n✅ Process complete. Compacted {count} streamed fields to {output_path}")
+    else:
+        write_form_map(all_data, output_path)
+
+
+async def main(profile_name: Optional[str] = None, record_video: Optional[bool] = None, resume: bool = False,
+               profile_calls: Optional[bool] = None):
     """Main function to orchestrate the scraper."""
     os.makedirs("output", exist_ok=True)
     email, password, tenant_url, resume_path = get_env_credentials()
+    profile = get_run_profile(profile_name, record_video)
+    profile_calls = PROFILE_PLAYWRIGHT_CALLS if profile_calls is None else profile_calls
+    print(f"Using '{profile['name']}' run profile: {profile}")
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
-        context = await browser.new_context(
-            record_video_dir="output/video",
-            record_video_size={"width": 1280, "height": 720}
-        )
-        page = await context.new_page()
-
-        try:
-            await login_to_workday(page, tenant_url, email, password)
+    # optionally count every Playwright round-trip per field and handler
+    with PROFILER.installed() if profile_calls else nullcontext():
+        async with async_playwright() as p:
+            browser = await launch_browser(p, profile)
+            storage_state = load_session_state(tenant_url, email) if REUSE_SESSION else None
+            context = await new_context(browser, profile, storage_state=storage_state)
+            page = await context.new_page()
+            memory = MemoryMonitor(context)
+            memory.start()
 
             try:
-                await page.wait_for_function(
-                    "url => window.location.href !== url", arg=tenant_url, timeout=8000
+                all_data = await run_application(
+                    page, tenant_url, email, password, resume_path,
+                    has_saved_session=storage_state is not None, resume=resume,
                 )
-                print("✅ Successfully navigated to the next page after resume upload.")
-            except:
-                print("⚠️ Still on the same page after clicking Next. Proceeding anyway.")
-            
-            print("\nStarting data extraction and filling process...")
-            all_data = await traverse_and_process(page, resume_path=resume_path)
-            
-            if all_data:
-                output_path = "output/workday_form_map.json"
-                print(f"\n✅ Process complete. Writing {len(all_data)} fields to {output_path}")
-                with open(output_path, "w") as f:
-                    json.dump(all_data, f, indent=2)
-            else:
-                print("\n⚠️ No data was extracted.")
+                await record_page_load(page, profile)
+
+                if all_data:
+                    save_form_map(all_data, "output")
+                else:
+                    print("\n⚠️ No data was extracted.")
             
-            await page.screenshot(path="output/final_page.png")
+                await page.screenshot(path="output/final_page.png")
 
-        except Exception as e:
-            print(f"\n❌ An unexpected error occurred: {e}")
-            await page.screenshot(path="output/error_screenshot.png")
-            print("A screenshot of the error page has been saved to 'output/error_screenshot.png'.")
-        finally:
-            print("Closing browser.")
-            await context.close()
-            await browser.close()
+            except Exception as e:
+                print(f"\n❌ An unexpected error occurred: {e}")
+                await page.screenshot(path="output/error_screenshot.png")
+                print("A screenshot of the error page has been saved to 'output/error_screenshot.png'.")
+            finally:
+                peaks = await memory.stop()
+                print(f"🧠 Peak memory: {peaks['peak_rss_mb']:.0f} MB browser RSS, {peaks['peak_js_heap_mb']:.0f} MB JS heap")
+                WAIT_STATS.print_report()
+                RETRY_STATS.print_report()
+                TRACER.export("output")
+                for field_type, stats in TRACER.summary_by("container", "field_type").items():
+                    print(f"  {field_type:<16}{stats['count']:>5} fields {stats['total_ms'] / 1000:>8.1f}s total {stats['avg_ms']:>8.0f} ms avg")
+                cache_stats = OPTION_CACHE.stats()
+                print(f"🗂️ Option catalog cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                      f"({cache_stats['stale']} stale)")
+                OPTION_CACHE.close()
+                type_stats = FIELD_TYPE_CACHE.stats()
+                if type_stats["lookups"]:
+                    print(f"🧩 Field type cache: {type_stats['hits']} hits, {type_stats['misses']} misses "
+                          f"({type_stats['hit_rate']:.0%} hit rate, {type_stats['signatures']} signatures)")
+                else:
+                    print(f"🧩 Field type cache: no lookups (it only serves the locator path, used when "
+                          f"USE_DOM_SNAPSHOT is off); {type_stats['signatures']} signatures learned")
+                FIELD_TYPE_CACHE.save()
+                schema_stats = SCHEMA_REGISTRY.stats()
+                print(f"📐 Schema reuse: {schema_stats['containers_reused']}/{schema_stats['containers']} containers "
+                      f"({schema_stats['reuse_ratio']:.0%}), {schema_stats['pages_unchanged']}/{schema_stats['pages']} pages unchanged")
+                if HARVEST_TIMINGS:
+                    total_ms = sum(t["elapsed_ms"] for t in HARVEST_TIMINGS)
+                    print(f"📜 Harvested {len(HARVEST_TIMINGS)} option lists in {total_ms / 1000:.1f}s")
+                    with open("output/harvest_timings.json", "w") as f:
+                        json.dump(HARVEST_TIMINGS, f, indent=2)
+                if UPLOAD_TIMINGS:
+                    for timing in UPLOAD_TIMINGS:
+                        print(f"📎 {timing['file']} -> {timing['field']}: {timing['latency_ms']:.0f} ms ({timing['outcome']})")
+                    with open("output/upload_timings.json", "w") as f:
+                        json.dump(UPLOAD_TIMINGS, f, indent=2)
+                if profile_calls:
+                    PROFILER.print_report()
+                    with open("output/playwright_calls.json", "w") as f:
+                        json.dump(PROFILER.report(), f, indent=2)
+                with open("output/wait_report.json", "w") as f:
+                    json.dump(WAIT_STATS.report(), f, indent=2)
+                print("Closing browser.")
+                await context.close()
+                await browser.close()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Fill and map a Workday application.")
+    parser.add_argument("--profile", help="Run profile: default, lightweight (headless, resource blocking) or debug (video).")
+    parser.add_argument("--video", action="store_true", default=None, help="Record a video of the session.")
+    parser.add_argument("--resume", action="store_true", help="Continue after the last page completed by a previous run.")
+    parser.add_argument("--profile-calls", action="store_true", default=None,
+                        help="Count Playwright calls per method, field and handler and print the hot spots.")
+    args = parser.parse_args()
+    asyncio.run(main(args.profile, args.video, args.resume, args.profile_calls))
@@ -0,0 +1,223 @@
+import argparse
+import asyncio
+import glob
+import json
+import os
+import re
+from typing import Dict, List, Any, Optional, Set
+from playwright.async_api import Page, Response
+from config import NETWORK_CAPTURE_URL_PATTERNS
+
+# Workday widget names (lowercased, punctuation stripped) -> type_of_input.
+WIDGET_TYPES = {
+    "text": "text", "textinput": "text", "email": "text", "emailaddress": "text", "phone": "text",
+    "phonenumber": "text", "url": "text", "uri": "text",
+    "number": "number", "numeric": "number", "numericinput": "number", "currency": "number", "decimal": "number",
+    "textarea": "textarea", "multilinetext": "textarea", "richtext": "textarea", "richtextinput": "textarea",
+    "date": "date-mmddyyyy", "dateinput": "date-mmddyyyy", "monthyear": "date-mmyyyy", "monthyearinput": "date-mmyyyy",
+    "select": "dropdown", "selectinput": "dropdown", "dropdown": "dropdown", "singleselect": "dropdown",
+    "multiselect": "multiselect", "multiselectinput": "multiselect", "prompt": "multiselect", "monikerlist": "multiselect",
+    "radio": "radio", "radiogroup": "radio", "radiobutton": "radio",
+    "checkbox": "checkbox", "checkboxgroup": "checkbox", "boolean": "checkbox",
+    "file": "file", "fileupload": "file", "attachment": "file", "attachments": "file",
+}
+WIDGET_KEYS = ("widget", "widgetType", "fieldType", "type")
+LABEL_KEYS = ("label", "labelText", "prompt", "displayName", "name")
+ID_KEYS = ("automationId", "fieldId", "id", "key")
+OPTION_LIST_KEYS = ("options", "values", "instances", "choices", "items")
+OPTION_TEXT_KEYS = ("label", "descriptor", "text", "displayName", "name", "value")
+CHILD_KEYS = ("children", "subOptions", "options", "values")
+
+
+def _widget_type(node: Dict[str, Any]) -> Optional[str]:
+    for key in WIDGET_KEYS:
+        value = node.get(key)
+        if isinstance(value, str):
+            field_type = WIDGET_TYPES.get(re.sub(r"[^a-z]", "", value.lower()))
+            if field_type:
+                return field_type
+    return None
+
+
+def _first_str(node: Dict[str, Any], keys) -> str:
+    for key in keys:
+        value = node.get(key)
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+    return ""
+
+
+def _parse_options(node: Dict[str, Any]) -> List[Any]:
+    """Flat option texts, or [{top: [nested, ...]}] when options carry children (form map layout)."""
+    raw = next((node[key] for key in OPTION_LIST_KEYS if isinstance(node.get(key), list)), [])
+    flat: List[str] = []
+    nested: Dict[str, List[str]] = {}
+    for item in raw:
+        if isinstance(item, str):
+            flat.append(item)
+            continue
+        if not isinstance(item, dict):
+            continue
+        text = _first_str(item, OPTION_TEXT_KEYS)
+        if not text:
+            continue
+        flat.append(text)
+        children = next((item[key] for key in CHILD_KEYS if isinstance(item.get(key), list)), [])
+        child_texts = [c if isinstance(c, str) else _first_str(c, OPTION_TEXT_KEYS) for c in children if isinstance(c, (str, dict))]
+        if any(child_texts):
+            nested[text] = [c for c in child_texts if c]
+    if nested:
+        return [{top: nested.get(top, []) for top in flat}]
+    return flat
+
+
+def parse_response_payload(payload: Any) -> List[Dict[str, Any]]:
+    """
+    Walks a JSON page-definition payload and returns field records
+    (label, id_of_input_component, required, type_of_input, options) for every
+    node that looks like a form widget. Pure function, used on live responses
+    and on recorded fixtures alike.
+    """
+    records: List[Dict[str, Any]] = []
+    seen: Set[str] = set()
+
+    def visit(node: Any):
+        if isinstance(node, list):
+            for item in node:
+                visit(item)
+            return
+        if not isinstance(node, dict):
+            return
+        field_type = _widget_type(node)
+        label = _first_str(node, LABEL_KEYS)
+        if field_type and label:
+            field_id = _first_str(node, ID_KEYS)
+            key = field_id or label
+            if key not in seen:
+                seen.add(key)
+                records.append({
+                    "label": label.replace("*", "").strip(),
+                    "id_of_input_component": field_id,
+                    "required": bool(node.get("required") or node.get("isRequired") or label.endswith("*")),
+                    "type_of_input": field_type,
+                    "options": _parse_options(node),
+                })
+            return
+        for value in node.values():
+            if isinstance(value, (dict, list)):
+                visit(value)
+
+    visit(payload)
+    return records
+
+
+def _normalize_label(label: str) -> str:
+    return " ".join((label or "").replace("*", "").lower().split())
+
+
+class NetworkCapture:
+    """
+    Listens to a page's JSON responses and keeps the field records parsed from
+    them, indexed by field id and label, so extraction can take metadata and
+    option lists from the payloads and use the DOM only for filling.
+    Raw payloads can be recorded as fixtures and replayed with from_fixtures().
+    """
+
+    def __init__(self, record_dir: Optional[str] = None, url_patterns: Optional[List[str]] = None):
+        self.record_dir = record_dir
+        self.url_patterns = url_patterns if url_patterns is not None else NETWORK_CAPTURE_URL_PATTERNS
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+        self.by_label: Dict[str, Dict[str, Any]] = {}
+        # input ids seen per label; a label used by several fields (e.g. "Country"
+        # for the address and the phone) is not used as a lookup fallback
+        self._label_ids: Dict[str, Set[str]] = {}
+        self.responses = 0
+        self.lookups = {"hits": 0, "misses": 0}
+        self._pending: Set[asyncio.Task] = set()
+
+    def attach(self, page: Page):
+        page.on("response", self._on_response)
+
+    def _on_response(self, response: Response):
+        if "json" not in (response.headers.get("content-type") or ""):
+            return
+        if self.url_patterns and not any(pattern in response.url for pattern in self.url_patterns):
+            return
+        task = asyncio.ensure_future(self._read(response))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _read(self, response: Response):
+        try:
+            payload = await response.json()
+        except Exception:
+            return
+        self.responses += 1
+        self.ingest(payload)
+        if self.record_dir:
+            os.makedirs(self.record_dir, exist_ok=True)
+            path = os.path.join(self.record_dir, f"response_{self.responses:04d}.json")
+            with open(path, "w") as f:
+                json.dump({"url": response.url, "payload": payload}, f)
+
+    def ingest(self, payload: Any) -> int:
+        """Indexes the field records found in one payload; returns how many were found."""
+        records = parse_response_payload(payload)
+        for record in records:
+            input_id = record["id_of_input_component"]
+            if input_id:
+                self.by_id[input_id] = record
+            key = _normalize_label(record["label"])
+            self.by_label.setdefault(key, record)
+            ids = self._label_ids.setdefault(key, set())
+            # records without an id cannot be told apart, so each counts as another field
+            ids.add(input_id or f"#{len(ids)}")
+        return len(records)
+
+    def ambiguous_label(self, label: str) -> bool:
+        return len(self._label_ids.get(_normalize_label(label), ())) > 1
+
+    async def settle(self):
+        """Waits for responses that are still being read and parsed."""
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+    def lookup(self, automation_id: str, label: str = "") -> Optional[Dict[str, Any]]:
+        """
+        Finds the record for a DOM container by automation id (with or without
+        formField-), falling back to the label only when no other field uses it.
+        """
+        record = self.by_id.get(automation_id) or self.by_id.get(automation_id.replace("formField-", "", 1))
+        if record is None and not self.ambiguous_label(label):
+            record = self.by_label.get(_normalize_label(label))
+        self.lookups["hits" if record else "misses"] += 1
+        return record
+
+    def stats(self) -> Dict[str, int]:
+        return {"responses": self.responses, "fields": len(self.by_label), **self.lookups}
+
+    @classmethod
+    def from_fixtures(cls, directory: str) -> "NetworkCapture":
+        """Replays recorded response fixtures ({"url", "payload"} JSON files) without a browser."""
+        capture = cls(url_patterns=[])
+        for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+            with open(path) as f:
+                fixture = json.load(f)
+            capture.responses += 1
+            capture.ingest(fixture.get("payload", fixture) if isinstance(fixture, dict) else fixture)
+        return capture
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parse recorded Workday response fixtures into field records.")
+    parser.add_argument("fixture_dir")
+    parser.add_argument("--output", help="Write the parsed records as a JSON form map.")
+    args = parser.parse_args()
+    replay = NetworkCapture.from_fixtures(args.fixture_dir)
+    records = list({id(r): r for r in [*replay.by_id.values(), *replay.by_label.values()]}.values())
+    for record in records:
+        print(f"{record['type_of_input']:<16}{'*' if record['required'] else ' '} {record['label']} ({len(record['options'])} options)")
+    print(f"Parsed {len(records)} fields from {replay.responses} responses")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(records, f, indent=2)
@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+from playwright.async_api import Locator
+from config import OPTION_CACHE_PATH, OPTION_CACHE_TTL_SECONDS, OPTION_CACHE_MAX_ENTRIES
+
+# Reads count plus first/last rendered option text in one round-trip.
+FINGERPRINT_SCRIPT = """
+(el) => {
+    const opts = Array.from(el.querySelectorAll('[role="option"]'));
+    const text = (o) => (o ? (o.innerText || o.textContent || "").trim() : "");
+    return { count: opts.length, first: text(opts[0]), last: text(opts[opts.length - 1]) };
+}
+"""
+
+
+def tenant_host(url: str) -> str:
+    """Returns the Workday tenant host used to partition cached catalogs."""
+    return urlparse(url).netloc.lower()
+
+
+async def fingerprint_options(popup: Locator) -> str:
+    """Cheap fingerprint of an open option list: rendered count and first/last option."""
+    info = await popup.evaluate(FINGERPRINT_SCRIPT)
+    raw = f"{info['count']}|{info['first']}|{info['last']}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+class OptionCache:
+    """
+    On-disk cache of harvested dropdown/multiselect catalogs keyed by tenant
+    host, field automation id and option-list fingerprint, with TTL expiry
+    and least-recently-used eviction. The fingerprint only covers the count and
+    the first and last options, so callers check a hit against the rendered
+    list and invalidate it when an option in between changed.
+    """
+
+    def __init__(self, path: str = OPTION_CACHE_PATH, ttl_seconds: float = OPTION_CACHE_TTL_SECONDS,
+                 max_entries: int = OPTION_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS catalogs (
+                    tenant TEXT NOT NULL,
+                    field_id TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    options TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    PRIMARY KEY (tenant, field_id, fingerprint)
+                )"""
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, tenant: str, field_id: str, fingerprint: str) -> Optional[Any]:
+        """Returns the cached catalog, or None on a miss or an expired entry."""
+        key = (tenant, field_id, fingerprint)
+        row = self.conn.execute(
+            "SELECT options, created_at FROM catalogs WHERE tenant = ? AND field_id = ? AND fingerprint = ?", key
+        ).fetchone()
+        now = time.time()
+        if row is None or now - row[1] > self.ttl_seconds:
+            if row is not None:
+                self.conn.execute("DELETE FROM catalogs WHERE tenant = ? AND field_id = ? AND fingerprint = ?", key)
+                self.conn.commit()
+            self.misses += 1
+            return None
+        self.conn.execute(
+            "UPDATE catalogs SET last_access = ? WHERE tenant = ? AND field_id = ? AND fingerprint = ?", (now, *key)
+        )
+        self.conn.commit()
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, tenant: str, field_id: str, fingerprint: str, options: Any):
+        """Stores a catalog and evicts the least recently used entries above max_entries."""
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO catalogs VALUES (?, ?, ?, ?, ?, ?)",
+            (tenant, field_id, fingerprint, json.dumps(options), now, now),
+        )
+        self.conn.execute(
+            """DELETE FROM catalogs WHERE rowid IN (
+                SELECT rowid FROM catalogs ORDER BY last_access DESC LIMIT -1 OFFSET ?
+            )""",
+            (self.max_entries,),
+        )
+        self.conn.commit()
+
+    def invalidate(self, tenant: str, field_id: str, fingerprint: str):
+        """Drops an entry a hit turned out to be stale for; the hit is counted as a miss."""
+        self.conn.execute(
+            "DELETE FROM catalogs WHERE tenant = ? AND field_id = ? AND fingerprint = ?", (tenant, field_id, fingerprint)
+        )
+        self.conn.commit()
+        self.hits -= 1
+        self.misses += 1
+        self.stale += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "stale": self.stale}
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+OPTION_CACHE = OptionCache()
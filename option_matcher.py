@@ -0,0 +1,90 @@
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Minimum token-overlap score for a fuzzy match to be accepted.
+MIN_TOKEN_SCORE = 0.5
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize_option(text: str) -> str:
+    """Casefolds, strips accents and collapses whitespace."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.casefold().split())
+
+
+def tokenize(normalized: str) -> frozenset:
+    return frozenset(_TOKEN_RE.findall(normalized))
+
+
+class OptionIndex:
+    """
+    Normalized view of one option list, built once and queried many times.
+    `match` returns the position of the best option for a wanted value:
+    exact normalized match, then prefix, then token-overlap score.
+    """
+
+    def __init__(self, options: Sequence[str]):
+        self.options = list(options)
+        self.normalized = [normalize_option(opt) for opt in self.options]
+        self.tokens = [tokenize(norm) for norm in self.normalized]
+        self.exact: Dict[str, int] = {}
+        for idx, norm in enumerate(self.normalized):
+            self.exact.setdefault(norm, idx)
+
+    def match(self, wanted: str) -> Optional[int]:
+        norm = normalize_option(wanted)
+        if not norm:
+            return None
+        if norm in self.exact:
+            return self.exact[norm]
+
+        wanted_tokens = tokenize(norm)
+        prefix_idx: Optional[int] = None
+        best_idx, best_score = None, 0.0
+        for idx, candidate in enumerate(self.normalized):
+            if candidate.startswith(norm):
+                prefix_idx = idx
+                break
+            tokens = self.tokens[idx]
+            if wanted_tokens and tokens:
+                score = len(wanted_tokens & tokens) / len(wanted_tokens | tokens)
+                if score > best_score:
+                    best_idx, best_score = idx, score
+        if prefix_idx is not None:
+            return prefix_idx
+        return best_idx if best_score >= MIN_TOKEN_SCORE else None
+
+    def best(self, wanted: str) -> Optional[str]:
+        idx = self.match(wanted)
+        return self.options[idx] if idx is not None else None
+
+
+@lru_cache(maxsize=256)
+def _index_for(options: Tuple[str, ...]) -> OptionIndex:
+    return OptionIndex(options)
+
+
+def option_index(options: Sequence[str]) -> OptionIndex:
+    """Returns the (memoized) index for an option list."""
+    return _index_for(tuple(opt if isinstance(opt, str) else "" for opt in options))
+
+
+def match_path(path: List[str], top: Sequence[str], nested: Dict[str, List[str]]) -> Tuple[List[str], List[Optional[int]]]:
+    """
+    Maps a "Top > Nested" path onto a multiselect catalog.
+    Returns the option texts to click and their list positions (None where unknown).
+    """
+    resolved: List[str] = []
+    positions: List[Optional[int]] = []
+    choices: Sequence[str] = top
+    for part in path:
+        idx = option_index(choices).match(part) if choices else None
+        text = choices[idx] if idx is not None else part
+        resolved.append(text)
+        positions.append(idx)
+        choices = nested.get(text, [])
+    return resolved, positions
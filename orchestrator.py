@@ -0,0 +1,252 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+from typing import Dict, List, Any, Optional
+from playwright.async_api import async_playwright
+from config import WORK_QUEUE_PATH, JOB_LEASE_SECONDS, MAX_JOB_ATTEMPTS
+from work_queue import WorkQueue
+from batch_runner import load_jobs, run_job
+from browser_profile import get_run_profile, launch_browser
+from lifecycle import ContextPool
+from waits import WAIT_STATS
+from retry import RETRY_STATS
+from option_cache import OPTION_CACHE
+from field_types import FIELD_TYPE_CACHE
+from schema_registry import SCHEMA_REGISTRY
+from uploads import UPLOAD_TIMINGS
+from field_handlers import HARVEST_TIMINGS
+from tracing import TRACER
+
+ORCHESTRATOR_OUTPUT_DIR = "output/orchestrator"
+WORKER_RESTARTS = 2  # per worker slot, after a crash with work left in the queue
+
+
+async def keep_lease(queue: WorkQueue, job_id: str, worker_id: str):
+    """Renews a job's lease while it runs so other workers do not pick it up."""
+    while True:
+        await asyncio.sleep(queue.lease_seconds / 3)
+        if not queue.renew(job_id, worker_id):
+            print(f"⚠️ [{worker_id}] Lost the lease on job {job_id}")
+            return
+
+
+def resolve_job(queued: Dict[str, Any], jobs: Dict[str, Dict[str, str]]) -> Dict[str, Any]:
+    """Adds the credentials and resume path the queue does not store, from the job file (with .env defaults)."""
+    source = jobs.get(queued["job_id"])
+    if source is None:
+        raise ValueError(f"Job {queued['job_id']} is not in the job file; cannot resolve its credentials.")
+    return {**source, **queued}
+
+
+async def run_slot(pool: ContextPool, queue: WorkQueue, worker_id: str, resume: bool,
+                   jobs: Dict[str, Dict[str, str]], results: List[Dict[str, Any]]):
+    """One context slot: leases and runs jobs until the queue has nothing left for it."""
+    while True:
+        job = queue.lease(worker_id)
+        if job is None:
+            return
+        try:
+            job = resolve_job(job, jobs)
+        except ValueError as e:
+            print(f"❌ [{worker_id}] {e}")
+            queue.fail(job["job_id"], worker_id, str(e))
+            continue
+        heartbeat = asyncio.create_task(keep_lease(queue, job["job_id"], worker_id))
+        try:
+            # a retried job continues after the pages its earlier attempt journaled
+            result = await run_job(pool, job, resume or job["attempt"] > 1)
+        finally:
+            heartbeat.cancel()
+        result.update(worker=worker_id, attempt=job["attempt"])
+        if result["status"] == "ok":
+            recorded = queue.complete(job["job_id"], worker_id, result)
+        else:
+            recorded = queue.fail(job["job_id"], worker_id, result["error"] or "unknown error", result)
+        if not recorded:
+            print(f"⚠️ [{worker_id}] Lease on job {job['job_id']} was lost; its result is not recorded")
+        results.append(result)
+
+
+async def run_worker(worker_id: str, jobs_path: str, queue_path: str, profile: Dict[str, Any], contexts: int,
+                     resume: bool, lease_seconds: float, max_attempts: int) -> Dict[str, Any]:
+    """Owns one browser and runs up to `contexts` postings in it at once."""
+    jobs = {job["job_id"]: job for job in load_jobs(jobs_path)}
+    queue = WorkQueue(queue_path, lease_seconds, max_attempts)
+    results: List[Dict[str, Any]] = []
+
+    start = time.perf_counter()
+    try:
+        async with async_playwright() as p:
+            browser = await launch_browser(p, profile)
+            pool = ContextPool(browser, profile, contexts)
+            try:
+                # one failing slot must not cancel the others; its lease expires and the job is retried
+                outcomes = await asyncio.gather(
+                    *(run_slot(pool, queue, worker_id, resume, jobs, results) for _ in range(contexts)),
+                    return_exceptions=True,
+                )
+                for outcome in outcomes:
+                    if isinstance(outcome, BaseException):
+                        print(f"❌ [{worker_id}] A context slot stopped: {outcome}")
+            finally:
+                await pool.close()
+                await browser.close()
+    finally:
+        queue.close()
+    total = time.perf_counter() - start
+
+    return {
+        "worker": worker_id,
+        "pid": os.getpid(),
+        "contexts": contexts,
+        "attempts": len(results),
+        "succeeded": sum(1 for r in results if r["status"] == "ok"),
+        "failed": sum(1 for r in results if r["status"] != "ok"),
+        "wall_time_s": round(total, 2),
+        "busy_time_s": round(sum(r["wall_time_s"] for r in results), 2),
+        "jobs_per_minute": round(len(results) / total * 60, 2) if total else 0.0,
+        "contexts_lifecycle": pool.stats(),
+        "adaptive_waits": WAIT_STATS.report(),
+        "field_retries": RETRY_STATS.report(),
+        "option_cache": OPTION_CACHE.stats(),
+        "field_type_cache": FIELD_TYPE_CACHE.stats(),
+        "schema_reuse": SCHEMA_REGISTRY.stats(),
+        "option_harvests": len(HARVEST_TIMINGS),
+        "uploads": len(UPLOAD_TIMINGS),
+        "time_by_field_type": TRACER.summary_by("container", "field_type"),
+    }
+
+
+def worker_main(worker_id: str, jobs_path: str, queue_path: str, profile: Dict[str, Any], contexts: int,
+                resume: bool, lease_seconds: float, max_attempts: int):
+    """Process entry point; writes the worker's metrics for the coordinator to aggregate."""
+    metrics = asyncio.run(run_worker(
+        worker_id, jobs_path, queue_path, profile, contexts, resume, lease_seconds, max_attempts
+    ))
+    worker_dir = os.path.join(ORCHESTRATOR_OUTPUT_DIR, "workers")
+    TRACER.export(worker_dir, prefix=worker_id)
+    with open(os.path.join(worker_dir, f"{worker_id}.json"), "w") as f:
+        json.dump(metrics, f, indent=2)
+    print(f"👷 [{worker_id}] Done: {metrics['succeeded']} succeeded, {metrics['failed']} failed "
+          f"in {metrics['wall_time_s']}s ({metrics['jobs_per_minute']} jobs/min)")
+
+
+def aggregate(queue: WorkQueue, worker_ids: List[str], total: float, workers: int, contexts: int) -> Dict[str, Any]:
+    """Combines the queue state and every worker's metrics into one summary."""
+    per_worker: List[Dict[str, Any]] = []
+    for worker_id in worker_ids:
+        try:
+            with open(os.path.join(ORCHESTRATOR_OUTPUT_DIR, "workers", f"{worker_id}.json")) as f:
+                per_worker.append(json.load(f))
+        except (OSError, ValueError):
+            per_worker.append({"worker": worker_id, "crashed": True})
+
+    jobs = queue.results()
+    counts = queue.counts()
+    done = counts.get("done", 0)
+    waits_saved_ms = sum(w["adaptive_waits"]["saved_ms"] for w in per_worker if "adaptive_waits" in w)
+    peak_rss = max((w["contexts_lifecycle"]["peak_browser_rss_mb"] for w in per_worker if "contexts_lifecycle" in w), default=0.0)
+    return {
+        "jobs": len(jobs),
+        "succeeded": done,
+        "failed": counts.get("failed", 0),
+        "unfinished": queue.unfinished(),
+        "retries": sum(max(0, job["attempts"] - 1) for job in jobs),
+        "workers": workers,
+        "contexts_per_worker": contexts,
+        "total_wall_time_s": round(total, 2),
+        "jobs_per_minute": round(done / total * 60, 2) if total else 0.0,
+        "jobs_per_minute_per_worker": round(done / total * 60 / workers, 2) if total else 0.0,
+        "adaptive_waits_saved_ms": round(waits_saved_ms, 1),
+        "peak_worker_browser_rss_mb": peak_rss,
+        "per_worker": per_worker,
+        "results": jobs,
+    }
+
+
+def run_orchestrator(jobs_path: str, workers: int, contexts: int, profile: Dict[str, Any],
+                     resume: bool = False, queue_path: str = WORK_QUEUE_PATH,
+                     lease_seconds: float = JOB_LEASE_SECONDS, max_attempts: int = MAX_JOB_ATTEMPTS) -> Dict[str, Any]:
+    """
+    Queues the postings and runs them in `workers` processes, each with one
+    browser and `contexts` concurrent contexts. A worker that crashes has its
+    leases released and is restarted while work remains. Re-running with the
+    same queue file only picks up jobs that are not done yet. The queue keeps
+    only job ids, URLs and emails; workers read credentials from `jobs_path`
+    (and .env) when they lease a job.
+    """
+    os.makedirs(os.path.join(ORCHESTRATOR_OUTPUT_DIR, "workers"), exist_ok=True)
+    queue = WorkQueue(queue_path, lease_seconds, max_attempts)
+    added = queue.enqueue(load_jobs(jobs_path))
+    print(f"🗃️ Queued {added} new postings ({queue.unfinished()} unfinished) in {queue_path}")
+
+    # spawn: each worker starts a fresh interpreter with its own Playwright driver
+    mp = multiprocessing.get_context("spawn")
+
+    def spawn(worker_id: str):
+        process = mp.Process(
+            target=worker_main, name=worker_id,
+            args=(worker_id, jobs_path, queue_path, profile, contexts, resume, lease_seconds, max_attempts),
+        )
+        process.start()
+        return process
+
+    start = time.perf_counter()
+    worker_ids = [f"worker-{index}" for index in range(workers)]
+    running = {worker_id: spawn(worker_id) for worker_id in worker_ids}
+    restarts: Dict[str, int] = {}
+    while running:
+        time.sleep(1)
+        for worker_id, process in list(running.items()):
+            if process.is_alive():
+                continue
+            del running[worker_id]
+            if process.exitcode == 0:
+                continue
+            released = queue.release(worker_id, f"worker exited with code {process.exitcode}")
+            print(f"💥 {worker_id} exited with code {process.exitcode}; released {released} leased jobs")
+            slot = worker_id.split(".")[0]
+            restarts[slot] = restarts.get(slot, 0) + 1
+            if queue.unfinished() and restarts[slot] <= WORKER_RESTARTS:
+                new_id = f"{slot}.{restarts[slot]}"
+                worker_ids.append(new_id)
+                running[new_id] = spawn(new_id)
+    total = time.perf_counter() - start
+
+    summary = aggregate(queue, worker_ids, total, workers, contexts)
+    queue.close()
+    summary_path = os.path.join(ORCHESTRATOR_OUTPUT_DIR, "summary.json")
+    with open(summary_path, "w") as f:
+        json.dump(summary, f, indent=2)
+    print(f"\n✅ Orchestrator complete: {summary['succeeded']}/{summary['jobs']} succeeded in "
+          f"{summary['total_wall_time_s']}s ({summary['jobs_per_minute']} jobs/min, {summary['retries']} retries). "
+          f"Summary: {summary_path}")
+    return summary
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run many Workday applications across worker processes.")
+    parser.add_argument("jobs", help="CSV or JSONL file with one posting per row (column/key `url`).")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="Number of worker processes, each with its own browser.")
+    parser.add_argument("--contexts", type=int, default=3, help="Concurrent browser contexts per worker.")
+    parser.add_argument("--profile", help="Run profile: default, lightweight (headless, resource blocking) or debug (video).")
+    parser.add_argument("--headless", action="store_true", help="Run the worker browsers headless regardless of profile.")
+    parser.add_argument("--resume", action="store_true", help="Continue each posting after its last journaled page.")
+    parser.add_argument("--queue", default=WORK_QUEUE_PATH, help="SQLite work queue file.")
+    parser.add_argument("--max-attempts", type=int, default=MAX_JOB_ATTEMPTS, help="Attempts per posting before it is marked failed.")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    profile = get_run_profile(args.profile)
+    if args.headless:
+        profile["headless"] = True
+    run_orchestrator(
+        args.jobs, max(1, args.workers), max(1, args.contexts), profile,
+        resume=args.resume, queue_path=args.queue, max_attempts=max(1, args.max_attempts),
+    )
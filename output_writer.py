@@ -0,0 +1,97 @@
+import argparse
+import hashlib
+import json
+import os
+from typing import Dict, List, Any, Set
+from config import CATALOG_DEDUPE_MIN_OPTIONS
+
+
+def catalog_hash(options: Any) -> str:
+    return hashlib.sha1(json.dumps(options, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+class StreamingFieldWriter:
+    """
+    Appends each field record to a JSONL file as soon as it is produced.
+    With dedupe_options, option lists of at least `min_catalog_size` entries
+    are written once as {"catalog": <hash>, "options": [...]} lines and the
+    field records reference them as {"$ref": <hash>}.
+    """
+
+    def __init__(self, path: str, dedupe_options: bool = False, min_catalog_size: int = CATALOG_DEDUPE_MIN_OPTIONS):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.dedupe_options = dedupe_options
+        self.min_catalog_size = min_catalog_size
+        self.count = 0
+        self._catalogs: Set[str] = set()
+        self._file = open(path, "w")
+
+    def _write_line(self, record: Dict[str, Any]):
+        self._file.write(json.dumps(record) + "\n")
+
+    def write(self, field: Dict[str, Any]):
+        record = field
+        options = field.get("options")
+        if self.dedupe_options and isinstance(options, list) and len(options) >= self.min_catalog_size:
+            digest = catalog_hash(options)
+            if digest not in self._catalogs:
+                self._catalogs.add(digest)
+                self._write_line({"catalog": digest, "options": options})
+            record = dict(field, options={"$ref": digest})
+        self._write_line(record)
+        self._file.flush()
+        self.count += 1
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def read_fields(jsonl_path: str) -> List[Dict[str, Any]]:
+    """
+    Reads a streamed JSONL file back into field records, resolving catalog
+    references. A record marked "refilled" replaces the earlier record of the
+    same field (page, label and input id).
+    """
+    catalogs: Dict[str, Any] = {}
+    fields: List[Dict[str, Any]] = []
+    positions: Dict[tuple, int] = {}
+    with open(jsonl_path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # last line of an interrupted run
+                break
+            if "catalog" in record and "label" not in record:
+                catalogs[record["catalog"]] = record["options"]
+                continue
+            options = record.get("options")
+            if isinstance(options, dict) and "$ref" in options:
+                record["options"] = catalogs[options["$ref"]]
+            key = (record.get("page_name"), record.get("label"), record.get("id_of_input_component"))
+            if record.pop("refilled", False) and key in positions:
+                fields[positions[key]] = record
+                continue
+            positions[key] = len(fields)
+            fields.append(record)
+    return fields
+
+
+def compact(jsonl_path: str, json_path: str) -> int:
+    """Regenerates the pretty-printed form map JSON from a streamed JSONL file."""
+    fields = read_fields(jsonl_path)
+    with open(json_path, "w") as f:
+        json.dump(fields, f, indent=2)
+    return len(fields)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compact a streamed field JSONL file into the pretty JSON form map.")
+    parser.add_argument("jsonl_path")
+    parser.add_argument("json_path")
+    args = parser.parse_args()
+    print(f"Wrote {compact(args.jsonl_path, args.json_path)} fields to {args.json_path}")
@@ -0,0 +1,120 @@
+import contextvars
+import functools
+import inspect
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+from playwright.async_api import Page, Locator, ElementHandle, Keyboard, Mouse, Frame
+from tracing import TRACER
+
+PROFILED_CLASSES = (Page, Frame, Locator, ElementHandle, Keyboard, Mouse)
+
+# Set while a profiled call runs, so calls Playwright makes internally
+# (e.g. Locator.all() -> count()) are not counted twice.
+_IN_CALL = contextvars.ContextVar("profiled_call", default=False)
+
+
+class CallProfiler:
+    """
+    Counts Playwright API calls (each one is a round-trip to the browser) and
+    the time spent in them, by method and by the field/handler that made them,
+    using the attributes of the enclosing tracing spans.
+    """
+
+    def __init__(self):
+        # (method, field, handler) -> [calls, total ms]
+        self.entries: Dict[Tuple[str, str, str], List[float]] = {}
+
+    def record(self, method: str, elapsed_ms: float):
+        attrs = TRACER.current_attrs()
+        field = attrs.get("automation_id") or attrs.get("page_name") or "(no field)"
+        key = (method, field, attrs.get("handler") or "-")
+        entry = self.entries.setdefault(key, [0, 0.0])
+        entry[0] += 1
+        entry[1] += elapsed_ms
+
+    def _wrap(self, original, method: str):
+        @functools.wraps(original)
+        async def wrapper(*args, **kwargs):
+            if _IN_CALL.get():
+                return await original(*args, **kwargs)
+            token = _IN_CALL.set(True)
+            start = time.perf_counter()
+            try:
+                return await original(*args, **kwargs)
+            finally:
+                _IN_CALL.reset(token)
+                self.record(method, (time.perf_counter() - start) * 1000)
+        return wrapper
+
+    @contextmanager
+    def installed(self) -> Iterator["CallProfiler"]:
+        """Wraps the async methods of the Playwright classes for the duration of the block."""
+        patched = []
+        for cls in PROFILED_CLASSES:
+            for name, member in list(vars(cls).items()):
+                if name.startswith("_") or not inspect.iscoroutinefunction(member):
+                    continue
+                patched.append((cls, name, member))
+                setattr(cls, name, self._wrap(member, f"{cls.__name__}.{name}"))
+        try:
+            yield self
+        finally:
+            for cls, name, member in patched:
+                setattr(cls, name, member)
+
+    def _group(self, index: int) -> Dict[str, Dict[str, float]]:
+        groups: Dict[str, Dict[str, float]] = {}
+        for key, (calls, total_ms) in self.entries.items():
+            group = groups.setdefault(key[index], {"calls": 0, "total_ms": 0.0})
+            group["calls"] += calls
+            group["total_ms"] += total_ms
+        return dict(sorted(groups.items(), key=lambda item: -item[1]["total_ms"]))
+
+    def by_method(self) -> Dict[str, Dict[str, float]]:
+        return self._group(0)
+
+    def by_field(self) -> Dict[str, Dict[str, float]]:
+        return self._group(1)
+
+    def by_handler(self) -> Dict[str, Dict[str, float]]:
+        return self._group(2)
+
+    def method_counts(self) -> Counter:
+        counts: Counter = Counter()
+        for (method, _, _), (calls, _) in self.entries.items():
+            counts[method] += calls
+        return counts
+
+    @property
+    def total_calls(self) -> int:
+        return int(sum(calls for calls, _ in self.entries.values()))
+
+    def report(self, top: int = 15) -> Dict[str, Any]:
+        def head(groups: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+            return {
+                name: {"calls": int(stats["calls"]), "total_ms": round(stats["total_ms"], 1)}
+                for name, stats in list(groups.items())[:top]
+            }
+        return {
+            "total_calls": self.total_calls,
+            "by_method": head(self.by_method()),
+            "by_field": head(self.by_field()),
+            "by_handler": head(self.by_handler()),
+        }
+
+    def print_report(self, top: int = 15):
+        if not self.entries:
+            return
+        print(f"\n🔬 Playwright calls: {self.total_calls} round-trips")
+        for title, groups in (("method", self.by_method()), ("field", self.by_field()), ("handler", self.by_handler())):
+            print(f"  {'top ' + title:<48}{'calls':>8}{'total ms':>12}{'avg ms':>10}")
+            for name, stats in list(groups.items())[:top]:
+                print(f"  {name[:47]:<48}{stats['calls']:>8.0f}{stats['total_ms']:>12.0f}{stats['total_ms'] / stats['calls']:>10.1f}")
+
+    def reset(self):
+        self.entries.clear()
+
+
+PROFILER = CallProfiler()
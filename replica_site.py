@@ -0,0 +1,302 @@
+import html
+import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Any, Dict, List, Tuple
+
+# Deterministic stand-ins for Workday widgets: listbox dropdowns, virtualized
+# multiselects with nested popups and search, and Add-button sections. Every
+# popup renders after a fixed delay so timings are comparable between runs.
+WIDGET_SCRIPT = r"""
+const RENDER_DELAY_MS = 40;
+const ROW_HEIGHT = 30;
+const VISIBLE_ROWS = 8;
+
+function closePopups() {
+    document.querySelectorAll(".wd-popup").forEach(p => p.remove());
+    document.querySelectorAll('[aria-haspopup="listbox"]').forEach(b => b.setAttribute("aria-expanded", "false"));
+}
+
+function placePopup(popup, anchor) {
+    const rect = anchor.getBoundingClientRect();
+    popup.style.position = "absolute";
+    popup.style.left = (rect.left + window.scrollX) + "px";
+    popup.style.top = (rect.bottom + window.scrollY) + "px";
+    popup.style.background = "#fff";
+    popup.style.border = "1px solid #888";
+    popup.style.zIndex = 10;
+    popup.style.minWidth = "320px";
+}
+
+function openDropdown(button) {
+    closePopups();
+    const options = JSON.parse(button.dataset.options);
+    setTimeout(() => {
+        const list = document.createElement("ul");
+        list.setAttribute("role", "listbox");
+        list.className = "wd-popup";
+        list.style.listStyle = "none";
+        list.style.margin = "0";
+        list.style.padding = "0";
+        for (const text of options) {
+            const item = document.createElement("li");
+            item.setAttribute("role", "option");
+            item.textContent = text;
+            item.style.height = ROW_HEIGHT + "px";
+            item.addEventListener("click", () => {
+                button.textContent = text;
+                button.dataset.value = text;
+                closePopups();
+            });
+            list.appendChild(item);
+        }
+        placePopup(list, button);
+        document.body.appendChild(list);
+        button.setAttribute("aria-expanded", "true");
+    }, RENDER_DELAY_MS);
+}
+
+function renderVirtualList(anchor, items, onPick) {
+    closePopups();
+    setTimeout(() => {
+        const popup = document.createElement("div");
+        popup.setAttribute("role", "listbox");
+        popup.className = "wd-popup";
+        placePopup(popup, anchor);
+        popup.style.height = (ROW_HEIGHT * Math.min(VISIBLE_ROWS, Math.max(items.length, 1))) + "px";
+        popup.style.overflowY = "auto";
+        const spacer = document.createElement("div");
+        spacer.style.position = "relative";
+        spacer.style.height = (items.length * ROW_HEIGHT) + "px";
+        popup.appendChild(spacer);
+
+        const draw = () => {
+            const first = Math.floor(popup.scrollTop / ROW_HEIGHT);
+            const last = Math.min(items.length, first + VISIBLE_ROWS + 2);
+            spacer.replaceChildren();
+            for (let i = first; i < last; i++) {
+                const row = document.createElement("div");
+                row.setAttribute("role", "option");
+                row.setAttribute("data-automation-id", "promptOption");
+                row.textContent = items[i];
+                row.style.position = "absolute";
+                row.style.top = (i * ROW_HEIGHT) + "px";
+                row.style.height = ROW_HEIGHT + "px";
+                row.addEventListener("click", () => onPick(items[i]));
+                spacer.appendChild(row);
+            }
+        };
+        popup.addEventListener("scroll", () => requestAnimationFrame(draw));
+        draw();
+        document.body.appendChild(popup);
+    }, RENDER_DELAY_MS);
+}
+
+function selectLeaf(container, value) {
+    const pill = document.createElement("div");
+    pill.setAttribute("data-automation-id", "selectedItem");
+    pill.textContent = value;
+    container.querySelector(".wd-selected").appendChild(pill);
+    closePopups();
+}
+
+function openMultiselect(input) {
+    const container = input.closest('[data-automation-id="multiSelectContainer"]');
+    const tree = JSON.parse(container.dataset.tree);
+    const top = Array.isArray(tree) ? tree : Object.keys(tree);
+    renderVirtualList(input, top, (choice) => {
+        const nested = Array.isArray(tree) ? null : tree[choice];
+        if (nested && nested.length) {
+            renderVirtualList(input, nested, (leaf) => selectLeaf(container, leaf));
+        } else {
+            selectLeaf(container, choice);
+        }
+    });
+}
+
+function searchMultiselect(input) {
+    const container = input.closest('[data-automation-id="multiSelectContainer"]');
+    const tree = JSON.parse(container.dataset.tree);
+    const leaves = Array.isArray(tree) ? tree : Object.values(tree).flat();
+    const term = input.value.trim().toLowerCase();
+    const matches = leaves.filter(l => l.toLowerCase().includes(term));
+    renderVirtualList(input, matches, (leaf) => selectLeaf(container, leaf));
+}
+
+function expandSection(button) {
+    const group = button.closest('[role="group"]');
+    const template = group.querySelector("template");
+    group.querySelector(".wd-slot").appendChild(template.content.cloneNode(true));
+    button.textContent = "Add Another";
+}
+
+document.addEventListener("keydown", (e) => {
+    if (e.key === "Escape") closePopups();
+});
+document.addEventListener("mousedown", (e) => {
+    if (!e.target.closest(".wd-popup, [aria-haspopup='listbox'], [data-automation-id='multiSelectContainer']")) {
+        closePopups();
+    }
+});
+document.addEventListener("click", (e) => {
+    const dropdown = e.target.closest('button[aria-haspopup="listbox"]');
+    if (dropdown) openDropdown(dropdown);
+    const addButton = e.target.closest('button[data-automation-id="add-button"]');
+    if (addButton) expandSection(addButton);
+    const msInput = e.target.closest('[data-automation-id="multiSelectContainer"] input');
+    if (msInput) openMultiselect(msInput);
+});
+document.addEventListener("keydown", (e) => {
+    const msInput = e.target.closest && e.target.closest('[data-automation-id="multiSelectContainer"] input');
+    if (msInput && e.key === "Enter") searchMultiselect(msInput);
+});
+"""
+
+FALLBACK_PHONE_CODES = ["India (+91)", "United Kingdom (+44)", "United States of America (+1)", "Canada (+1)"]
+
+
+def _label_html(field: Dict[str, Any], for_id: str) -> str:
+    star = "*" if field.get("required") else ""
+    return f'<label for="{for_id}">{html.escape(field["label"])}{star}</label>'
+
+
+def _multiselect_tree(field: Dict[str, Any]) -> Any:
+    options = field.get("options") or []
+    if options and isinstance(options[0], dict) and options[0]:
+        return options[0]
+    flat = [opt for opt in options if isinstance(opt, str)]
+    if flat:
+        return flat
+    if "phone code" in field["label"].lower():
+        return FALLBACK_PHONE_CODES
+    return ["Option A", "Option B", "Option C"]
+
+
+def render_field(field: Dict[str, Any], index: int) -> str:
+    """Renders one recorded field record as a Workday-like formField container."""
+    field_type = field.get("type_of_input")
+    input_id = f"input-{index}"
+    automation_id = field.get("id_of_input_component") or f"formField-{index}"
+    if not automation_id.startswith("formField-"):
+        automation_id = f"formField-{automation_id}"
+    attr_id = html.escape(automation_id, quote=True)
+    options = [opt for opt in field.get("options") or [] if isinstance(opt, str)]
+
+    if field_type == "file":
+        return (
+            f'<div data-automation-id="{attr_id}" data-fkit-id="{html.escape(field.get("id_of_input_component") or input_id)}">'
+            f'<label>{html.escape(field["label"])}</label>'
+            f'<input type="file" data-automation-id="file-upload-input-ref">'
+            f'<button type="button" data-automation-id="select-files" id="{input_id}">Select files</button>'
+            f'</div>'
+        )
+
+    if field_type in ("radio", "checkbox"):
+        star = "*" if field.get("required") else ""
+        choices = options or [field["label"]]
+        inputs = "".join(
+            f'<input type="{field_type}" id="{input_id}-{i}" name="{input_id}">'
+            f'<label for="{input_id}-{i}">{html.escape(choice)}</label>'
+            for i, choice in enumerate(choices)
+        )
+        return (
+            f'<div data-automation-id="{attr_id}"><fieldset>'
+            f'<legend><span>{html.escape(field["label"])}{star}</span></legend>{inputs}'
+            f'</fieldset></div>'
+        )
+
+    body = ""
+    if field_type == "dropdown":
+        choices = options or ["Select One", "Yes", "No"]
+        data = html.escape(json.dumps(choices), quote=True)
+        body = f'<button type="button" id="{input_id}" aria-haspopup="listbox" aria-expanded="false" data-options="{data}">Select One</button>'
+    elif field_type == "multiselect":
+        data = html.escape(json.dumps(_multiselect_tree(field)), quote=True)
+        body = (
+            f'<div data-automation-id="multiSelectContainer" data-tree="{data}">'
+            f'<input type="text" id="{input_id}" placeholder="Search"><div class="wd-selected"></div></div>'
+        )
+    elif field_type in ("date-mmddyyyy", "date-mmyyyy"):
+        day = '<input type="text" data-automation-id="dateSectionDay-input">' if field_type == "date-mmddyyyy" else ""
+        body = (
+            f'<input type="text" id="{input_id}" data-automation-id="dateSectionMonth-input">{day}'
+            f'<input type="text" data-automation-id="dateSectionYear-input">'
+        )
+    elif field_type == "textarea":
+        body = f'<textarea id="{input_id}"></textarea>'
+    elif field_type == "number":
+        body = f'<input type="text" inputmode="numeric" id="{input_id}">'
+    else:
+        body = f'<input type="text" id="{input_id}">'
+    return f'<div data-automation-id="{attr_id}">{_label_html(field, input_id)}{body}</div>'
+
+
+def render_page(page_name: str, fields: List[Dict[str, Any]], page_names: List[str], page_index: int) -> str:
+    """Renders one application step, including Add-button sections and the Next button."""
+    parts: List[str] = []
+    sections: Dict[str, List[str]] = {}
+    for i, field in enumerate(fields):
+        rendered = render_field(field, page_index * 1000 + i)
+        section = field.get("Add Button")
+        if section:
+            sections.setdefault(section, []).append(rendered)
+        else:
+            parts.append(rendered)
+
+    for s_idx, (section, rendered_fields) in enumerate(sections.items()):
+        parts.append(
+            f'<div role="group" aria-labelledby="section-{s_idx}">'
+            f'<h3 id="section-{s_idx}">{html.escape(section)}</h3>'
+            f'<template>{"".join(rendered_fields)}</template><div class="wd-slot"></div>'
+            f'<button type="button" data-automation-id="add-button">Add</button></div>'
+        )
+
+    progress = "".join(f"<li>{html.escape(name)}</li>" for name in page_names)
+    next_button = ""
+    if page_index < len(page_names):
+        next_button = (
+            f'<button type="button" data-automation-id="pageFooterNextButton" '
+            f'onclick="location.href=\'/page/{page_index + 1}\'">Save and Continue</button>'
+        )
+    return (
+        f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(page_name)}</title></head><body>"
+        f'<ol aria-label="Application Progress">{progress}</ol>'
+        f"<h2>{html.escape(page_name)}</h2>{''.join(parts)}{next_button}"
+        f"<script>{WIDGET_SCRIPT}</script></body></html>"
+    )
+
+
+def build_site(form_map: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Groups recorded fields by page_name (in first-seen order) and renders /page/1..N."""
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    for field in form_map:
+        grouped.setdefault(field.get("page_name") or "Application", []).append(field)
+    page_names = list(grouped)
+    return {
+        f"/page/{idx}": render_page(name, grouped[name], page_names, idx)
+        for idx, name in enumerate(page_names, start=1)
+    }
+
+
+def serve_site(pages: Dict[str, str], host: str = "127.0.0.1", port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Serves the rendered pages from memory on a background thread; returns (server, base_url)."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = pages.get(self.path.split("?")[0])
+            if body is None:
+                self.send_error(404)
+                return
+            payload = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
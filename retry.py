@@ -0,0 +1,126 @@
+import asyncio
+import random
+import time
+from typing import Dict, Any, Awaitable, Callable, TypeVar
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from config import FIELD_RETRY_ATTEMPTS, FIELD_RETRY_BASE_DELAY_MS, FIELD_RETRY_MAX_DELAY_MS
+from tracing import TRACER
+
+T = TypeVar("T")
+
+# Failures that usually go away once the SPA finishes re-rendering.
+TRANSIENT_MESSAGES = (
+    "timeout",
+    "not attached to the dom",
+    "element is detached",
+    "element is not visible",
+    "element is not stable",
+    "element is not enabled",
+    "intercepts pointer events",
+    "execution context was destroyed",
+    "no listbox found",
+)
+# The page or browser is gone, or the selector is ambiguous; retrying cannot help.
+PERMANENT_MESSAGES = (
+    "strict mode violation",
+    "has been closed",
+    "target closed",
+    "browser has disconnected",
+)
+
+
+class TransientFieldError(Exception):
+    """Raised by handlers for a failure worth retrying that Playwright did not report itself."""
+
+
+class PermanentFieldError(Exception):
+    """Raised by handlers for a failure a retry cannot fix, e.g. the resolved option is not in the list."""
+
+
+def is_transient(error: BaseException) -> bool:
+    if isinstance(error, PermanentFieldError):
+        return False
+    message = str(error).lower()
+    if any(marker in message for marker in PERMANENT_MESSAGES):
+        return False
+    if isinstance(error, (PlaywrightTimeoutError, TransientFieldError, asyncio.TimeoutError)):
+        return True
+    return any(marker in message for marker in TRANSIENT_MESSAGES)
+
+
+class RetryStats:
+    """Retries per operation: how many were recovered and how many gave up."""
+
+    def __init__(self):
+        self.entries: Dict[str, Dict[str, float]] = {}
+
+    def _entry(self, name: str) -> Dict[str, float]:
+        return self.entries.setdefault(name, {"retries": 0, "recovered": 0, "gave_up": 0, "permanent": 0, "backoff_ms": 0.0})
+
+    def record_retry(self, name: str, backoff_ms: float):
+        entry = self._entry(name)
+        entry["retries"] += 1
+        entry["backoff_ms"] += backoff_ms
+
+    def record_outcome(self, name: str, outcome: str):
+        self._entry(name)[outcome] += 1
+
+    def report(self) -> Dict[str, Any]:
+        return {name: {key: round(value, 1) for key, value in entry.items()} for name, entry in sorted(self.entries.items())}
+
+    def print_report(self):
+        if not self.entries:
+            return
+        print("\n🔁 Field retries:")
+        print(f"  {'operation':<28}{'retries':>9}{'recovered':>11}{'gave up':>9}{'permanent':>11}{'backoff ms':>12}")
+        for name, entry in sorted(self.entries.items()):
+            print(f"  {name:<28}{entry['retries']:>9}{entry['recovered']:>11}{entry['gave_up']:>9}"
+                  f"{entry['permanent']:>11}{entry['backoff_ms']:>12.0f}")
+
+    def reset(self):
+        self.entries.clear()
+
+
+RETRY_STATS = RetryStats()
+
+
+class RetryPolicy:
+    """Retries transient failures with short exponential backoff and jitter; permanent ones are raised at once."""
+
+    def __init__(self, attempts: int = FIELD_RETRY_ATTEMPTS, base_delay_ms: float = FIELD_RETRY_BASE_DELAY_MS,
+                 max_delay_ms: float = FIELD_RETRY_MAX_DELAY_MS, jitter: float = 0.2):
+        self.attempts = max(1, attempts)
+        self.base_delay_ms = base_delay_ms
+        self.max_delay_ms = max_delay_ms
+        self.jitter = jitter
+
+    def delay_ms(self, attempt: int) -> float:
+        """Backoff before retry number `attempt` (1-based)."""
+        delay = min(self.max_delay_ms, self.base_delay_ms * 2 ** (attempt - 1))
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    async def run(self, operation: Callable[[], Awaitable[T]], name: str) -> T:
+        for attempt in range(1, self.attempts + 1):
+            try:
+                result = await operation()
+            except Exception as e:
+                if not is_transient(e):
+                    RETRY_STATS.record_outcome(name, "permanent")
+                    raise
+                if attempt == self.attempts:
+                    RETRY_STATS.record_outcome(name, "gave_up")
+                    raise
+                delay = self.delay_ms(attempt)
+                print(f"  🔁 {name}: transient error ({str(e).splitlines()[0][:120]}), retry {attempt} in {delay:.0f} ms")
+                RETRY_STATS.record_retry(name, delay)
+                start = time.perf_counter()
+                await asyncio.sleep(delay / 1000)
+                TRACER.add(f"retry:{name}", "wait", (time.perf_counter() - start) * 1000, outcome="retry", attempt=attempt)
+                continue
+            if attempt > 1:
+                RETRY_STATS.record_outcome(name, "recovered")
+            return result
+        raise AssertionError("unreachable")
+
+
+FIELD_RETRY = RetryPolicy()
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import time
+from typing import Dict, List, Any
+from playwright.async_api import Page
+from config import SCHEMA_REGISTRY_DIR
+from field_types import STRUCTURE_SIGNATURE_JS
+from option_cache import tenant_host
+from output_writer import catalog_hash
+
+# Automation id, structure signature and label (question text with its
+# required "*" marker, plus an aria-required flag) of every formField
+# container, in page order.
+PAGE_CONTAINERS_SCRIPT = """
+() => {
+    const signatureOf = __STRUCTURE_SIGNATURE__;
+    const labelOf = (el) => {
+        const label = el.querySelector("legend, label");
+        const text = label ? (label.textContent || "").replace(/\\s+/g, " ").trim() : "";
+        const required = el.querySelector('[aria-required="true"], [required]') ? "!" : "";
+        return text + required;
+    };
+    const seen = new Set();
+    const containers = [];
+    for (const el of document.querySelectorAll('[data-automation-id^="formField-"]')) {
+        const id = el.getAttribute("data-automation-id");
+        if (!id || seen.has(id)) continue;
+        seen.add(id);
+        containers.push({ id, signature: signatureOf(el), label: labelOf(el) });
+    }
+    return containers;
+}
+""".replace("__STRUCTURE_SIGNATURE__", STRUCTURE_SIGNATURE_JS.strip())
+
+
+async def page_containers(page: Page) -> List[Dict[str, str]]:
+    """Cheap in-page fingerprint input: [{id, signature, label}] for every container."""
+    return await page.evaluate(PAGE_CONTAINERS_SCRIPT)
+
+
+def page_fingerprint(containers: List[Dict[str, str]]) -> str:
+    raw = "|".join(f"{c['id']}:{c['signature']}:{c.get('label', '')}" for c in containers)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+class SchemaRegistry:
+    """
+    Per-tenant store of page schemas: page name -> fingerprint, ordered
+    automation ids, and each container's signature, label and descriptor
+    (kind, label, required, options as a catalog hash). Containers whose id,
+    structure signature and label text (with its required marker) match the
+    stored schema are filled from it without being described again;
+    everything else goes through full extraction.
+    """
+
+    def __init__(self, directory: str = SCHEMA_REGISTRY_DIR):
+        self.directory = directory
+        self._tenants: Dict[str, Dict[str, Any]] = {}
+        self._dirty = set()
+        self.pages = 0
+        self.pages_unchanged = 0
+        self.containers = 0
+        self.containers_reused = 0
+
+    def _path(self, tenant: str) -> str:
+        return os.path.join(self.directory, f"{tenant or 'unknown-tenant'}.json")
+
+    def _tenant(self, url: str) -> Dict[str, Any]:
+        tenant = tenant_host(url)
+        if tenant not in self._tenants:
+            try:
+                with open(self._path(tenant)) as f:
+                    self._tenants[tenant] = json.load(f)
+            except (OSError, ValueError):
+                self._tenants[tenant] = {"pages": {}, "catalogs": {}}
+        return self._tenants[tenant]
+
+    def reusable(self, url: str, page_name: str, containers: List[Dict[str, str]]) -> Dict[str, Dict[str, Any]]:
+        """Stored descriptors for the containers that are unchanged since the last run, keyed by automation id."""
+        data = self._tenant(url)
+        stored = data["pages"].get(page_name)
+        self.pages += 1
+        self.containers += len(containers)
+        if not stored:
+            return {}
+        if stored["fingerprint"] == page_fingerprint(containers):
+            self.pages_unchanged += 1
+
+        reused: Dict[str, Dict[str, Any]] = {}
+        for container in containers:
+            entry = stored["containers"].get(container["id"])
+            if not entry or entry["signature"] != container["signature"] or entry.get("label") != container.get("label"):
+                continue  # new, restructured, reworded or required flag changed
+            descriptor = dict(entry["descriptor"])
+            options_hash = entry.get("options_hash")
+            if options_hash:
+                descriptor["known_options"] = data["catalogs"].get(options_hash)
+            reused[container["id"]] = descriptor
+        self.containers_reused += len(reused)
+        return reused
+
+    def record_page(self, url: str, page_name: str, containers: List[Dict[str, str]],
+                    descriptors: Dict[str, Dict[str, Any]]):
+        """Stores the page's fingerprint and the descriptors extraction produced or reused."""
+        data = self._tenant(url)
+        by_id = {c["id"]: c for c in containers}
+        entries: Dict[str, Any] = {}
+        for automation_id, descriptor in descriptors.items():
+            if automation_id not in by_id:
+                continue  # added later (Add-button sections); re-extracted every run
+            descriptor = {k: v for k, v in descriptor.items() if k not in ("captured", "signature")}
+            options = descriptor.pop("known_options", None)
+            container = by_id[automation_id]
+            entry = {"signature": container["signature"], "label": container.get("label", ""), "descriptor": descriptor}
+            if options:
+                entry["options_hash"] = catalog_hash(options)
+                data["catalogs"][entry["options_hash"]] = options
+            entries[automation_id] = entry
+        data["pages"][page_name] = {
+            "fingerprint": page_fingerprint(containers),
+            "order": [c["id"] for c in containers],
+            "containers": entries,
+            "updated_at": time.time(),
+        }
+        self._dirty.add(tenant_host(url))
+
+    def save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        for tenant in list(self._dirty):
+            path = self._path(tenant)
+            tmp_path = f"{path}.{os.getpid()}.tmp"  # orchestrator workers may save concurrently
+            with open(tmp_path, "w") as f:
+                json.dump(self._tenants[tenant], f)
+            os.replace(tmp_path, path)
+        self._dirty.clear()
+
+    def reset(self):
+        """Forgets the loaded tenants and the counters; schemas are read from `directory` again."""
+        self._tenants.clear()
+        self._dirty.clear()
+        self.pages = 0
+        self.pages_unchanged = 0
+        self.containers = 0
+        self.containers_reused = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pages": self.pages,
+            "pages_unchanged": self.pages_unchanged,
+            "containers": self.containers,
+            "containers_reused": self.containers_reused,
+            "reuse_ratio": round(self.containers_reused / self.containers, 3) if self.containers else 0.0,
+        }
+
+
+SCHEMA_REGISTRY = SchemaRegistry()
@@ -0,0 +1,124 @@
+import time
+from typing import Dict, List, Any
+from playwright.async_api import Page, ElementHandle
+from waits import WAIT_STATS
+
+# Records every formField container inserted into the page, with the time it
+# appeared, until the observer is collected.
+INSTALL_OBSERVER_SCRIPT = """
+() => {
+    if (window.__addSectionObserver) window.__addSectionObserver.observer.disconnect();
+    const state = { inserted: [], last: performance.now() };
+    const selector = '[data-automation-id^="formField-"]';
+    state.observer = new MutationObserver((mutations) => {
+        for (const mutation of mutations) {
+            for (const node of mutation.addedNodes) {
+                if (node.nodeType !== Node.ELEMENT_NODE) continue;
+                const found = node.matches(selector) ? [node] : [];
+                found.push(...node.querySelectorAll(selector));
+                for (const el of found) state.inserted.push({ el, t: performance.now() });
+                state.last = performance.now();
+            }
+        }
+    });
+    state.observer.observe(document.body, { childList: true, subtree: true });
+    window.__addSectionObserver = state;
+}
+"""
+
+# Reads the section label of each Add button from its group's aria-labelledby.
+SECTION_LABELS_SCRIPT = """
+(buttons) => buttons.map((button) => {
+    const labelId = button.closest('div[role="group"]')?.getAttribute("aria-labelledby");
+    const label = labelId ? document.getElementById(labelId) : null;
+    return {
+        text: (button.textContent || "").trim().toLowerCase(),
+        section: label ? (label.textContent || "").trim() : "",
+    };
+})
+"""
+
+# True once every clicked section received a container and no insertion
+# happened for `quietMs`.
+QUIET_SCRIPT = """
+([buttons, quietMs]) => {
+    const state = window.__addSectionObserver;
+    if (!state || performance.now() - state.last < quietMs) return false;
+    const inserted = state.inserted.map(entry => entry.el);
+    return buttons.every((button) => {
+        const group = button.closest('div[role="group"]');
+        return !group || inserted.some(el => group.contains(el));
+    });
+}
+"""
+
+# Stops the observer and attributes each inserted container to the clicked
+# button whose group contains it, else to the last button clicked before it
+# appeared. Returns one list of automation ids per button.
+COLLECT_SCRIPT = """
+([buttons, clickTimes]) => {
+    const state = window.__addSectionObserver;
+    if (!state) return buttons.map(() => []);
+    state.observer.disconnect();
+    delete window.__addSectionObserver;
+
+    const groups = buttons.map(button => button.closest('div[role="group"]'));
+    const deltas = buttons.map(() => []);
+    const seen = new Set();
+    for (const { el, t } of state.inserted) {
+        const id = el.getAttribute("data-automation-id");
+        if (!id || seen.has(id) || !el.isConnected) continue;
+        seen.add(id);
+        let owner = groups.findIndex(group => group && group.contains(el));
+        if (owner < 0) {
+            owner = clickTimes.reduce((best, clickedAt, idx) => clickedAt <= t ? idx : best, 0);
+        }
+        deltas[owner].push(id);
+    }
+    return deltas;
+}
+"""
+
+
+async def expand_add_sections(page: Page, buttons: List[ElementHandle], budget_ms_per_click: float = 750) -> List[Dict[str, Any]]:
+    """
+    Clicks every Add button back to back while a MutationObserver records the
+    containers each click inserts, then waits until the observer goes quiet.
+    Returns {"index", "section", "ids"} per clicked button ("Add Another" buttons are skipped).
+    """
+    labels = await page.evaluate(SECTION_LABELS_SCRIPT, buttons)
+    await page.evaluate(INSTALL_OBSERVER_SCRIPT)
+
+    clicked: List[ElementHandle] = []
+    sections: List[Dict[str, Any]] = []
+    click_times: List[float] = []
+    for idx, (button, info) in enumerate(zip(buttons, labels)):
+        if "add another" in info["text"]:
+            print(f"⏩ Skipping 'Add Another' button at index {idx}")
+            continue
+        print(f"\n🔹 Expanding 'Add' section: {info['section'] or '[unknown section]'} (index {idx})")
+        clicked_at = await page.evaluate("() => performance.now()")
+        try:
+            await button.click()
+        except Exception as e:
+            print(f"⚠️ Error clicking 'Add' button at index {idx}: {e}")
+            continue
+        click_times.append(clicked_at)
+        clicked.append(button)
+        sections.append({"index": idx, "section": info["section"], "ids": []})
+
+    if clicked:
+        budget_ms = budget_ms_per_click * len(clicked)
+        start = time.perf_counter()
+        met = True
+        try:
+            await page.wait_for_function(QUIET_SCRIPT, arg=[clicked, 100], timeout=budget_ms, polling="raf")
+        except Exception:
+            met = False
+        WAIT_STATS.record("add_button:expand", budget_ms, (time.perf_counter() - start) * 1000, met)
+
+    deltas = await page.evaluate(COLLECT_SCRIPT, [clicked, click_times])
+    for section, ids in zip(sections, deltas):
+        section["ids"] = ids
+        print(f"  -> Section '{section['section']}' added {len(ids)} containers")
+    return sections
@@ -0,0 +1,35 @@
+import hashlib
+import os
+from typing import Optional
+from urllib.parse import urlparse
+from playwright.async_api import BrowserContext
+from config import SESSION_DIR
+
+
+def session_state_path(tenant_url: str, email: str) -> str:
+    """Returns the storage-state file for a tenant + account pair."""
+    host = urlparse(tenant_url).netloc.lower() or "unknown-tenant"
+    account = hashlib.sha1(email.strip().lower().encode("utf-8")).hexdigest()[:12]
+    return os.path.join(SESSION_DIR, f"{host}__{account}.json")
+
+
+def load_session_state(tenant_url: str, email: str) -> Optional[str]:
+    """Returns the saved storage-state path when one exists, else None."""
+    path = session_state_path(tenant_url, email)
+    return path if os.path.exists(path) else None
+
+
+async def save_session_state(context: BrowserContext, tenant_url: str, email: str) -> str:
+    """Persists the context's cookies and local storage for the next run."""
+    path = session_state_path(tenant_url, email)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    await context.storage_state(path=path)
+    print(f"💾 Saved session state to {path}")
+    return path
+
+
+def discard_session_state(tenant_url: str, email: str):
+    """Removes a stale storage-state file."""
+    path = session_state_path(tenant_url, email)
+    if os.path.exists(path):
+        os.remove(path)
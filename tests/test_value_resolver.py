@@ -0,0 +1,34 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from value_resolver import ValueResolver
+
+PROFILE = {
+    "rules": [
+        {"keywords": ["phone code"], "value": "India (+91)", "types": ["dropdown"]},
+        {"keywords": ["phone device type"], "value": "Mobile", "types": ["dropdown"]},
+        {"keywords": ["phone"], "value": "9345678900"},
+        {"keywords": ["name"], "value": "John Doe"},
+        {"keywords": ["first name"], "value": "John"},
+    ],
+}
+
+
+def test_rules_sharing_a_start_position_are_all_reported():
+    resolver = ValueResolver(PROFILE)
+    assert resolver._scan("phone device type") == (1, 2)
+    assert resolver._scan("phone code") == (0, 2)
+
+
+def test_lower_priority_rule_applies_when_a_shared_prefix_rule_does_not():
+    resolver = ValueResolver(PROFILE)
+    assert resolver.resolve("text", "Phone Code") == "9345678900"
+    assert resolver.resolve("dropdown", "Phone Code", options=["India (+91)", "USA (+1)"]) == "India (+91)"
+
+
+def test_overlapping_keywords_keep_priority_order():
+    resolver = ValueResolver(PROFILE)
+    assert resolver._scan("first name") == (3, 4)
+    assert resolver.resolve("text", "First Name") == "John Doe"
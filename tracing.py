@@ -0,0 +1,155 @@
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+# Stack of open spans for the current asyncio task, innermost last.
+_SPAN_STACK = contextvars.ContextVar("span_stack", default=())
+
+
+class Tracer:
+    """
+    Records timed spans (pages, containers, handlers, waits) and exports them
+    as JSONL or as a Chrome trace-event file (chrome://tracing, Perfetto).
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self._lanes: Dict[int, int] = {}
+
+    def _lane(self) -> int:
+        """Maps the running asyncio task to a small thread id so concurrent jobs get separate tracks."""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        key = id(task) if task else 0
+        return self._lanes.setdefault(key, len(self._lanes) + 1)
+
+    def _now_ms(self) -> float:
+        return (time.perf_counter() - self.origin) * 1000
+
+    @contextmanager
+    def span(self, name: str, category: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+        """Times the enclosed block; the yielded dict can be updated with extra attributes."""
+        parent = _SPAN_STACK.get()
+        record = {
+            "name": name,
+            "category": category,
+            "start_ms": self._now_ms(),
+            "end_ms": None,
+            "outcome": "ok",
+            "lane": self._lane(),
+            "parent": parent[-1]["name"] if parent else None,
+            "attrs": dict(attrs),
+        }
+        token = _SPAN_STACK.set(parent + (record,))
+        try:
+            yield record["attrs"]
+        except BaseException as e:
+            record["outcome"] = "error"
+            record["attrs"]["error"] = str(e)
+            raise
+        finally:
+            _SPAN_STACK.reset(token)
+            record["end_ms"] = self._now_ms()
+            self.spans.append(record)
+
+    def add(self, name: str, category: str, duration_ms: float, outcome: str = "ok", **attrs: Any):
+        """Records an already-timed operation that ended just now."""
+        end = self._now_ms()
+        parent = _SPAN_STACK.get()
+        self.spans.append({
+            "name": name,
+            "category": category,
+            "start_ms": end - duration_ms,
+            "end_ms": end,
+            "outcome": outcome,
+            "lane": self._lane(),
+            "parent": parent[-1]["name"] if parent else None,
+            "attrs": dict(attrs),
+        })
+
+    def current_attrs(self) -> Dict[str, Any]:
+        """Merged attributes of all open spans in the current task, innermost winning."""
+        merged: Dict[str, Any] = {}
+        for record in _SPAN_STACK.get():
+            merged.update(record["attrs"])
+        return merged
+
+    def export_jsonl(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            for record in sorted(self.spans, key=lambda r: r["start_ms"]):
+                f.write(json.dumps({
+                    **record,
+                    "duration_ms": round(record["end_ms"] - record["start_ms"], 3),
+                }) + "\n")
+
+    def export_chrome_trace(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        events = [
+            {
+                "name": record["name"],
+                "cat": record["category"],
+                "ph": "X",
+                "ts": round(record["start_ms"] * 1000, 1),
+                "dur": round((record["end_ms"] - record["start_ms"]) * 1000, 1),
+                "pid": 1,
+                "tid": record["lane"],
+                "args": {"outcome": record["outcome"], **record["attrs"]},
+            }
+            for record in self.spans
+        ]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def export(self, directory: str, prefix: str = "trace"):
+        """Writes <prefix>.jsonl and <prefix>.json (Chrome trace) into the directory."""
+        self.export_jsonl(os.path.join(directory, f"{prefix}.jsonl"))
+        self.export_chrome_trace(os.path.join(directory, f"{prefix}.json"))
+        print(f"🧭 Wrote {len(self.spans)} trace spans to {directory}/{prefix}.jsonl and {prefix}.json")
+
+    def summary_by(self, category: str, key: str) -> Dict[str, Dict[str, float]]:
+        """Total/avg duration of spans in a category grouped by an attribute (e.g. field_type)."""
+        groups: Dict[str, List[float]] = {}
+        for record in self.spans:
+            if record["category"] == category:
+                group = str(record["attrs"].get(key, "unknown"))
+                groups.setdefault(group, []).append(record["end_ms"] - record["start_ms"])
+        return {
+            group: {"count": len(values), "total_ms": round(sum(values), 1), "avg_ms": round(sum(values) / len(values), 1)}
+            for group, values in sorted(groups.items(), key=lambda item: -sum(item[1]))
+        }
+
+    def reset(self):
+        self.spans.clear()
+        self._lanes.clear()
+        self.origin = time.perf_counter()
+
+
+TRACER = Tracer()
+
+
+def traced(category: str, name: Optional[str] = None):
+    """Decorator recording each call of an async function as a span."""
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            attrs = {"handler": func.__name__}
+            bound = signature.bind_partial(*args, **kwargs).arguments
+            for key in ("automation_id", "label_text"):
+                if bound.get(key):
+                    attrs[key] = bound[key]
+            with TRACER.span(name or func.__name__, category, **attrs):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,129 @@
+import hashlib
+import os
+import time
+from typing import Dict, List, Any, Optional, Tuple
+from playwright.async_api import Page, Locator
+from waits import WAIT_STATS
+
+FILE_INPUT_SELECTOR = 'input[data-automation-id="file-upload-input-ref"]'
+UPLOADED_FILE_SELECTOR = '[data-automation-id="file-upload-successful"], [data-automation-id="delete-file"], [data-automation-id="file-upload-item"]'
+
+# Resolves once the upload widget reports completion: an explicit success /
+# delete marker, or the file attached with no progress or busy indicator for
+# `quietMs`. Returns "complete", "quiet" or "timeout".
+UPLOAD_COMPLETE_SCRIPT = """
+async (container, { success, quietMs, timeoutMs }) => {
+    const busy = '[data-automation-id*="progress"], [role="progressbar"], [aria-busy="true"]';
+    const input = container.querySelector('input[data-automation-id="file-upload-input-ref"]');
+    const start = performance.now();
+    let quietSince = null;
+    while (performance.now() - start < timeoutMs) {
+        if (container.querySelector(success)) return "complete";
+        const attached = input && input.files && input.files.length > 0;
+        if (attached && !container.querySelector(busy)) {
+            quietSince = quietSince ?? performance.now();
+            if (performance.now() - quietSince >= quietMs) return "quiet";
+        } else {
+            quietSince = null;
+        }
+        await new Promise(r => setTimeout(r, 50));
+    }
+    return "timeout";
+}
+"""
+
+# Per-file upload latencies for the current run.
+UPLOAD_TIMINGS: List[Dict[str, Any]] = []
+
+
+def file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class UploadManager:
+    """
+    Uploads for one application. Each file is hashed once; a field that
+    already received the same content is not uploaded again (so re-visited
+    sections and resumed pages do not trigger another server-side parse).
+    Completion is detected from the widget instead of a fixed sleep, and the
+    latency of every upload is recorded in UPLOAD_TIMINGS.
+    """
+
+    def __init__(self, resume_path: str, timeout_ms: float = 15000, quiet_ms: float = 300):
+        self.resume_path = resume_path
+        self.timeout_ms = timeout_ms
+        self.quiet_ms = quiet_ms
+        self.digests: Dict[str, str] = {}
+        self.done: Dict[Tuple[str, str], str] = {}
+        self.skipped = 0
+
+    def digest(self, path: str) -> str:
+        if path not in self.digests:
+            self.digests[path] = file_digest(path)
+        return self.digests[path]
+
+    async def wait_for_completion(self, container: Locator) -> str:
+        """Waits for the widget's completion signal; budgeted against the 2 s sleep it replaces."""
+        start = time.perf_counter()
+        try:
+            outcome = await container.evaluate(UPLOAD_COMPLETE_SCRIPT, {
+                "success": UPLOADED_FILE_SELECTOR, "quietMs": self.quiet_ms, "timeoutMs": self.timeout_ms,
+            })
+        except Exception:
+            outcome = "timeout"
+        WAIT_STATS.record("upload:complete", 2000, (time.perf_counter() - start) * 1000, outcome != "timeout")
+        return outcome
+
+    def _already_uploaded(self, digest: str, name: str, field_key: str) -> bool:
+        if (digest, field_key) in self.done:
+            self.skipped += 1
+            print(f"  -> '{name}' already uploaded to {field_key}, skipping")
+            return True
+        return False
+
+    def _record(self, path: str, digest: str, field_key: str, start: float, outcome: str):
+        name = os.path.basename(path)
+        latency_ms = (time.perf_counter() - start) * 1000
+        UPLOAD_TIMINGS.append({
+            "file": name,
+            "field": field_key,
+            "sha256": digest[:16],
+            "bytes": os.path.getsize(path),
+            "latency_ms": round(latency_ms, 1),
+            "outcome": outcome,
+        })
+        print(f"  -> Uploaded '{name}' to {field_key} in {latency_ms:.0f} ms ({outcome})")
+        self.done[(digest, field_key)] = name
+
+    async def upload(self, container: Locator, field_key: str, path: Optional[str] = None) -> str:
+        """Attaches `path` (the resume by default) to the container's file input; returns the file name."""
+        path = path or self.resume_path
+        digest = self.digest(path)
+        if not self._already_uploaded(digest, os.path.basename(path), field_key):
+            if await container.locator(UPLOADED_FILE_SELECTOR).count() > 0:
+                # Workday kept a file from an earlier upload (e.g. resume autofill)
+                self.skipped += 1
+                print(f"  -> {field_key} already has an uploaded file, skipping")
+                return os.path.basename(path)
+            start = time.perf_counter()
+            await container.locator(FILE_INPUT_SELECTOR).first.set_input_files(path)
+            self._record(path, digest, field_key, start, await self.wait_for_completion(container))
+        return os.path.basename(path)
+
+    async def upload_via_chooser(self, page: Page, button: Locator, field_key: str, path: Optional[str] = None) -> str:
+        """Uploads through a 'Select files' button's file chooser, with the same dedup and completion wait."""
+        path = path or self.resume_path
+        digest = self.digest(path)
+        if not self._already_uploaded(digest, os.path.basename(path), field_key):
+            start = time.perf_counter()
+            async with page.expect_file_chooser() as fc_info:
+                await button.click()
+            file_chooser = await fc_info.value
+            await file_chooser.set_files(path)
+            container = button.locator("xpath=ancestor::*[.//input[@data-automation-id='file-upload-input-ref']][1]")
+            self._record(path, digest, field_key, start, await self.wait_for_completion(container))
+        return os.path.basename(path)
@@ -0,0 +1,112 @@
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
+from config import CANDIDATE_PROFILE_PATH
+from option_matcher import option_index
+
+try:
+    import yaml
+except ImportError:  # YAML profiles are optional
+    yaml = None
+
+DATE_TYPES = {"date-mmddyyyy", "date-mmyyyy"}
+CHOICE_TYPES = {"radio", "dropdown", "checkbox", "multiselect"}
+
+
+def normalize(text: str) -> str:
+    return " ".join((text or "").lower().split())
+
+
+def load_profile(path: str) -> Dict[str, Any]:
+    """Loads a candidate profile from JSON, or YAML when PyYAML is installed."""
+    with open(path) as f:
+        if path.endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise ImportError("PyYAML is required for YAML candidate profiles: pip install pyyaml")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+class ValueResolver:
+    """
+    Resolves the value to enter for a field from a candidate profile.
+
+    Profile rules are tried in priority order (their position in the file).
+    Each rule's keywords are compiled into one regex, so every rule with a
+    keyword in the label is reported, even when keywords of several rules
+    overlap or share a prefix; the highest-priority rule that applies to the
+    field type wins. Lookups are memoized per normalized label and id.
+    """
+
+    def __init__(self, profile: Dict[str, Any]):
+        self.rules: List[Dict[str, Any]] = profile.get("rules", [])
+        self.defaults: Dict[str, Any] = profile.get("defaults", {})
+        self.patterns = [
+            re.compile("|".join(re.escape(normalize(k)) for k in rule["keywords"]))
+            for rule in self.rules
+        ]
+        self.id_rules = {idx for idx, rule in enumerate(self.rules) if rule.get("match_id")}
+        self._matches = lru_cache(maxsize=4096)(self._scan)
+
+    @classmethod
+    def from_file(cls, path: str) -> "ValueResolver":
+        return cls(load_profile(path))
+
+    def _scan(self, text: str) -> Tuple[int, ...]:
+        """Priority-ordered indexes of every rule with a keyword in `text`."""
+        if not text:
+            return ()
+        return tuple(idx for idx, pattern in enumerate(self.patterns) if pattern.search(text))
+
+    def _applies(self, rule: Dict[str, Any], field_type: str) -> bool:
+        types = rule.get("types")
+        if types:
+            return field_type in types
+        return field_type not in DATE_TYPES
+
+    def match_rule(self, field_type: str, label: str, input_id: str = "") -> Optional[Dict[str, Any]]:
+        """Highest-priority rule applicable to the field type, matched on label (and id where allowed)."""
+        candidates = set(self._matches(normalize(label)))
+        candidates.update(idx for idx in self._matches(normalize(input_id)) if idx in self.id_rules)
+        for idx in sorted(candidates):
+            if self._applies(self.rules[idx], field_type):
+                return self.rules[idx]
+        return None
+
+    def resolve(self, field_type: str, label: str = "", input_id: str = "", options: Optional[List[str]] = None) -> Any:
+        """
+        Returns a typed value: str for text/number/textarea/date/radio/dropdown,
+        a list for checkbox/multiselect, None when a choice field has no options.
+        """
+        options = options or []
+        rule = self.match_rule(field_type, label, input_id)
+        value = rule["value"] if rule else None
+
+        if field_type in CHOICE_TYPES:
+            choices = [opt for opt in options if isinstance(opt, str)]
+            if value is not None and field_type == "multiselect" and ">" in value:
+                return [part.strip() for part in value.split(">") if part.strip()]
+            if value is not None and choices:
+                value = option_index(choices).best(value)
+            if value is None:
+                value = choices[0] if choices else None
+            if field_type in ("checkbox", "multiselect"):
+                return [value] if value is not None else []
+            return value
+
+        if value is None:
+            value = self.defaults.get(field_type, self.defaults.get("text", "Test Input"))
+        return str(value)
+
+
+_RESOLVER: Optional[ValueResolver] = None
+
+
+def get_resolver() -> ValueResolver:
+    """Returns the process-wide resolver, loading CANDIDATE_PROFILE (env) or the default profile once."""
+    global _RESOLVER
+    if _RESOLVER is None:
+        _RESOLVER = ValueResolver.from_file(os.getenv("CANDIDATE_PROFILE") or CANDIDATE_PROFILE_PATH)
+    return _RESOLVER
@@ -0,0 +1,169 @@
+import time
+from typing import Dict, Any
+from playwright.async_api import Page, Locator
+from tracing import TRACER
+
+POPUP_SELECTOR = 'div[role="listbox"], ul[role="listbox"], div[data-automation-id="menu"]'
+
+# Resolves once the option list inside a popup has stopped changing for
+# `settleMs`, or gives up after `timeoutMs`. Runs entirely in the page so a
+# stability check costs one round-trip.
+OPTIONS_STABLE_SCRIPT = """
+async (el, { settleMs, timeoutMs }) => {
+    const signature = () => {
+        const opts = el.querySelectorAll('[role="option"]');
+        return opts.length + "|" + (opts.length ? opts[opts.length - 1].textContent : "");
+    };
+    const start = performance.now();
+    let last = signature();
+    let since = start;
+    while (performance.now() - start < timeoutMs) {
+        await new Promise(r => setTimeout(r, 25));
+        const current = signature();
+        if (current !== last) {
+            last = current;
+            since = performance.now();
+        } else if (performance.now() - since >= settleMs) {
+            return true;
+        }
+    }
+    return false;
+}
+"""
+
+POPUPS_CLOSED_SCRIPT = """
+(selector) => !Array.from(document.querySelectorAll(selector))
+    .some(el => el.getClientRects().length > 0)
+"""
+
+
+class WaitStats:
+    """Accumulates time spent in adaptive waits against the fixed sleeps they replace."""
+
+    def __init__(self):
+        self.entries: Dict[str, Dict[str, float]] = {}
+
+    def record(self, name: str, budget_ms: float, spent_ms: float, met: bool):
+        entry = self.entries.setdefault(name, {"calls": 0, "budget_ms": 0.0, "spent_ms": 0.0, "timeouts": 0})
+        entry["calls"] += 1
+        entry["budget_ms"] += budget_ms
+        entry["spent_ms"] += spent_ms
+        if not met:
+            entry["timeouts"] += 1
+        TRACER.add(name, "wait", spent_ms, outcome="ok" if met else "timeout", budget_ms=budget_ms)
+
+    @property
+    def saved_ms(self) -> float:
+        return sum(e["budget_ms"] - e["spent_ms"] for e in self.entries.values())
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "saved_ms": round(self.saved_ms, 1),
+            "waits": {
+                name: {key: round(value, 1) for key, value in entry.items()}
+                for name, entry in sorted(self.entries.items())
+            },
+        }
+
+    def print_report(self):
+        if not self.entries:
+            return
+        print("\n⏱️ Adaptive wait report (fixed sleep budget vs actual):")
+        print(f"  {'wait':<36}{'calls':>7}{'budget ms':>12}{'spent ms':>12}{'saved ms':>12}{'timeouts':>10}")
+        for name, entry in sorted(self.entries.items()):
+            saved = entry["budget_ms"] - entry["spent_ms"]
+            print(f"  {name:<36}{entry['calls']:>7}{entry['budget_ms']:>12.0f}{entry['spent_ms']:>12.0f}{saved:>12.0f}{entry['timeouts']:>10}")
+        print(f"  Total time saved: {self.saved_ms / 1000:.1f}s")
+
+    def reset(self):
+        self.entries.clear()
+
+
+WAIT_STATS = WaitStats()
+
+
+async def wait_for_condition(page: Page, name: str, expression: str, budget_ms: float, arg: Any = None) -> bool:
+    """Waits until a JS predicate is truthy, for at most the fixed sleep it replaces."""
+    start = time.perf_counter()
+    met = True
+    try:
+        await page.wait_for_function(expression, arg=arg, timeout=budget_ms, polling="raf")
+    except Exception:
+        met = False
+    WAIT_STATS.record(name, budget_ms, (time.perf_counter() - start) * 1000, met)
+    return met
+
+
+async def wait_for_popups_closed(page: Page, budget_ms: float, name: str = "popups_closed") -> bool:
+    """Waits until no listbox/menu popup is rendered."""
+    return await wait_for_condition(page, name, POPUPS_CLOSED_SCRIPT, budget_ms, arg=POPUP_SELECTOR)
+
+
+async def wait_for_listbox_attached(page: Page, selector: str, budget_ms: float, name: str = "listbox_attached") -> bool:
+    """Waits until at least one element matching `selector` is attached."""
+    return await wait_for_condition(
+        page, name, "(selector) => document.querySelector(selector) !== null", budget_ms, arg=selector
+    )
+
+
+async def wait_for_aria_expanded(locator: Locator, expanded: bool, budget_ms: float, name: str = "aria_expanded") -> bool:
+    """Waits until the trigger's aria-expanded attribute reaches the wanted state."""
+    start = time.perf_counter()
+    met = True
+    try:
+        handle = await locator.element_handle(timeout=budget_ms)
+        await locator.page.wait_for_function(
+            "([el, want]) => el.getAttribute('aria-expanded') === want",
+            arg=[handle, "true" if expanded else "false"],
+            timeout=max(1.0, budget_ms - (time.perf_counter() - start) * 1000),
+            polling="raf",
+        )
+    except Exception:
+        met = False
+    WAIT_STATS.record(name, budget_ms, (time.perf_counter() - start) * 1000, met)
+    return met
+
+
+async def wait_for_options_stable(popup: Locator, budget_ms: float, settle_ms: float = 50, name: str = "options_stable") -> bool:
+    """Waits until the popup's rendered options stop changing (count and last option)."""
+    start = time.perf_counter()
+    met = False
+    try:
+        met = await popup.evaluate(OPTIONS_STABLE_SCRIPT, {"settleMs": settle_ms, "timeoutMs": budget_ms})
+    except Exception:
+        pass
+    WAIT_STATS.record(name, budget_ms, (time.perf_counter() - start) * 1000, met)
+    return met
+
+
+async def wait_for_element_count_above(page: Page, selector: str, count: int, budget_ms: float, name: str = "element_count") -> bool:
+    """Waits until more than `count` elements match `selector`."""
+    return await wait_for_condition(
+        page, name,
+        "([selector, count]) => document.querySelectorAll(selector).length > count",
+        budget_ms, arg=[selector, count],
+    )
+
+
+async def wait_for_visible(locator: Locator, budget_ms: float, name: str = "visible") -> bool:
+    """Waits until the locator's element is visible (e.g. after scrolling it into view)."""
+    start = time.perf_counter()
+    met = True
+    try:
+        await locator.wait_for(state="visible", timeout=budget_ms)
+    except Exception:
+        met = False
+    WAIT_STATS.record(name, budget_ms, (time.perf_counter() - start) * 1000, met)
+    return met
+
+
+async def wait_for_checked(container: Locator, selector: str, budget_ms: float, name: str = "input_checked") -> bool:
+    """Waits until an input matching `selector` inside the container is checked."""
+    start = time.perf_counter()
+    met = True
+    try:
+        await container.locator(f"{selector}:checked").first.wait_for(state="attached", timeout=budget_ms)
+    except Exception:
+        met = False
+    WAIT_STATS.record(name, budget_ms, (time.perf_counter() - start) * 1000, met)
+    return met
@@ -0,0 +1,170 @@
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, List, Any, Optional
+from config import WORK_QUEUE_PATH, JOB_LEASE_SECONDS, MAX_JOB_ATTEMPTS
+
+# Only these job keys are stored; passwords and other credentials are
+# resolved from the job file or .env when a job is leased.
+QUEUED_KEYS = ("job_id", "url", "email")
+
+
+class WorkQueue:
+    """
+    Durable job queue in a SQLite file shared by the orchestrator's worker
+    processes. A worker leases a job for `lease_seconds` (renewed while it
+    runs); jobs whose lease expired, e.g. because the worker died, become
+    available again. Failed jobs are retried until `max_attempts`.
+    """
+
+    def __init__(self, path: str = WORK_QUEUE_PATH, lease_seconds: float = JOB_LEASE_SECONDS,
+                 max_attempts: int = MAX_JOB_ATTEMPTS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    lease_owner TEXT,
+                    lease_expires REAL,
+                    result TEXT,
+                    last_error TEXT,
+                    enqueued_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL
+                )"""
+            )
+        return self._conn
+
+    def enqueue(self, jobs: List[Dict[str, Any]]) -> int:
+        """Adds jobs that are not queued yet (only their QUEUED_KEYS); returns how many were added."""
+        now = time.time()
+        before = self.conn.total_changes
+        self.conn.execute("BEGIN IMMEDIATE")
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO jobs (job_id, payload, enqueued_at) VALUES (?, ?, ?)",
+            [(job["job_id"], json.dumps({key: job.get(key) for key in QUEUED_KEYS}), now) for job in jobs],
+        )
+        self.conn.execute("COMMIT")
+        return self.conn.total_changes - before
+
+    def lease(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Claims the next pending (or lease-expired) job for `worker_id`, or returns None when none is left."""
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.conn.execute(
+                """SELECT job_id, payload, attempts FROM jobs
+                   WHERE (status = 'pending' OR (status = 'leased' AND lease_expires < ?))
+                     AND attempts < ?
+                   ORDER BY enqueued_at, job_id LIMIT 1""",
+                (now, self.max_attempts),
+            ).fetchone()
+            if row is None:
+                # leases that expired on their last attempt are given up
+                self.conn.execute(
+                    """UPDATE jobs SET status = 'failed', finished_at = ?, last_error = 'lease expired'
+                       WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?""",
+                    (now, now, self.max_attempts),
+                )
+                self.conn.execute("COMMIT")
+                return None
+            self.conn.execute(
+                """UPDATE jobs SET status = 'leased', attempts = attempts + 1, lease_owner = ?,
+                   lease_expires = ?, started_at = COALESCE(started_at, ?) WHERE job_id = ?""",
+                (worker_id, now + self.lease_seconds, now, row[0]),
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        job = json.loads(row[1])
+        job["attempt"] = row[2] + 1
+        return job
+
+    def renew(self, job_id: str, worker_id: str) -> bool:
+        """Extends a lease held by `worker_id`; False if it was lost."""
+        cursor = self.conn.execute(
+            "UPDATE jobs SET lease_expires = ? WHERE job_id = ? AND lease_owner = ? AND status = 'leased'",
+            (time.time() + self.lease_seconds, job_id, worker_id),
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]) -> bool:
+        """Marks a job done; False if `worker_id` no longer holds its lease (the result is dropped)."""
+        cursor = self.conn.execute(
+            """UPDATE jobs SET status = 'done', result = ?, finished_at = ?
+               WHERE job_id = ? AND lease_owner = ? AND status = 'leased'""",
+            (json.dumps(result), time.time(), job_id, worker_id),
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: str, worker_id: str, error: str, result: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Returns the job to the queue, or marks it failed once it used up its
+        attempts; False if `worker_id` no longer holds its lease.
+        """
+        cursor = self.conn.execute(
+            """UPDATE jobs SET
+                   status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                   finished_at = CASE WHEN attempts >= ? THEN ? ELSE NULL END,
+                   last_error = ?, result = ?, lease_expires = NULL
+               WHERE job_id = ? AND lease_owner = ? AND status = 'leased'""",
+            (self.max_attempts, self.max_attempts, time.time(), error, json.dumps(result) if result else None,
+             job_id, worker_id),
+        )
+        return cursor.rowcount == 1
+
+    def release(self, worker_id: str, error: str) -> int:
+        """Gives up every lease held by a worker that died, without waiting for the leases to expire."""
+        leased = [row[0] for row in self.conn.execute(
+            "SELECT job_id FROM jobs WHERE status = 'leased' AND lease_owner = ?", (worker_id,)
+        ).fetchall()]
+        for job_id in leased:
+            self.fail(job_id, worker_id, error)
+        return len(leased)
+
+    def unfinished(self) -> int:
+        """Jobs that are still pending or leased."""
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status IN ('pending', 'leased')"
+        ).fetchone()[0]
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def results(self) -> List[Dict[str, Any]]:
+        rows = self.conn.execute(
+            """SELECT job_id, status, attempts, lease_owner, result, last_error, started_at, finished_at
+               FROM jobs ORDER BY enqueued_at, job_id"""
+        ).fetchall()
+        return [
+            {
+                "job_id": job_id,
+                "status": status,
+                "attempts": attempts,
+                "worker": owner,
+                "result": json.loads(result) if result else None,
+                "error": error,
+                "started_at": started,
+                "finished_at": finished,
+            }
+            for job_id, status, attempts, owner, result, error, started, finished in rows
+        ]
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None